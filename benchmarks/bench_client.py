@@ -0,0 +1,242 @@
+"""Benchmark the client against a local fake Scurri server.
+
+Measures model construction, response decoding, sequential and concurrent
+pagination, concurrent single package lookups, and pagination while the server
+injects 500 and 429 responses. Each case is run repeat times and the best time is
+reported, along with packages per second and the number of HTTP requests made.
+
+Run with `python -m benchmarks.bench_client`. Use --help for the options.
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from scurri import ScurriAPI
+from scurri.models import TrackedPackage
+from scurri.request import BaseRequest
+
+from .server import FakeScurriServer, make_package
+
+
+class Result:
+    """The best time of a benchmark case."""
+
+    def __init__(self, name: str, seconds: float, items: int, requests: int) -> None:
+        """Create a benchmark result."""
+        self.name = name
+        self.seconds = seconds
+        self.items = items
+        self.requests = requests
+
+    def __str__(self) -> str:
+        rate = self.items / self.seconds if self.seconds else float("inf")
+        return (
+            f"{self.name:<40}{self.seconds * 1000:>10.1f} ms"
+            f"{rate:>12.0f} /s{self.requests:>8} requests"
+        )
+
+
+def best_time(
+    name: str,
+    function: Callable[[], int],
+    repeat: int,
+    server: Optional[FakeScurriServer] = None,
+) -> Result:
+    """Return the best time of calling function, which returns the items handled."""
+    best = float("inf")
+    items = 0
+    requests = 0
+    for _ in range(repeat):
+        request_count = server.request_count if server is not None else 0
+        started = time.perf_counter()
+        items = function()
+        best = min(best, time.perf_counter() - started)
+        if server is not None:
+            requests = server.request_count - request_count
+    return Result(name, best, items, requests)
+
+
+def bench_models(packages: int, events: int, repeat: int) -> List[Result]:
+    """Time building models from decoded package data."""
+    data = [
+        make_package(package_id, "hermes", events) for package_id in range(packages)
+    ]
+    return [
+        best_time(
+            "TrackedPackage construction",
+            lambda: len([TrackedPackage(package) for package in data]),
+            repeat,
+        )
+    ]
+
+
+def bench_decode(
+    scurri_api: ScurriAPI, packages: int, events: int, repeat: int
+) -> List[Result]:
+    """Time decoding a page of packages with the session's JSON decoder."""
+    body = json.dumps(
+        {
+            "count": packages,
+            "next": None,
+            "previous": None,
+            "results": [
+                make_package(package_id, "hermes", events)
+                for package_id in range(packages)
+            ],
+        }
+    ).encode()
+    decoder = scurri_api.session.json_decoder
+    return [
+        best_time(
+            f"Decode page ({decoder.__module__})",
+            lambda: len(
+                BaseRequest._decode_response(scurri_api.session, "", body)["results"]
+            ),
+            repeat,
+        )
+    ]
+
+
+def bench_pagination(
+    server: FakeScurriServer, scurri_api: ScurriAPI, workers: List[int], repeat: int
+) -> List[Result]:
+    """Time requesting every package, sequentially and concurrently."""
+    results = []
+    for max_workers in workers:
+        results.append(
+            best_time(
+                f"get_trackings(max_workers={max_workers})",
+                lambda: len(scurri_api.get_trackings(max_workers=max_workers)),
+                repeat,
+                server,
+            )
+        )
+    results.append(
+        best_time(
+            "iter_trackings()",
+            lambda: sum(1 for _ in scurri_api.iter_trackings()),
+            repeat,
+            server,
+        )
+    )
+    results.append(
+        best_time(
+            "get_trackings_table()",
+            lambda: len(scurri_api.get_trackings_table()),
+            repeat,
+            server,
+        )
+    )
+    slug = server.carriers[0]
+    results.append(
+        best_time(
+            f"get_carrier_trackings({slug!r})",
+            lambda: len(scurri_api.get_carrier_trackings(slug)),
+            repeat,
+            server,
+        )
+    )
+    return results
+
+
+def bench_lookups(
+    server: FakeScurriServer,
+    scurri_api: ScurriAPI,
+    lookups: int,
+    max_workers: int,
+    repeat: int,
+) -> List[Result]:
+    """Time looking up packages by ID concurrently."""
+    package_ids = [str(package_id) for package_id in range(lookups)]
+    return [
+        best_time(
+            f"get_trackings_by_package_ids({max_workers})",
+            lambda: len(
+                scurri_api.get_trackings_by_package_ids(
+                    package_ids, max_workers=max_workers
+                )
+            ),
+            repeat,
+            server,
+        )
+    ]
+
+
+def main(
+    packages: int = 5000,
+    page_size: int = 500,
+    events: int = 10,
+    latency: float = 0.005,
+    workers: Optional[List[int]] = None,
+    lookups: int = 500,
+    lookup_workers: int = 16,
+    fault_rate: float = 0.05,
+    repeat: int = 3,
+) -> List[str]:
+    """Run every benchmark and print the results.
+
+    Kwargs:
+        packages (int): The number of packages served.
+        page_size (int): The number of packages in each page.
+        events (int): The number of events in each package.
+        latency (float): Seconds the server waits before each response.
+        workers (list(int)): The max_workers values pagination is timed with.
+        lookups (int): The number of packages looked up by ID.
+        lookup_workers (int): The max_workers used for lookups.
+        fault_rate (float): The share of requests answered with each of 500 and
+            429 in the fault injection case.
+        repeat (int): The number of times each case is run.
+    """
+    if workers is None:
+        workers = [1, 4]
+    options: Dict[str, Any] = {
+        "packages": packages,
+        "events": events,
+        "page_size": page_size,
+        "latency": latency,
+        "process": True,
+    }
+    results = bench_models(packages=page_size, events=events, repeat=repeat)
+    with FakeScurriServer(**options) as server:
+        scurri_api = ScurriAPI(session=server.session())
+        results += bench_decode(scurri_api, page_size, events, repeat)
+        results += bench_pagination(server, scurri_api, workers, repeat)
+        results += bench_lookups(
+            server, scurri_api, min(lookups, packages), lookup_workers, repeat
+        )
+    with FakeScurriServer(
+        error_rate=fault_rate, throttle_rate=fault_rate, **options
+    ) as server:
+        scurri_api = ScurriAPI(session=server.session())
+        for result in bench_pagination(server, scurri_api, workers[-1:], repeat)[:1]:
+            result.name = f"{result.name} with faults"
+            results.append(result)
+    lines = [
+        f"{packages} packages, {page_size} per page, {events} events each, "
+        f"{latency * 1000:g} ms latency"
+    ]
+    lines += [str(result) for result in results]
+    for line in lines:
+        print(line)
+    return lines
+
+
+def parse_args(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Return the options for main from command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--events", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--lookup-workers", type=int, default=16)
+    parser.add_argument("--fault-rate", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=3)
+    return vars(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main(**parse_args())
@@ -0,0 +1,88 @@
+"""Benchmark decoding a page of tracking results.
+
+Compares the per page cost of the previous decoding path, response.json() followed
+by a dict() copy, with decoding the response body using the session's JSON decoder.
+
+Run with `python -m benchmarks.bench_decode`.
+"""
+
+import json
+import timeit
+from typing import Any, Callable, Dict, List
+
+import requests
+
+from scurri.apisession import ScurriAPISession
+from scurri.request import BaseRequest
+
+
+def make_page(results: int = 1000, events: int = 10) -> Dict[str, Any]:
+    """Return a page of tracking results."""
+    return {
+        "count": results * 100,
+        "next": "https://tracking.scurri.co.uk/api/v1/trackings?page=2",
+        "previous": None,
+        "results": [
+            {
+                "id": package_id,
+                "tracking_number": f"{package_id:016d}",
+                "url": f"https://tracking.scurri.co.uk/api/v1/trackings/{package_id}",
+                "created_at": "2021-07-30T10:25:47+00:00",
+                "carrier": "Hermes",
+                "carrier_url": "https://tracking.scurri.co.uk/api/v1/carriers/hermes",
+                "events": [
+                    {
+                        "id": package_id * 100 + event_id,
+                        "status": "IN_TRANSIT",
+                        "carrier_code": "kk",
+                        "description": "Parcel is in transit to the delivery depot",
+                        "timestamp": "2021-07-30T10:35:27",
+                        "location": "Depot",
+                    }
+                    for event_id in range(events)
+                ],
+            }
+            for package_id in range(results)
+        ],
+    }
+
+
+def make_response(body: bytes) -> requests.Response:
+    """Return a requests response with the given body."""
+    response = requests.Response()
+    response._content = body
+    response.encoding = "utf-8"
+    response.status_code = 200
+    return response
+
+
+def time_per_page(function: Callable[[], Any], number: int) -> float:
+    """Return the best mean time in milliseconds of calling function."""
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1000
+
+
+def main(number: int = 20) -> List[str]:
+    """Print the time taken to decode a page with each decoder."""
+    body = json.dumps(make_page()).encode()
+    response = make_response(body)
+    stdlib_session = ScurriAPISession(json_decoder=json.loads)
+    default_session = ScurriAPISession()
+    timings = {
+        "response.json() + dict()": lambda: dict(response.json()),
+        "json.loads": lambda: BaseRequest._decode_response(
+            stdlib_session, "", response.content
+        ),
+        f"default ({default_session.json_decoder.__module__})": lambda: (
+            BaseRequest._decode_response(default_session, "", response.content)
+        ),
+    }
+    lines = [f"Page size: {len(body) / 1024 / 1024:.2f} MiB"]
+    for name, function in timings.items():
+        lines.append(f"{name:<30}{time_per_page(function, number):>8.2f} ms/page")
+    for line in lines:
+        print(line)
+    return lines
+
+
+if __name__ == "__main__":
+    main()
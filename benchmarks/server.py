@@ -0,0 +1,309 @@
+"""A local fake Scurri API server for benchmarks.
+
+The server emulates the endpoints used by the library with generated packages,
+page number pagination and configurable latency. A share of requests can be
+answered with 500 or 429 responses to measure the cost of retries.
+
+    with FakeScurriServer(packages=10000, page_size=500, latency=0.01) as server:
+        scurri_api = ScurriAPI(session=server.session())
+"""
+
+import json
+import multiprocessing
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from scurri.apisession import ScurriAPISession
+from scurri.retry import RetryPolicy
+
+TOKEN = "benchmark-token"
+SERVER_ERROR_BODY = b'{"detail": "Internal server error"}'
+
+
+def make_package(package_id: int, carrier: str, events: int = 10) -> Dict[str, Any]:
+    """Return the tracking data of a package."""
+    return {
+        "id": package_id,
+        "tracking_number": f"{package_id:016d}",
+        "url": f"https://tracking.scurri.co.uk/api/v1/trackings/{package_id}",
+        "created_at": "2021-07-30T10:25:47+00:00",
+        "carrier": carrier,
+        "carrier_url": f"https://tracking.scurri.co.uk/api/v1/carriers/{carrier}",
+        "events": [
+            {
+                "id": package_id * 100 + event_id,
+                "status": "IN_TRANSIT",
+                "carrier_code": "kk",
+                "description": "Parcel is in transit to the delivery depot",
+                "timestamp": "2021-07-30T10:35:27",
+                "location": "Depot",
+            }
+            for event_id in range(events)
+        ],
+    }
+
+
+class FakeScurriServer:
+    """Serve generated Scurri API responses on a local port.
+
+    Kwargs:
+        packages (int): The number of packages. Default 1000.
+        carriers (list(str)): The carrier slugs packages are shared between.
+        events (int): The number of events in each package. Default 10.
+        page_size (int): The default number of packages in a page. Requests can
+            ask for a different size with the page_size query parameter.
+            Default 100.
+        latency (float): Seconds to wait before each response. Default 0.
+        error_rate (float): The share of requests answered with a 500 server
+            error. Default 0.
+        throttle_rate (float): The share of requests answered with a 429 response.
+            Default 0.
+        retry_after (int): The Retry-After header of 429 responses. Default 0.
+        seed (int): Seeds the choice of requests that fail. Default 0.
+        process (bool): If True the server runs in a child process, so that it does
+            not compete with the client for the GIL. Default False, which runs it
+            in a thread.
+    """
+
+    PACKAGE_PATH = re.compile(r"^/trackings/(?P<package_id>\d+)$")
+    CARRIER_PATH = re.compile(r"^/carriers/(?P<slug>[^/]+)$")
+    CARRIER_TRACKINGS_PATH = re.compile(r"^/carriers/(?P<slug>[^/]+)/trackings$")
+    TRACKING_NUMBER_PATH = re.compile(
+        r"^/carriers/(?P<slug>[^/]+)/trackings/(?P<tracking_number>\d+)$"
+    )
+
+    def __init__(
+        self,
+        packages: int = 1000,
+        carriers: Optional[List[str]] = None,
+        events: int = 10,
+        page_size: int = 100,
+        latency: float = 0,
+        error_rate: float = 0,
+        throttle_rate: float = 0,
+        retry_after: int = 0,
+        seed: int = 0,
+        process: bool = False,
+    ) -> None:
+        """Create a fake Scurri server. Call start or use it as a context manager."""
+        if carriers is None:
+            carriers = ["hermes", "dpd", "royal-mail"]
+        self.packages = packages
+        self.carriers = carriers
+        self.events = events
+        self.page_size = page_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.process = process
+        self._request_count = multiprocessing.Value("i", 0)
+        self._random = random.Random(seed)
+        self._bodies: Dict[Tuple[str, int, int], bytes] = {}
+        self._port: Optional[int] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL of the API served."""
+        if self._port is None:
+            raise RuntimeError("The server has not been started.")
+        return f"http://127.0.0.1:{self._port}"
+
+    @property
+    def request_count(self) -> int:
+        """Return the number of requests received."""
+        return int(self._request_count.value)
+
+    def start(self) -> None:
+        """Start serving on a free port in a background thread or process."""
+        if self.process:
+            ports: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+            self._process = multiprocessing.Process(
+                target=self._serve, args=(ports,), daemon=True
+            )
+            self._process.start()
+            self._port = ports.get(timeout=30)
+            return
+        server = self._listen()
+        threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self._port = None
+
+    def session(self, **kwargs: Any) -> ScurriAPISession:
+        """Return an authorised session for the server.
+
+        Retries are made without waiting, unless a retry_policy is given. Other
+        kwargs are passed to ScurriAPISession.
+        """
+        kwargs.setdefault("retry_policy", RetryPolicy(backoff_factor=0))
+        session = ScurriAPISession(**kwargs)
+        session.base_url = self.base_url
+        session.token = TOKEN
+        return session
+
+    def carrier_packages(self, slug: str) -> List[int]:
+        """Return the IDs of the packages from a carrier."""
+        index = self.carriers.index(slug)
+        return list(range(index, self.packages, len(self.carriers)))
+
+    def __enter__(self) -> "FakeScurriServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def respond(self, method: str, url: str) -> Tuple[int, Dict[str, str], bytes]:
+        """Return the status, headers and body of the response to a request."""
+        with self._request_count.get_lock():
+            self._request_count.value += 1
+            roll = self._random.random()
+        if self.latency:
+            time.sleep(self.latency)
+        if roll < self.error_rate:
+            return 500, {}, SERVER_ERROR_BODY
+        if roll < self.error_rate + self.throttle_rate:
+            return 429, {"Retry-After": str(self.retry_after)}, b"{}"
+        split_url = urlsplit(url)
+        path = split_url.path
+        query = parse_qs(split_url.query)
+        if method == "POST" and path == "/authorizations":
+            return self._json({"token": TOKEN})
+        if path == "/carriers":
+            return self._json(self._page("/carriers", self._carriers(), 1, 100))
+        if path == "/trackings":
+            return self._trackings_page(split_url.path, None, query)
+        match = self.CARRIER_TRACKINGS_PATH.match(path)
+        if match is not None:
+            return self._trackings_page(split_url.path, match["slug"], query)
+        match = self.PACKAGE_PATH.match(path)
+        if match is not None:
+            package_id = int(match["package_id"])
+            if package_id < self.packages:
+                return self._json(self._package(package_id))
+        match = self.TRACKING_NUMBER_PATH.match(path)
+        if match is not None:
+            package_id = int(match["tracking_number"])
+            if package_id < self.packages:
+                return self._json(self._package(package_id))
+        match = self.CARRIER_PATH.match(path)
+        if match is not None and match["slug"] in self.carriers:
+            return self._json(self._carrier(match["slug"]))
+        return 404, {}, b'{"detail": "Not found."}'
+
+    def _trackings_page(
+        self, path: str, slug: Optional[str], query: Dict[str, List[str]]
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        page = int(query.get("page", ["1"])[0])
+        page_size = int(query.get("page_size", [str(self.page_size)])[0])
+        key = (path, page, page_size)
+        body = self._bodies.get(key)
+        if body is None:
+            if slug is None:
+                package_ids = list(range(self.packages))
+            else:
+                package_ids = self.carrier_packages(slug)
+            start = (page - 1) * page_size
+            if page < 1 or (start >= len(package_ids) and page > 1):
+                return 404, {}, b'{"detail": "Invalid page."}'
+            results = [
+                self._package(package_id)
+                for package_id in package_ids[start : start + page_size]
+            ]
+            body = json.dumps(
+                self._page(path, results, page, page_size, len(package_ids))
+            ).encode()
+            self._bodies[key] = body
+        return 200, {"Content-Type": "application/json"}, body
+
+    def _page(
+        self,
+        path: str,
+        results: List[Dict[str, Any]],
+        page: int,
+        page_size: int,
+        count: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        if count is None:
+            count = len(results)
+        next_url = None
+        if page * page_size < count:
+            next_url = f"{self.base_url}{path}?page={page + 1}&page_size={page_size}"
+        return {"count": count, "next": next_url, "previous": None, "results": results}
+
+    def _package(self, package_id: int) -> Dict[str, Any]:
+        carrier = self.carriers[package_id % len(self.carriers)]
+        return make_package(package_id, carrier, self.events)
+
+    def _carrier(self, slug: str) -> Dict[str, str]:
+        return {
+            "slug": slug,
+            "name": slug.title(),
+            "url": f"{self.base_url}/carriers/{slug}",
+            "trackings_url": f"{self.base_url}/carriers/{slug}/trackings",
+        }
+
+    def _carriers(self) -> List[Dict[str, Any]]:
+        return [self._carrier(slug) for slug in self.carriers]
+
+    def _json(self, data: Dict[str, Any]) -> Tuple[int, Dict[str, str], bytes]:
+        return 200, {"Content-Type": "application/json"}, json.dumps(data).encode()
+
+    def _listen(self) -> ThreadingHTTPServer:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._port = self._server.server_port
+        return self._server
+
+    def _serve(self, ports: "multiprocessing.Queue[int]") -> None:
+        server = self._listen()
+        ports.put(server.server_port)
+        server.serve_forever()
+
+    def _make_handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                self._respond("GET")
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                self._respond("POST")
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _respond(self, method: str) -> None:
+                status, headers, body = server.respond(method, self.path)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
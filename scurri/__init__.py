@@ -2,5 +2,12 @@
 
 from .api import ScurriAPI
 from .apisession import ScurriAPISession
+from .asyncapi import AsyncScurriAPI
+from .asyncapisession import AsyncScurriAPISession
 
-__all__ = ["ScurriAPISession", "ScurriAPI"]
+__all__ = [
+    "ScurriAPISession",
+    "ScurriAPI",
+    "AsyncScurriAPISession",
+    "AsyncScurriAPI",
+]
@@ -1,26 +1,55 @@
 """The ScurriAPI class provides methods for interacting with the Scurri API."""
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from . import exceptions
 from .apisession import ScurriAPISession
+from .cache import TTLCache
+from .checkpoint import PaginationCheckpoint
 from .models import Carrier, TrackedPackage
 from .request import (
     CarrierRequest,
     CarriersRequest,
     CarrierTrackingsRequest,
+    PaginationLimits,
     TrackingByPackageID,
     TrackingByTrackingNumber,
     TrackingsRequest,
 )
+from .store import TrackingStore
+from .tables import TrackingTable
 
 NOT_FOUND_RESPONSE = {"detail": "Not found."}
 
+Key = TypeVar("Key")
+
 
 class ScurriAPI:
     """The ScurriAPI class provides methods for interacting with the Scurri API."""
 
-    def __init__(self, staging: bool = False) -> None:
+    def __init__(
+        self,
+        staging: bool = False,
+        carrier_cache_ttl: Optional[float] = None,
+        carrier_cache_size: int = 256,
+        carrier_not_found_ttl: float = 60,
+        store: Optional[TrackingStore] = None,
+        store_max_age: Optional[float] = None,
+        session: Optional[ScurriAPISession] = None,
+    ) -> None:
         """Create a Scurri API session.
 
         Call the auth method with you login credentials before making any requests.
@@ -28,8 +57,36 @@ class ScurriAPI:
         Kwargs:
             staging (bool): If True the Scurri staging API will be used, if False the
                 live API will be used. Default False.
+            carrier_cache_ttl (float): If not None carrier information will be cached
+                for this many seconds. Default None.
+            carrier_cache_size (int): The maximum number of carriers cached by slug,
+                and of slugs cached as not found. Default 256.
+            carrier_not_found_ttl (float): The number of seconds a carrier slug that
+                was not found is cached for. Default 60.
+            store (scurri.store.TrackingStore): If given, every tracked package that
+                is requested is saved to the store.
+            store_max_age (float): If given along with store, single package lookups
+                are answered from the store if the package was fetched less than this
+                many seconds ago.
+            session (scurri.ScurriAPISession): The session used for requests, for
+                example one with a larger connection pool. If given, staging is
+                ignored. Default a new ScurriAPISession.
         """
-        self.session: ScurriAPISession = ScurriAPISession(staging=staging)
+        if session is None:
+            session = ScurriAPISession(staging=staging)
+        self.session: ScurriAPISession = session
+        self.carrier_cache_ttl = carrier_cache_ttl
+        self._carriers_cache: TTLCache[Tuple[List[Carrier], Dict[str, Carrier]]] = (
+            TTLCache(ttl=carrier_cache_ttl, max_size=1)
+        )
+        self._carrier_cache: TTLCache[Carrier] = TTLCache(
+            ttl=carrier_cache_ttl, max_size=carrier_cache_size
+        )
+        self._carrier_not_found_cache: TTLCache[bool] = TTLCache(
+            ttl=carrier_not_found_ttl, max_size=carrier_cache_size
+        )
+        self.store = store
+        self.store_max_age = store_max_age
 
     def auth(self, username: str, password: str) -> None:
         """Authorise a Scurri API session.
@@ -43,12 +100,36 @@ class ScurriAPI:
     def get_carriers(self) -> List[Carrier]:
         """Return carrier information for all carriers.
 
+        If carrier caching is enabled the cached carriers are returned if they have
+        not expired.
+
         Returns:
             list(scurri.models.Carrier)
         """
+        if self.carrier_cache_ttl is None:
+            return self._request_carriers()
+        carriers, _ = self._get_cached_carriers()
+        return list(carriers)
+
+    def invalidate_carrier_cache(self) -> None:
+        """Remove all cached carrier information."""
+        self._carriers_cache.clear()
+        self._carrier_cache.clear()
+        self._carrier_not_found_cache.clear()
+
+    def _request_carriers(self) -> List[Carrier]:
         results = CarriersRequest.request(api_session=self.session)
         return [Carrier(result) for result in results]
 
+    def _get_cached_carriers(self) -> Tuple[List[Carrier], Dict[str, Carrier]]:
+        """Return cached carriers and an index of them by slug."""
+        cached = self._carriers_cache.get("carriers")
+        if cached is None:
+            carriers = self._request_carriers()
+            cached = (carriers, {carrier.slug: carrier for carrier in carriers})
+            self._carriers_cache.set("carriers", cached)
+        return cached
+
     def get_carrier(self, carrier_slug: str) -> Carrier:
         """Return carrier information for a given carrier.
 
@@ -57,12 +138,35 @@ class ScurriAPI:
                 be found by requesting a list of couriers with
                 scurri.ScurriAPI.get_carriers()
 
+        If carrier caching is enabled the carrier is found in the cached list of
+        carriers. Carriers missing from the list are requested individually and
+        carriers that are not found are cached as not found.
+
         Returns:
             scurri.models.CarrierRequest
 
         Raises:
             scurri.exceptions.CarrierNotFound: If carrier_slug does not exist.
         """
+        if self.carrier_cache_ttl is None:
+            return self._request_carrier(carrier_slug)
+        _, carriers_by_slug = self._get_cached_carriers()
+        carrier = carriers_by_slug.get(carrier_slug) or self._carrier_cache.get(
+            carrier_slug
+        )
+        if carrier is not None:
+            return carrier
+        if self._carrier_not_found_cache.get(carrier_slug):
+            raise exceptions.CarrierNotFound(carrier_slug)
+        try:
+            carrier = self._request_carrier(carrier_slug)
+        except exceptions.CarrierNotFound:
+            self._carrier_not_found_cache.set(carrier_slug, True)
+            raise
+        self._carrier_cache.set(carrier_slug, carrier)
+        return carrier
+
+    def _request_carrier(self, carrier_slug: str) -> Carrier:
         response = CarrierRequest.request(
             api_session=self.session, params={"carrier_slug": carrier_slug}
         )
@@ -70,13 +174,32 @@ class ScurriAPI:
             raise exceptions.CarrierNotFound(carrier_slug)
         return Carrier(response)
 
-    def get_carrier_trackings(self, carrier_slug: str) -> List[TrackedPackage]:
+    def get_carrier_trackings(
+        self,
+        carrier_slug: str,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        page_size: Optional[int] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> List[TrackedPackage]:
         """Return tracking information for all packages from a given carrier.
 
         Kwargs:
             carrier_slug (str): The slug name of the carrier to be requested. This can
                 be found by requesting a list of couriers with
                 scurri.ScurriAPI.get_carriers()
+            max_workers (int): The number of pages to request concurrently.
+                Default 1.
+            checkpoint (scurri.checkpoint.PaginationCheckpoint): If given, pages are
+                saved to the checkpoint as they are received and a request that was
+                stopped by an error is resumed from it.
+            limits (scurri.request.PaginationLimits): Optional limits on the number
+                of packages, pages or bytes requested, or on the time taken.
+            page_size (int): The number of packages to request in each page. The
+                server's default is used if this is not given.
+            filters (dict): Query parameters used by the server to filter the
+                packages returned, for example {"status": "DELIVERED"}.
 
         Returns:
             list(scurri.models.TrackedPackage)
@@ -86,19 +209,185 @@ class ScurriAPI:
                 carrier_slug does not exist.
         """
         results = CarrierTrackingsRequest.request(
-            params={"carrier_slug": carrier_slug}, api_session=self.session
+            params={"carrier_slug": carrier_slug},
+            api_session=self.session,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            limits=limits,
+            page_size=page_size,
+            query=filters,
         )
+        self._save_results(results)
         return [TrackedPackage(result) for result in results]
 
-    def get_trackings(self) -> List[TrackedPackage]:
+    def iter_carrier_trackings(
+        self,
+        carrier_slug: str,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        page_size: Optional[int] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> Iterator[TrackedPackage]:
+        """Yield tracking information for all packages from a given carrier.
+
+        Packages are yielded page by page as they are received, so only one page of
+        results is held in memory at a time.
+
+        Kwargs:
+            carrier_slug (str): The slug name of the carrier to be requested. This can
+                be found by requesting a list of couriers with
+                scurri.ScurriAPI.get_carriers()
+            max_workers (int): The number of pages to request concurrently.
+                Default 1.
+            checkpoint (scurri.checkpoint.PaginationCheckpoint): If given, pages are
+                saved to the checkpoint as they are received and a request that was
+                stopped by an error is resumed from it.
+            limits (scurri.request.PaginationLimits): Optional limits on the number
+                of packages, pages or bytes requested, or on the time taken.
+            page_size (int): The number of packages to request in each page. The
+                server's default is used if this is not given.
+            filters (dict): Query parameters used by the server to filter the
+                packages returned, for example {"status": "DELIVERED"}.
+
+        Returns:
+            iterator(scurri.models.TrackedPackage)
+
+        Raises:
+            scurri.exceptions.InvalidResponse: If the response is not valid or
+                carrier_slug does not exist.
+        """
+        results = CarrierTrackingsRequest.iter_results(
+            params={"carrier_slug": carrier_slug},
+            api_session=self.session,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            limits=limits,
+            page_size=page_size,
+            query=filters,
+        )
+        for result in self._save_iter_results(results):
+            yield TrackedPackage(result)
+
+    def get_trackings(
+        self,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        page_size: Optional[int] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> List[TrackedPackage]:
         """Return tracking information for all packages.
 
+        Kwargs:
+            max_workers (int): The number of pages to request concurrently.
+                Default 1.
+            checkpoint (scurri.checkpoint.PaginationCheckpoint): If given, pages are
+                saved to the checkpoint as they are received and a request that was
+                stopped by an error is resumed from it.
+            limits (scurri.request.PaginationLimits): Optional limits on the number
+                of packages, pages or bytes requested, or on the time taken.
+            page_size (int): The number of packages to request in each page. The
+                server's default is used if this is not given.
+            filters (dict): Query parameters used by the server to filter the
+                packages returned, for example {"status": "DELIVERED"}.
+
         Returns:
             list(scurri.models.TrackedPackage)
         """
-        results = TrackingsRequest.request(api_session=self.session)
+        results = TrackingsRequest.request(
+            api_session=self.session,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            limits=limits,
+            page_size=page_size,
+            query=filters,
+        )
+        self._save_results(results)
         return [TrackedPackage(result) for result in results]
 
+    def iter_trackings(
+        self,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        page_size: Optional[int] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> Iterator[TrackedPackage]:
+        """Yield tracking information for all packages.
+
+        Packages are yielded page by page as they are received, so only one page of
+        results is held in memory at a time.
+
+        Kwargs:
+            max_workers (int): The number of pages to request concurrently.
+                Default 1.
+            checkpoint (scurri.checkpoint.PaginationCheckpoint): If given, pages are
+                saved to the checkpoint as they are received and a request that was
+                stopped by an error is resumed from it.
+            limits (scurri.request.PaginationLimits): Optional limits on the number
+                of packages, pages or bytes requested, or on the time taken.
+            page_size (int): The number of packages to request in each page. The
+                server's default is used if this is not given.
+            filters (dict): Query parameters used by the server to filter the
+                packages returned, for example {"status": "DELIVERED"}.
+
+        Returns:
+            iterator(scurri.models.TrackedPackage)
+        """
+        results = TrackingsRequest.iter_results(
+            api_session=self.session,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            limits=limits,
+            page_size=page_size,
+            query=filters,
+        )
+        for result in self._save_iter_results(results):
+            yield TrackedPackage(result)
+
+    def get_trackings_table(
+        self,
+        carrier_slug: Optional[str] = None,
+        max_workers: int = 1,
+        page_size: Optional[int] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> TrackingTable:
+        """Return tracking information for all packages as a column oriented table.
+
+        Response data is added to the table as each page is received without
+        creating model objects, so this uses much less memory than get_trackings
+        for large numbers of packages.
+
+        Kwargs:
+            carrier_slug (str): If given only packages from this carrier will be
+                requested.
+            max_workers (int): The number of pages to request concurrently.
+                Default 1.
+            page_size (int): The number of packages to request in each page.
+            filters (dict): Query parameters used by the server to filter the
+                packages returned.
+
+        Returns:
+            scurri.tables.TrackingTable
+        """
+        if carrier_slug is None:
+            results = TrackingsRequest.iter_results(
+                api_session=self.session,
+                max_workers=max_workers,
+                page_size=page_size,
+                query=filters,
+            )
+        else:
+            results = CarrierTrackingsRequest.iter_results(
+                api_session=self.session,
+                params={"carrier_slug": carrier_slug},
+                max_workers=max_workers,
+                page_size=page_size,
+                query=filters,
+            )
+        return TrackingTable(self._save_iter_results(results))
+
     def get_tracking_by_package_id(self, package_id: str) -> TrackedPackage:
         """Return tracking information for a package by package ID.
 
@@ -111,6 +400,10 @@ class ScurriAPI:
         Raises:
             scurri.exceptions.PackageNotFound: If request does not return a package.
         """
+        if self.store is not None and self.store_max_age is not None:
+            package = self.store.get_package(package_id, max_age=self.store_max_age)
+            if package is not None:
+                return package
         response = TrackingByPackageID.request(
             api_session=self.session, params={"package_id": package_id}
         )
@@ -118,6 +411,7 @@ class ScurriAPI:
             raise exceptions.PackageNotFound(
                 f'No package found with ID "{package_id}".'
             )
+        self._save_results([response])
         return TrackedPackage(response)
 
     def get_tracking_by_tracking_number(
@@ -138,6 +432,12 @@ class ScurriAPI:
         Raises:
             scurri.exceptions.PackageNotFound: If request does not return a package.
         """
+        if self.store is not None and self.store_max_age is not None:
+            package = self.store.get_package_by_tracking_number(
+                carrier_slug, tracking_number, max_age=self.store_max_age
+            )
+            if package is not None:
+                return package
         response = TrackingByTrackingNumber.request(
             api_session=self.session,
             params={"carrier_slug": carrier_slug, "tracking_number": tracking_number},
@@ -147,4 +447,90 @@ class ScurriAPI:
                 f'No package found with carrier "{carrier_slug}" and '
                 f'tracking number "{tracking_number}".'
             )
+        self._save_results([response])
         return TrackedPackage(response)
+
+    def _save_results(self, results: List[Dict[str, Any]]) -> None:
+        """Save tracked package response data to the store, if there is one."""
+        if self.store is not None:
+            self.store.save(results)
+
+    def _save_iter_results(
+        self, results: Iterable[Dict[str, Any]]
+    ) -> Iterable[Dict[str, Any]]:
+        """Save tracked package response data to the store as it is iterated."""
+        if self.store is None:
+            return results
+        return self.store.save_iter(results)
+
+    def get_trackings_by_package_ids(
+        self, package_ids: Iterable[str], max_workers: int = 10
+    ) -> Dict[str, Union[TrackedPackage, exceptions.PackageNotFound]]:
+        """Return tracking information for many packages by package ID.
+
+        Packages are requested concurrently. A package that cannot be found does not
+        stop the other packages being requested.
+
+        Kwargs:
+            package_ids (iterable(str)): The IDs of the packages to be requested.
+            max_workers (int): The maximum number of simultaneous requests.
+                Default 10.
+
+        Returns:
+            dict: A scurri.models.TrackedPackage, or the
+                scurri.exceptions.PackageNotFound exception raised when requesting it,
+                for each package ID.
+        """
+        return self._batch_lookup(
+            lambda package_id: self.get_tracking_by_package_id(package_id),
+            package_ids,
+            max_workers,
+        )
+
+    def get_trackings_by_tracking_numbers(
+        self, tracking_numbers: Iterable[Tuple[str, str]], max_workers: int = 10
+    ) -> Dict[Tuple[str, str], Union[TrackedPackage, exceptions.PackageNotFound]]:
+        """Return tracking information for many packages by tracking number.
+
+        Packages are requested concurrently. A package that cannot be found does not
+        stop the other packages being requested.
+
+        Kwargs:
+            tracking_numbers (iterable(tuple(str, str))): (carrier_slug,
+                tracking_number) pairs for the packages to be requested.
+            max_workers (int): The maximum number of simultaneous requests.
+                Default 10.
+
+        Returns:
+            dict: A scurri.models.TrackedPackage, or the
+                scurri.exceptions.PackageNotFound exception raised when requesting it,
+                for each (carrier_slug, tracking_number) pair.
+        """
+        return self._batch_lookup(
+            lambda key: self.get_tracking_by_tracking_number(
+                carrier_slug=key[0], tracking_number=key[1]
+            ),
+            tracking_numbers,
+            max_workers,
+        )
+
+    @staticmethod
+    def _batch_lookup(
+        lookup: Callable[[Key], TrackedPackage],
+        keys: Iterable[Key],
+        max_workers: int,
+    ) -> Dict[Key, Union[TrackedPackage, exceptions.PackageNotFound]]:
+        """Call lookup for each unique key with a thread pool."""
+
+        def lookup_or_not_found(
+            key: Key,
+        ) -> Union[TrackedPackage, exceptions.PackageNotFound]:
+            try:
+                return lookup(key)
+            except exceptions.PackageNotFound as e:
+                return e
+
+        unique_keys = list(dict.fromkeys(keys))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lookup_or_not_found, unique_keys)
+            return dict(zip(unique_keys, results))
@@ -1,15 +1,33 @@
 """The ScurriAPISession class."""
 
 import json
-from typing import Dict, Optional
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from . import exceptions
+from .cache import HTTPCache
+from .metrics import RequestObserver
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
 
+JSONDecoder = Callable[[bytes], Any]
+CredentialProvider = Callable[[], Tuple[str, str]]
 
-class ScurriAPISession:
-    """The ScurriAPISession class provides a Scurri API session."""
+
+def default_json_decoder() -> JSONDecoder:
+    """Return orjson.loads if orjson is installed, otherwise json.loads."""
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover
+        return json.loads
+    return orjson.loads
+
+
+class BaseScurriAPISession:
+    """Base class for Scurri API sessions."""
 
     STAGING_URL: str = "https://tracking-staging.scurri.co.uk/api/v1"
     LIVE_URL: str = "https://tracking.scurri.co.uk/api/v1"
@@ -18,37 +36,203 @@ class ScurriAPISession:
     TRACKINGS_URI: str = "/trackings"
     CARRIERS_URI: str = "/carriers"
 
-    def __init__(self, staging: bool = False) -> None:
-        """Create a scurri API session."""
+    def __init__(
+        self,
+        staging: bool = False,
+        json_decoder: Optional[JSONDecoder] = None,
+        http_cache: Optional[HTTPCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        credential_provider: Optional[CredentialProvider] = None,
+        observer: Optional[RequestObserver] = None,
+    ) -> None:
+        """Create a scurri API session.
+
+        Kwargs:
+            staging (bool): If True the Scurri staging API will be used.
+            json_decoder (callable): A function used to decode response bodies. It
+                is passed the body as bytes. Defaults to orjson.loads if orjson is
+                installed, otherwise json.loads.
+            http_cache (scurri.cache.HTTPCache): If given, responses to single
+                resource requests are cached and revalidated with conditional
+                requests.
+            retry_policy (scurri.retry.RetryPolicy): Decides when failed requests
+                are retried. Defaults to RetryPolicy().
+            rate_limiter (scurri.ratelimit.RateLimiter): If given, every request
+                waits for the rate limiter and its responses adjust its rate.
+            credential_provider (callable): Returns a (username, password) tuple. If
+                given, the session authorises itself when it is first used and
+                whenever its token is rejected.
+            observer (scurri.metrics.RequestObserver): If given, it is sent the
+                timing, status and size of every request and the totals of every
+                paginated request, for example a scurri.metrics.MetricsCollector.
+        """
         if staging is True:
             self.base_url = self.STAGING_URL
         else:
             self.base_url = self.LIVE_URL
         self.token: Optional[str] = None
+        if json_decoder is None:
+            json_decoder = default_json_decoder()
+        self.json_decoder: JSONDecoder = json_decoder
+        self.http_cache = http_cache
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.credential_provider = credential_provider
+        self.observer = observer
+        self._credentials: Optional[Tuple[str, str]] = None
+        self._auth_lock = threading.Lock()
+
+    def get_headers(self) -> Dict[str, str]:
+        """Return auth headers for requests."""
+        token = self.token
+        if token is None:
+            raise exceptions.NotAuthorizedException()
+        return {"Authorization": f"Token {token}"}
+
+    def can_refresh_token(self) -> bool:
+        """Return True if the session can authorise itself again."""
+        return self.credential_provider is not None or self._credentials is not None
+
+    def _get_credentials(self) -> Tuple[str, str]:
+        """Return the username and password used to refresh the token."""
+        if self.credential_provider is not None:
+            return self.credential_provider()
+        if self._credentials is None:
+            raise exceptions.NotAuthorizedException()
+        return self._credentials
+
+
+class ScurriAPISession(BaseScurriAPISession):
+    """The ScurriAPISession class provides a Scurri API session.
+
+    One session can be shared by many threads. Requests only read the session's
+    configuration, and connections are taken from a thread safe pool. The pool
+    should hold at least as many connections as there are threads making requests,
+    otherwise extra connections are opened and discarded after each request.
+    """
+
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 32
+    CONNECT_TIMEOUT = 10.0
+    READ_TIMEOUT = 60.0
+
+    def __init__(
+        self,
+        staging: bool = False,
+        json_decoder: Optional[JSONDecoder] = None,
+        http_cache: Optional[HTTPCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE,
+        pool_block: bool = False,
+        connect_timeout: Optional[float] = CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = READ_TIMEOUT,
+        keep_alive: bool = True,
+        credential_provider: Optional[CredentialProvider] = None,
+        observer: Optional[RequestObserver] = None,
+    ) -> None:
+        """Create a scurri API session.
+
+        Kwargs:
+            staging (bool): If True the Scurri staging API will be used.
+            json_decoder (callable): A function used to decode response bodies. It
+                is passed the body as bytes. Defaults to orjson.loads if orjson is
+                installed, otherwise json.loads.
+            http_cache (scurri.cache.HTTPCache): If given, responses to single
+                resource requests are cached and revalidated with conditional
+                requests.
+            retry_policy (scurri.retry.RetryPolicy): Decides when failed requests
+                are retried. Defaults to RetryPolicy().
+            rate_limiter (scurri.ratelimit.RateLimiter): If given, every request
+                waits for the rate limiter and its responses adjust its rate.
+            pool_connections (int): The number of hosts to keep connection pools
+                for. Default 10.
+            pool_maxsize (int): The maximum number of connections kept open to each
+                host. Set this to at least the number of workers used for concurrent
+                requests. Default 32.
+            pool_block (bool): If True, requests wait for a free connection when the
+                pool is full instead of opening a new one. Default False.
+            connect_timeout (float): Seconds to wait for a connection to be made, or
+                None to wait forever. Default 10.
+            read_timeout (float): Seconds to wait between bytes received from the
+                server, or None to wait forever. Default 60.
+            keep_alive (bool): If False, connections are closed after each request.
+                Default True.
+            credential_provider (callable): Returns a (username, password) tuple. If
+                given, the session authorises itself when it is first used and
+                whenever its token is rejected.
+            observer (scurri.metrics.RequestObserver): If given, it is sent the
+                timing, status and size of every request and the totals of every
+                paginated request, for example a scurri.metrics.MetricsCollector.
+        """
+        super().__init__(
+            staging=staging,
+            json_decoder=json_decoder,
+            http_cache=http_cache,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            credential_provider=credential_provider,
+            observer=observer,
+        )
+        self.timeout = (connect_timeout, read_timeout)
         self.session: requests.Session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
 
     def auth(self, username: str, password: str) -> None:
         """
         Make a request to the authorizations endpoint to get an authorisation token.
 
+        The credentials are kept so that the token can be refreshed if it expires.
+
         Kwargs:
             username (str): Your scurri username.
             password (str): Your scurri password.
         """
-        self._get_token(username=username, password=password)
+        with self._auth_lock:
+            self._get_token(username=username, password=password)
+            self._credentials = (username, password)
+
+    def refresh_token(self, rejected_token: Optional[str]) -> bool:
+        """Get a new token to replace rejected_token.
+
+        If several threads have the same token rejected only the first gets a new
+        token, the others use the token it got.
+
+        Args:
+            rejected_token (str): The token that was rejected, or None if the
+                session has not been authorised.
+
+        Returns:
+            bool: True if a new token is available, False if the session has no
+                credentials to authorise with.
+        """
+        if not self.can_refresh_token():
+            return False
+        with self._auth_lock:
+            if self.token == rejected_token:
+                username, password = self._get_credentials()
+                self._get_token(username=username, password=password)
+        return True
 
     def _get_token(self, username: str, password: str) -> None:
         """Request an authorisation token."""
         url = f"{self.base_url}{self.AUTH_URI}"
         request_json = {"username": username, "password": password}
-        response = self.session.post(url, json=request_json)
+        response = self.session.post(url, json=request_json, timeout=self.timeout)
         try:
             self.token = response.json()["token"]
         except (json.JSONDecodeError, KeyError):
             raise exceptions.InvalidAuthRequestResponse(response.text)
-
-    def get_headers(self) -> Dict[str, str]:
-        """Return auth headers for requests."""
-        if self.token is None:
-            raise exceptions.NotAuthorizedException()
-        return {"Authorization": f"Token {self.token}"}
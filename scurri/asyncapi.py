@@ -0,0 +1,363 @@
+"""The AsyncScurriAPI class provides asyncio methods for the Scurri API."""
+
+import asyncio
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from . import exceptions
+from .api import NOT_FOUND_RESPONSE
+from .asyncapisession import AsyncScurriAPISession
+from .checkpoint import PaginationCheckpoint
+from .models import Carrier, TrackedPackage
+from .request import (
+    CarrierRequest,
+    CarriersRequest,
+    CarrierTrackingsRequest,
+    PaginationLimits,
+    TrackingByPackageID,
+    TrackingByTrackingNumber,
+    TrackingsRequest,
+)
+
+Key = TypeVar("Key")
+
+
+class AsyncScurriAPI:
+    """The AsyncScurriAPI class provides asyncio methods for the Scurri API.
+
+    Methods mirror those of scurri.ScurriAPI and return the same models.
+    """
+
+    def __init__(self, staging: bool = False, connection_limit: int = 100) -> None:
+        """Create an asyncio Scurri API session.
+
+        Await the auth method with you login credentials before making any requests.
+
+        Kwargs:
+            staging (bool): If True the Scurri staging API will be used, if False the
+                live API will be used. Default False.
+            connection_limit (int): The maximum number of simultaneous connections.
+                Default 100.
+        """
+        self.session: AsyncScurriAPISession = AsyncScurriAPISession(
+            staging=staging, connection_limit=connection_limit
+        )
+
+    async def auth(self, username: str, password: str) -> None:
+        """Authorise a Scurri API session.
+
+        Kwargs:
+            username (str): Your Scurri account username.
+            password (str): Your Scurri account password.
+        """
+        await self.session.auth(username=username, password=password)
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session."""
+        await self.session.close()
+
+    async def __aenter__(self) -> "AsyncScurriAPI":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    async def get_carriers(self) -> List[Carrier]:
+        """Return carrier information for all carriers.
+
+        Returns:
+            list(scurri.models.Carrier)
+        """
+        results = await CarriersRequest.async_request(api_session=self.session)
+        return [Carrier(result) for result in results]
+
+    async def get_carrier(self, carrier_slug: str) -> Carrier:
+        """Return carrier information for a given carrier.
+
+        Kwargs:
+            carrier_slug (str): The slug name of the carrier to be requested.
+
+        Returns:
+            scurri.models.Carrier
+
+        Raises:
+            scurri.exceptions.CarrierNotFound: If carrier_slug does not exist.
+        """
+        response = await CarrierRequest.async_request(
+            api_session=self.session, params={"carrier_slug": carrier_slug}
+        )
+        if response == NOT_FOUND_RESPONSE:
+            raise exceptions.CarrierNotFound(carrier_slug)
+        return Carrier(response)
+
+    async def get_carrier_trackings(
+        self,
+        carrier_slug: str,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        page_size: Optional[int] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> List[TrackedPackage]:
+        """Return tracking information for all packages from a given carrier.
+
+        Kwargs:
+            carrier_slug (str): The slug name of the carrier to be requested.
+            max_workers (int): The number of pages to request concurrently.
+                Default 1.
+            checkpoint (scurri.checkpoint.PaginationCheckpoint): If given, pages are
+                saved to the checkpoint as they are received and a request that was
+                stopped by an error is resumed from it.
+            limits (scurri.request.PaginationLimits): Optional limits on the number
+                of packages, pages or bytes requested, or on the time taken.
+            page_size (int): The number of packages to request in each page. The
+                server's default is used if this is not given.
+            filters (dict): Query parameters used by the server to filter the
+                packages returned, for example {"status": "DELIVERED"}.
+
+        Returns:
+            list(scurri.models.TrackedPackage)
+
+        Raises:
+            scurri.exceptions.InvalidResponse: If the response is not valid or
+                carrier_slug does not exist.
+        """
+        results = await CarrierTrackingsRequest.async_request(
+            params={"carrier_slug": carrier_slug},
+            api_session=self.session,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            limits=limits,
+            page_size=page_size,
+            query=filters,
+        )
+        return [TrackedPackage(result) for result in results]
+
+    async def iter_carrier_trackings(
+        self,
+        carrier_slug: str,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        page_size: Optional[int] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> AsyncIterator[TrackedPackage]:
+        """Yield tracking information for all packages from a given carrier.
+
+        Kwargs:
+            carrier_slug (str): The slug name of the carrier to be requested.
+            max_workers (int): The number of pages to request concurrently.
+                Default 1.
+            checkpoint (scurri.checkpoint.PaginationCheckpoint): If given, pages are
+                saved to the checkpoint as they are received and a request that was
+                stopped by an error is resumed from it.
+            limits (scurri.request.PaginationLimits): Optional limits on the number
+                of packages, pages or bytes requested, or on the time taken.
+            page_size (int): The number of packages to request in each page. The
+                server's default is used if this is not given.
+            filters (dict): Query parameters used by the server to filter the
+                packages returned, for example {"status": "DELIVERED"}.
+
+        Returns:
+            async iterator(scurri.models.TrackedPackage)
+        """
+        results = CarrierTrackingsRequest.aiter_results(
+            params={"carrier_slug": carrier_slug},
+            api_session=self.session,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            limits=limits,
+            page_size=page_size,
+            query=filters,
+        )
+        async for result in results:
+            yield TrackedPackage(result)
+
+    async def get_trackings(
+        self,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        page_size: Optional[int] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> List[TrackedPackage]:
+        """Return tracking information for all packages.
+
+        Kwargs:
+            max_workers (int): The number of pages to request concurrently.
+                Default 1.
+            checkpoint (scurri.checkpoint.PaginationCheckpoint): If given, pages are
+                saved to the checkpoint as they are received and a request that was
+                stopped by an error is resumed from it.
+            limits (scurri.request.PaginationLimits): Optional limits on the number
+                of packages, pages or bytes requested, or on the time taken.
+            page_size (int): The number of packages to request in each page. The
+                server's default is used if this is not given.
+            filters (dict): Query parameters used by the server to filter the
+                packages returned, for example {"status": "DELIVERED"}.
+
+        Returns:
+            list(scurri.models.TrackedPackage)
+        """
+        results = await TrackingsRequest.async_request(
+            api_session=self.session,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            limits=limits,
+            page_size=page_size,
+            query=filters,
+        )
+        return [TrackedPackage(result) for result in results]
+
+    async def iter_trackings(
+        self,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        page_size: Optional[int] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> AsyncIterator[TrackedPackage]:
+        """Yield tracking information for all packages.
+
+        Kwargs:
+            max_workers (int): The number of pages to request concurrently.
+                Default 1.
+            checkpoint (scurri.checkpoint.PaginationCheckpoint): If given, pages are
+                saved to the checkpoint as they are received and a request that was
+                stopped by an error is resumed from it.
+            limits (scurri.request.PaginationLimits): Optional limits on the number
+                of packages, pages or bytes requested, or on the time taken.
+            page_size (int): The number of packages to request in each page. The
+                server's default is used if this is not given.
+            filters (dict): Query parameters used by the server to filter the
+                packages returned, for example {"status": "DELIVERED"}.
+
+        Returns:
+            async iterator(scurri.models.TrackedPackage)
+        """
+        results = TrackingsRequest.aiter_results(
+            api_session=self.session,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            limits=limits,
+            page_size=page_size,
+            query=filters,
+        )
+        async for result in results:
+            yield TrackedPackage(result)
+
+    async def get_tracking_by_package_id(self, package_id: str) -> TrackedPackage:
+        """Return tracking information for a package by package ID.
+
+        Kwargs:
+            package_id (str): The ID of the package to be requested.
+
+        Returns:
+            scurri.models.TrackedPackage
+
+        Raises:
+            scurri.exceptions.PackageNotFound: If request does not return a package.
+        """
+        response = await TrackingByPackageID.async_request(
+            api_session=self.session, params={"package_id": package_id}
+        )
+        if response == NOT_FOUND_RESPONSE:
+            raise exceptions.PackageNotFound(
+                f'No package found with ID "{package_id}".'
+            )
+        return TrackedPackage(response)
+
+    async def get_tracking_by_tracking_number(
+        self, carrier_slug: str, tracking_number: str
+    ) -> TrackedPackage:
+        """Return tracking information for a package by tracking number.
+
+        Kwargs:
+            carrier_slug (str): The slug name of the carrier to be requested.
+            tracking_number (str): The tracking number of the package to be requested.
+
+        Returns:
+            scurri.models.TrackedPackage
+
+        Raises:
+            scurri.exceptions.PackageNotFound: If request does not return a package.
+        """
+        response = await TrackingByTrackingNumber.async_request(
+            api_session=self.session,
+            params={"carrier_slug": carrier_slug, "tracking_number": tracking_number},
+        )
+        if response == NOT_FOUND_RESPONSE:
+            raise exceptions.PackageNotFound(
+                f'No package found with carrier "{carrier_slug}" and '
+                f'tracking number "{tracking_number}".'
+            )
+        return TrackedPackage(response)
+
+    async def get_trackings_by_package_ids(
+        self, package_ids: Iterable[str], max_workers: int = 10
+    ) -> Dict[str, Union[TrackedPackage, exceptions.PackageNotFound]]:
+        """Return tracking information for many packages by package ID.
+
+        See scurri.ScurriAPI.get_trackings_by_package_ids.
+        """
+        return await self._batch_lookup(
+            lambda package_id: self.get_tracking_by_package_id(package_id),
+            package_ids,
+            max_workers,
+        )
+
+    async def get_trackings_by_tracking_numbers(
+        self, tracking_numbers: Iterable[Tuple[str, str]], max_workers: int = 10
+    ) -> Dict[Tuple[str, str], Union[TrackedPackage, exceptions.PackageNotFound]]:
+        """Return tracking information for many packages by tracking number.
+
+        See scurri.ScurriAPI.get_trackings_by_tracking_numbers.
+        """
+        return await self._batch_lookup(
+            lambda key: self.get_tracking_by_tracking_number(
+                carrier_slug=key[0], tracking_number=key[1]
+            ),
+            tracking_numbers,
+            max_workers,
+        )
+
+    @staticmethod
+    async def _batch_lookup(
+        lookup: Callable[[Key], Awaitable[TrackedPackage]],
+        keys: Iterable[Key],
+        max_workers: int,
+    ) -> Dict[Key, Union[TrackedPackage, exceptions.PackageNotFound]]:
+        """Await lookup for each unique key, at most max_workers at a time."""
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def lookup_or_not_found(
+            key: Key,
+        ) -> Union[TrackedPackage, exceptions.PackageNotFound]:
+            async with semaphore:
+                try:
+                    return await lookup(key)
+                except exceptions.PackageNotFound as e:
+                    return e
+
+        unique_keys = list(dict.fromkeys(keys))
+        results = await asyncio.gather(*(lookup_or_not_found(k) for k in unique_keys))
+        return dict(zip(unique_keys, results))
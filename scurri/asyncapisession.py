@@ -0,0 +1,184 @@
+"""The AsyncScurriAPISession class."""
+
+import asyncio
+import json
+from types import TracebackType
+from typing import TYPE_CHECKING, Optional, Type
+
+from . import exceptions
+from .apisession import (
+    BaseScurriAPISession,
+    CredentialProvider,
+    JSONDecoder,
+    ScurriAPISession,
+)
+from .cache import HTTPCache
+from .metrics import RequestObserver
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+class AsyncScurriAPISession(BaseScurriAPISession):
+    """The AsyncScurriAPISession class provides an asyncio Scurri API session.
+
+    Requires the aiohttp package, which can be installed with the async extra.
+    """
+
+    def __init__(
+        self,
+        staging: bool = False,
+        connection_limit: int = 100,
+        json_decoder: Optional[JSONDecoder] = None,
+        http_cache: Optional[HTTPCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        connect_timeout: Optional[float] = ScurriAPISession.CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = ScurriAPISession.READ_TIMEOUT,
+        keep_alive: bool = True,
+        credential_provider: Optional[CredentialProvider] = None,
+        observer: Optional[RequestObserver] = None,
+    ) -> None:
+        """Create an asyncio scurri API session.
+
+        The underlying aiohttp session is created when it is first used so that it
+        belongs to the running event loop.
+
+        Kwargs:
+            staging (bool): If True the Scurri staging API will be used.
+            connection_limit (int): The maximum number of simultaneous connections.
+                Default 100.
+            json_decoder (callable): A function used to decode response bodies. It
+                is passed the body as bytes. Defaults to orjson.loads if orjson is
+                installed, otherwise json.loads.
+            http_cache (scurri.cache.HTTPCache): If given, responses to single
+                resource requests are cached and revalidated with conditional
+                requests.
+            retry_policy (scurri.retry.RetryPolicy): Decides when failed requests
+                are retried. Defaults to RetryPolicy().
+            rate_limiter (scurri.ratelimit.RateLimiter): If given, every request
+                waits for the rate limiter and its responses adjust its rate.
+            connect_timeout (float): Seconds to wait for a connection to be made, or
+                None to wait forever. Default 10.
+            read_timeout (float): Seconds to wait between bytes received from the
+                server, or None to wait forever. Default 60.
+            keep_alive (bool): If False, connections are closed after each request.
+                Default True.
+            credential_provider (callable): Returns a (username, password) tuple. If
+                given, the session authorises itself when it is first used and
+                whenever its token is rejected.
+            observer (scurri.metrics.RequestObserver): If given, it is sent the
+                timing, status and size of every request and the totals of every
+                paginated request, for example a scurri.metrics.MetricsCollector.
+        """
+        super().__init__(
+            staging=staging,
+            json_decoder=json_decoder,
+            http_cache=http_cache,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            credential_provider=credential_provider,
+            observer=observer,
+        )
+        self.connection_limit = connection_limit
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._async_auth_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def session(self) -> "aiohttp.ClientSession":
+        """Return the aiohttp session, creating it if necessary."""
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError as e:  # pragma: no cover
+                raise ImportError(
+                    "AsyncScurriAPISession requires aiohttp. "
+                    "Install it with `pip install scurri[async]`."
+                ) from e
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.connection_limit, force_close=not self.keep_alive
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    connect=self.connect_timeout,
+                    sock_read=self.read_timeout,
+                ),
+            )
+        return self._session
+
+    async def auth(self, username: str, password: str) -> None:
+        """
+        Make a request to the authorizations endpoint to get an authorisation token.
+
+        The credentials are kept so that the token can be refreshed if it expires.
+
+        Kwargs:
+            username (str): Your scurri username.
+            password (str): Your scurri password.
+        """
+        async with self._get_async_auth_lock():
+            await self._get_token(username=username, password=password)
+            self._credentials = (username, password)
+
+    async def refresh_token(self, rejected_token: Optional[str]) -> bool:
+        """Get a new token to replace rejected_token.
+
+        Behaves as ScurriAPISession.refresh_token. Only one task at a time can get a
+        new token.
+
+        Args:
+            rejected_token (str): The token that was rejected, or None if the
+                session has not been authorised.
+
+        Returns:
+            bool: True if a new token is available, False if the session has no
+                credentials to authorise with.
+        """
+        if not self.can_refresh_token():
+            return False
+        async with self._get_async_auth_lock():
+            if self.token == rejected_token:
+                username, password = self._get_credentials()
+                await self._get_token(username=username, password=password)
+        return True
+
+    def _get_async_auth_lock(self) -> asyncio.Lock:
+        """Return the lock held while authorising, creating it if necessary."""
+        if self._async_auth_lock is None:
+            self._async_auth_lock = asyncio.Lock()
+        return self._async_auth_lock
+
+    async def _get_token(self, username: str, password: str) -> None:
+        """Request an authorisation token."""
+        url = f"{self.base_url}{self.AUTH_URI}"
+        request_json = {"username": username, "password": password}
+        async with self.session.post(url, json=request_json) as response:
+            text = await response.text()
+        try:
+            self.token = json.loads(text)["token"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            raise exceptions.InvalidAuthRequestResponse(text)
+
+    async def close(self) -> None:
+        """Close the underlying aiohttp session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._async_auth_lock = None
+
+    async def __aenter__(self) -> "AsyncScurriAPISession":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.close()
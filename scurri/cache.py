@@ -0,0 +1,189 @@
+"""Caches for Scurri API data."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+Value = TypeVar("Value")
+
+
+class TTLCache(Generic[Value]):
+    """A thread safe least recently used cache with optional expiry times.
+
+    Kwargs:
+        ttl (float): The number of seconds entries remain valid for. If None entries
+            do not expire. Default None.
+        max_size (int): The maximum number of entries. When the cache is full the
+            least recently used entry is removed. If None the size is not limited.
+            Default None.
+        clock (callable): Returns the current time in seconds. Default
+            time.monotonic.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_size: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a cache."""
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], Value]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Hashable) -> Optional[Value]:
+        """Return the value stored for key, or None if it is missing or expired."""
+        with self._lock:
+            try:
+                expires, value = self._entries[key]
+            except KeyError:
+                return None
+            if expires is not None and expires <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Value, ttl: Optional[float] = None) -> None:
+        """Store value for key.
+
+        Kwargs:
+            ttl (float): Overrides the cache's ttl for this entry.
+        """
+        if ttl is None:
+            ttl = self.ttl
+        expires = None if ttl is None else self.clock() + ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            if self.max_size is not None:
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove the entry for key, if there is one."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class CachedResponse:
+    """A raw response body with the validators needed to revalidate it.
+
+    The body is kept undecoded so that each cache hit decodes a new object and
+    callers cannot change the cached response.
+    """
+
+    __slots__ = ("body", "etag", "last_modified")
+
+    def __init__(
+        self,
+        body: bytes,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        """Create a cached response."""
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def size(self) -> int:
+        """Return the size of the response body in bytes."""
+        return len(self.body)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Return headers that ask the server to revalidate this response."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """Cache responses by URL and revalidate them with conditional requests.
+
+    Responses with an ETag or Last-Modified header are stored. When the same URL is
+    requested again If-None-Match and If-Modified-Since headers are sent, and if the
+    server responds 304 Not Modified the stored response is used.
+
+    Kwargs:
+        max_size (int): The maximum number of responses to store. Default 10000.
+
+    Attributes:
+        hits (int): The number of requests answered from the cache.
+        misses (int): The number of requests that returned a full response.
+        bytes_saved (int): The total size of response bodies that did not need to be
+            transferred.
+    """
+
+    def __init__(self, max_size: Optional[int] = 10000) -> None:
+        """Create an HTTP cache."""
+        self._responses: TTLCache[CachedResponse] = TTLCache(max_size=max_size)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached response for url, if there is one."""
+        return self._responses.get(url)
+
+    def store(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes,
+    ) -> None:
+        """Record a full response, caching it if it can be revalidated."""
+        with self._lock:
+            self.misses += 1
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            self._responses.invalidate(url)
+            return
+        self._responses.set(
+            url,
+            CachedResponse(body=body, etag=etag, last_modified=last_modified),
+        )
+
+    def record_hit(self, cached_response: CachedResponse) -> None:
+        """Record that a cached response was used."""
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += cached_response.size
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._responses.clear()
@@ -0,0 +1,106 @@
+"""Checkpoints that let paginated requests be resumed."""
+
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, Iterator, Optional
+
+
+class PaginationCheckpoint:
+    """Save the pages of a paginated request so that it can be resumed.
+
+    Each page is written to its own file in directory as soon as it is received,
+    along with a state file holding the URL of the next page. If the request is
+    stopped by an error, making it again with the same checkpoint yields the saved
+    pages from disk and then continues from the next page, so only the remaining
+    pages are requested.
+
+    A checkpoint belongs to one request URL. Using it for a different request
+    raises ValueError. Call clear to start again.
+
+    Args:
+        directory (str): The directory the checkpoint is saved in. It is created if
+            it does not exist.
+    """
+
+    STATE_FILE = "state.json"
+    PAGE_FILE = "page-{:06d}.json"
+
+    URI = "uri"
+    NEXT = "next"
+    PAGE_COUNT = "page_count"
+
+    def __init__(self, directory: str) -> None:
+        """Create or load a pagination checkpoint."""
+        self.directory = directory
+        self.uri: Optional[str] = None
+        self.next: Optional[str] = None
+        self.page_count = 0
+        os.makedirs(directory, exist_ok=True)
+        self.load()
+
+    @property
+    def complete(self) -> bool:
+        """Return True if every page of the request has been saved."""
+        return self.page_count > 0 and self.next is None
+
+    def load(self) -> None:
+        """Load the checkpoint state from the directory."""
+        try:
+            with open(self._path(self.STATE_FILE)) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        self.uri = state[self.URI]
+        self.next = state[self.NEXT]
+        self.page_count = state[self.PAGE_COUNT]
+
+    def start(self, uri: str) -> None:
+        """Check that the checkpoint belongs to the request for uri.
+
+        Raises:
+            ValueError: If the checkpoint was made by a request for another URL.
+        """
+        if self.uri is None:
+            self.uri = uri
+        elif self.uri != uri:
+            raise ValueError(
+                f"Checkpoint in '{self.directory}' is for '{self.uri}', not '{uri}'."
+            )
+
+    def iter_pages(self) -> Iterator[Dict[str, Any]]:
+        """Yield the response data of each saved page in order."""
+        for page_number in range(1, self.page_count + 1):
+            with open(self._path(self.PAGE_FILE.format(page_number))) as f:
+                yield json.load(f)
+
+    def save_page(self, page_data: Dict[str, Any], next_uri: Optional[str]) -> None:
+        """Save the next page of response data and the URL of the page after it."""
+        page_count = self.page_count + 1
+        self._write(self.PAGE_FILE.format(page_count), page_data)
+        self._write(
+            self.STATE_FILE,
+            {self.URI: self.uri, self.NEXT: next_uri, self.PAGE_COUNT: page_count},
+        )
+        self.page_count = page_count
+        self.next = next_uri
+
+    def clear(self) -> None:
+        """Delete the saved pages and state."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+        self.uri = None
+        self.next = None
+        self.page_count = 0
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _write(self, filename: str, data: Dict[str, Any]) -> None:
+        """Atomically write data to a file in the checkpoint directory."""
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, delete=False, suffix=".tmp"
+        ) as f:
+            json.dump(data, f)
+        os.replace(f.name, self._path(filename))
@@ -0,0 +1,354 @@
+"""The scurri command line interface.
+
+Exports tracked packages to NDJSON, CSV or Parquet files, streaming each page to
+the output as it is received, and looks up single packages.
+
+Credentials are read from the SCURRI_USERNAME and SCURRI_PASSWORD environment
+variables. The username can also be given with --username, and the password is
+prompted for if it is not set.
+"""
+
+import argparse
+import getpass
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from . import exceptions
+from .api import ScurriAPI
+from .apisession import ScurriAPISession
+from .checkpoint import PaginationCheckpoint
+from .export import ExportShard, TrackingExport
+from .models import TrackedPackage
+from .request import CarrierTrackingsRequest, PaginatedRequest, TrackingsRequest
+from .writers import FORMATS, ResultWriter, get_writer
+
+USERNAME_VARIABLE = "SCURRI_USERNAME"
+PASSWORD_VARIABLE = "SCURRI_PASSWORD"
+STDOUT = "-"
+
+# Errors from the API are reported without the usage message given for invalid
+# arguments, which are raised as ValueError.
+API_ERRORS = (
+    exceptions.InvalidResponse,
+    exceptions.InvalidAuthRequestResponse,
+    exceptions.BaseNotFoundError,
+    exceptions.NotAuthorizedException,
+    exceptions.TooManyRequestsError,
+    exceptions.TooManyRequestAtemptsError,
+    exceptions.ExportFailed,
+)
+
+
+class Progress:
+    """Report the number of packages written to a stream, normally stderr.
+
+    Kwargs:
+        stream (file): The stream written to. Nothing is written if this is None.
+        interval (float): The minimum number of seconds between reports.
+    """
+
+    def __init__(self, stream: Optional[IO[str]], interval: float = 0.5) -> None:
+        """Create a progress reporter."""
+        self.stream = stream
+        self.interval = interval
+        self.pages = 0
+        self.packages = 0
+        self.started = time.monotonic()
+        self.reported = 0.0
+
+    def update(self, packages: int, pages: int = 1) -> None:
+        """Count packages and pages written, reporting if the interval has passed."""
+        self.packages += packages
+        self.pages += pages
+        if time.monotonic() - self.reported >= self.interval:
+            self.report()
+
+    def report(self, end: str = "") -> None:
+        """Write the current totals."""
+        self.reported = time.monotonic()
+        if self.stream is None:
+            return
+        elapsed = max(self.reported - self.started, 1e-9)
+        self.stream.write(
+            f"\r{self.packages} packages, {self.pages} pages, "
+            f"{self.packages / elapsed:.0f} packages/s{end}"
+        )
+        self.stream.flush()
+
+    def finish(self) -> None:
+        """Write the final totals."""
+        self.report(end="\n")
+
+
+def parse_filters(filters: Sequence[str]) -> Dict[str, List[str]]:
+    """Return query parameters from KEY=VALUE strings.
+
+    Raises:
+        ValueError: If a filter does not contain "=".
+    """
+    query: Dict[str, List[str]] = {}
+    for item in filters:
+        key, separator, value = item.partition("=")
+        if not separator or not key:
+            raise ValueError(f"Filter '{item}' is not in the form KEY=VALUE.")
+        query.setdefault(key, []).append(value)
+    return query
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for the scurri command."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--staging", action="store_true", help="Use the Scurri staging API."
+    )
+    common.add_argument(
+        "--username",
+        default=os.environ.get(USERNAME_VARIABLE),
+        help=f"Scurri username. Defaults to ${USERNAME_VARIABLE}.",
+    )
+    common.add_argument(
+        "--quiet", action="store_true", help="Do not report progress on stderr."
+    )
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="ndjson",
+        help="The output format. CSV and Parquet have one row per tracking event.",
+    )
+
+    export = argparse.ArgumentParser(add_help=False, parents=[common, output])
+    export.add_argument(
+        "--max-workers",
+        type=int,
+        default=1,
+        help="The number of pages to request concurrently.",
+    )
+    export.add_argument(
+        "--page-size", type=int, help="The number of packages in each page."
+    )
+    export.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="A query parameter used by the server to filter packages.",
+    )
+    export.add_argument(
+        "--resume",
+        action="store_true",
+        help="Save progress next to the output file and resume from it if the "
+        "export was stopped.",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="scurri", description="Export tracking information from Scurri."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    trackings = subparsers.add_parser(
+        "export-trackings", parents=[export], help="Export every package."
+    )
+    trackings.add_argument("output", help="The output file.")
+    trackings.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Export carriers in this many processes. Each carrier is saved to a "
+        "shard next to the output file before the output is written.",
+    )
+    trackings.set_defaults(handler=export_trackings)
+    carrier_trackings = subparsers.add_parser(
+        "export-carrier-trackings",
+        parents=[export],
+        help="Export the packages from one carrier.",
+    )
+    carrier_trackings.add_argument("carrier_slug", help="The carrier's slug.")
+    carrier_trackings.add_argument("output", help="The output file.")
+    carrier_trackings.set_defaults(handler=export_carrier_trackings)
+    lookup = subparsers.add_parser(
+        "lookup", parents=[common, output], help="Look up packages."
+    )
+    lookup.add_argument(
+        "keys",
+        nargs="+",
+        metavar="KEY",
+        help="Package IDs, or CARRIER_SLUG:TRACKING_NUMBER with --tracking-numbers.",
+    )
+    lookup.add_argument(
+        "--tracking-numbers",
+        action="store_true",
+        help="Look up packages by carrier slug and tracking number.",
+    )
+    lookup.add_argument(
+        "--output", default=STDOUT, help="The output file. Defaults to stdout."
+    )
+    lookup.add_argument(
+        "--max-workers",
+        type=int,
+        default=10,
+        help="The number of simultaneous lookups.",
+    )
+    lookup.set_defaults(handler=lookup_packages)
+    return parser
+
+
+def make_api(args: argparse.Namespace) -> ScurriAPI:
+    """Return an API whose session authorises itself when it is first used."""
+    username = args.username
+    if not username:
+        raise ValueError(f"Pass --username or set ${USERNAME_VARIABLE}.")
+    password = os.environ.get(PASSWORD_VARIABLE)
+    if password is None:
+        password = getpass.getpass("Scurri password: ")
+    credentials = (username, password)
+    session = ScurriAPISession(
+        staging=args.staging, credential_provider=lambda: credentials
+    )
+    return ScurriAPI(session=session)
+
+
+@contextmanager
+def open_writer(format: str, path: str) -> Iterator[ResultWriter]:
+    """Open a writer for format that writes to path, or to stdout for "-"."""
+    if path == STDOUT:
+        with get_writer(format, sys.stdout.buffer) as writer:
+            yield writer
+        return
+    with open(path, "wb") as f:
+        with get_writer(format, f) as writer:
+            yield writer
+
+
+def export_trackings(args: argparse.Namespace) -> int:
+    """Export every package."""
+    if args.processes > 1:
+        return _export_sharded(args)
+    return _export_pages(args, TrackingsRequest, params=None)
+
+
+def export_carrier_trackings(args: argparse.Namespace) -> int:
+    """Export the packages from one carrier."""
+    return _export_pages(
+        args, CarrierTrackingsRequest, params={"carrier_slug": args.carrier_slug}
+    )
+
+
+def lookup_packages(args: argparse.Namespace) -> int:
+    """Look up packages, writing those found and reporting those that are not."""
+    scurri_api = make_api(args)
+    response: Dict[Any, Any]
+    if args.tracking_numbers:
+        keys = [_parse_tracking_number(key) for key in args.keys]
+        response = scurri_api.get_trackings_by_tracking_numbers(
+            keys, max_workers=args.max_workers
+        )
+    else:
+        response = scurri_api.get_trackings_by_package_ids(
+            args.keys, max_workers=args.max_workers
+        )
+    missing = 0
+    with open_writer(args.format, args.output) as writer:
+        for key, package in response.items():
+            if isinstance(package, TrackedPackage):
+                writer.write(package.to_dict())
+            else:
+                missing += 1
+                print(f"Not found: {key}", file=sys.stderr)
+    return 1 if missing else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the scurri command, returning the exit status."""
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    try:
+        return int(args.handler(args))
+    except API_ERRORS as e:
+        print(f"scurri: {e}", file=sys.stderr)
+    except ValueError as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        print("scurri: interrupted", file=sys.stderr)
+    return 1
+
+
+def _export_pages(
+    args: argparse.Namespace,
+    request_class: Type[PaginatedRequest],
+    params: Optional[Dict[str, str]],
+) -> int:
+    """Stream the pages of a request into the output file."""
+    query = parse_filters(args.filter)
+    checkpoint = _get_checkpoint(args)
+    scurri_api = make_api(args)
+    progress = Progress(None if args.quiet else sys.stderr)
+    pages = request_class.iter_pages(
+        api_session=scurri_api.session,
+        params=params,
+        max_workers=args.max_workers,
+        checkpoint=checkpoint,
+        query=query,
+        page_size=args.page_size,
+    )
+    with open_writer(args.format, args.output) as writer:
+        for page in pages:
+            for result in page.results:
+                writer.write(result)
+            progress.update(len(page.results))
+    progress.finish()
+    if checkpoint is not None:
+        shutil.rmtree(checkpoint.directory, ignore_errors=True)
+    return 0
+
+
+def _export_sharded(args: argparse.Namespace) -> int:
+    """Export carriers in worker processes, then write the shards to the output."""
+    if args.output == STDOUT:
+        raise ValueError("--processes requires an output file.")
+    query = parse_filters(args.filter)
+    directory = f"{args.output}.shards"
+    export = TrackingExport(
+        make_api(args),
+        directory,
+        processes=args.processes,
+        max_workers=args.max_workers,
+        page_size=args.page_size,
+        filters=query,
+        resume=args.resume,
+    )
+    progress = Progress(None if args.quiet else sys.stderr)
+
+    def shard_exported(shard: ExportShard) -> None:
+        progress.update(shard.count, pages=0)
+
+    export.run(progress=shard_exported)
+    with open_writer(args.format, args.output) as writer:
+        for result in export.iter_results():
+            writer.write(result)
+    progress.finish()
+    shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+def _get_checkpoint(args: argparse.Namespace) -> Optional[PaginationCheckpoint]:
+    if not args.resume:
+        return None
+    if args.output == STDOUT:
+        raise ValueError("--resume requires an output file.")
+    return PaginationCheckpoint(f"{args.output}.checkpoint")
+
+
+def _parse_tracking_number(key: str) -> Tuple[str, str]:
+    carrier_slug, separator, tracking_number = key.partition(":")
+    if not separator or not carrier_slug or not tracking_number:
+        raise ValueError(f"'{key}' is not in the form CARRIER_SLUG:TRACKING_NUMBER.")
+    return carrier_slug, tracking_number
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
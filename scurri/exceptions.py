@@ -1,5 +1,7 @@
 """Exceptions for the scurri package."""
 
+from typing import Dict
+
 
 class NotAuthorizedException(Exception):
     """Exception raised when attempting a request before authorising."""
@@ -48,9 +50,27 @@ class PackageNotFound(BaseNotFoundError):
 class TooManyRequestsError(Exception):
     """Exception raised when a paginated request has requested many pages."""
 
-    def __init__(self) -> None:
+    def __init__(self, message: str = "Too many pages requested.") -> None:
         """Exception raised when a paginated request has requested many pages."""
-        super().__init__("Too many pages requested.")
+        super().__init__(message)
+
+
+class PaginationCycleError(TooManyRequestsError):
+    """Exception raised when a paginated request links back to a page it has seen."""
+
+    def __init__(self, uri: str) -> None:
+        """Exception raised when a paginated request links back to a page it has seen."""
+        super().__init__(f'Pagination loops back to "{uri}".')
+
+
+class PaginationLimitExceeded(TooManyRequestsError):
+    """Exception raised when a paginated request goes past a PaginationLimits limit."""
+
+    def __init__(self, limit: str, value: float) -> None:
+        """Exception raised when a paginated request goes past a limit."""
+        self.limit = limit
+        self.value = value
+        super().__init__(f"Paginated request exceeded {limit} of {value}.")
 
 
 class TooManyRequestAtemptsError(Exception):
@@ -59,3 +79,13 @@ class TooManyRequestAtemptsError(Exception):
     def __init__(self, uri: str) -> None:
         """Exception raised when an API request fails too many times."""
         super().__init__(f'Too many failed requests to "{uri}".')
+
+
+class ExportFailed(Exception):
+    """Exception raised when an export could not export every carrier."""
+
+    def __init__(self, errors: Dict[str, str]) -> None:
+        """Exception raised when an export could not export every carrier."""
+        self.errors = errors
+        failed = ", ".join(f"{slug} ({error})" for slug, error in errors.items())
+        super().__init__(f"Export failed for carriers: {failed}.")
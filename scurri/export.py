@@ -0,0 +1,389 @@
+"""Export every tracked package to files, sharded by carrier across processes."""
+
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from . import exceptions
+from .api import ScurriAPI
+from .apisession import ScurriAPISession
+from .checkpoint import PaginationCheckpoint
+from .ratelimit import RateLimiter
+from .request import CarrierTrackingsRequest
+from .retry import RetryPolicy
+
+JSONEncoder = Callable[[Any], bytes]
+
+
+def default_json_encoder() -> JSONEncoder:
+    """Return orjson.dumps if orjson is installed, otherwise a json.dumps wrapper."""
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover
+        return lambda data: json.dumps(data).encode()
+    return orjson.dumps
+
+
+def write_ndjson(
+    results: Iterable[Dict[str, Any]],
+    f: IO[bytes],
+    encoder: Optional[JSONEncoder] = None,
+) -> int:
+    """Write each result to f as a line of JSON, returning the number written."""
+    if encoder is None:
+        encoder = default_json_encoder()
+    count = 0
+    for result in results:
+        f.write(encoder(result))
+        f.write(b"\n")
+        count += 1
+    return count
+
+
+def read_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the result on each line of a newline delimited JSON file."""
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ExportShard:
+    """The packages from one carrier written by an export.
+
+    Attributes:
+        carrier_slug (str): The carrier the packages are from.
+        filename (str): The file the packages are written to, relative to the
+            export directory.
+        count (int): The number of packages written.
+        size (int): The size of the file in bytes.
+    """
+
+    CARRIER_SLUG = "carrier_slug"
+    FILENAME = "filename"
+    COUNT = "count"
+    SIZE = "size"
+
+    def __init__(self, carrier_slug: str, filename: str, count: int, size: int) -> None:
+        """Create an export shard."""
+        self.carrier_slug = carrier_slug
+        self.filename = filename
+        self.count = count
+        self.size = size
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExportShard":
+        """Return a shard from its index entry."""
+        return cls(
+            carrier_slug=data[cls.CARRIER_SLUG],
+            filename=data[cls.FILENAME],
+            count=data[cls.COUNT],
+            size=data[cls.SIZE],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the shard's index entry."""
+        return {
+            self.CARRIER_SLUG: self.carrier_slug,
+            self.FILENAME: self.filename,
+            self.COUNT: self.count,
+            self.SIZE: self.size,
+        }
+
+
+class _ShardJob:
+    """Everything a worker process needs to export one carrier."""
+
+    def __init__(
+        self,
+        session: ScurriAPISession,
+        carrier_slug: str,
+        directory: str,
+        max_workers: int,
+        page_size: Optional[int],
+        filters: Optional[Mapping[str, Any]],
+        processes: int,
+        resume: bool,
+    ) -> None:
+        self.carrier_slug = carrier_slug
+        self.directory = directory
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.filters = None if filters is None else dict(filters)
+        self.resume = resume
+        self.base_url = session.base_url
+        self.token = session.token
+        self.credentials: Optional[Tuple[str, str]] = None
+        if session.can_refresh_token():
+            self.credentials = session._get_credentials()
+        self.retry_policy: RetryPolicy = session.retry_policy
+        self.connect_timeout, self.read_timeout = session.timeout
+        self.rate_limiter: Optional[Dict[str, Any]] = None
+        rate_limiter = session.rate_limiter
+        if rate_limiter is not None:
+            # Limiters without a file cannot be shared, so each process gets a share
+            # of the rate.
+            share = 1 if rate_limiter.path is not None else processes
+            self.rate_limiter = {
+                "rate": rate_limiter.max_rate / share,
+                "burst": max(rate_limiter.burst / share, 1),
+                "min_rate": rate_limiter.min_rate / share,
+                "decrease_factor": rate_limiter.decrease_factor,
+                "increase_step": rate_limiter.increase_step / share,
+                "cooldown": rate_limiter.cooldown,
+                "path": rate_limiter.path,
+            }
+
+    def session(self) -> ScurriAPISession:
+        """Return a session configured like the exporting session."""
+        rate_limiter = None
+        if self.rate_limiter is not None:
+            rate_limiter = RateLimiter(**self.rate_limiter)
+        session = ScurriAPISession(
+            retry_policy=self.retry_policy,
+            rate_limiter=rate_limiter,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+        )
+        session.base_url = self.base_url
+        session.token = self.token
+        session._credentials = self.credentials
+        return session
+
+
+def _export_shard(job: _ShardJob) -> ExportShard:
+    """Export one carrier in a worker process.
+
+    Not every exception can be pickled back to the parent process, so errors are
+    raised as RuntimeError with the original exception's description.
+    """
+    try:
+        return _write_shard(job)
+    except Exception as e:
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+
+
+def _write_shard(job: _ShardJob) -> ExportShard:
+    """Request every package from a carrier and write them to the shard file.
+
+    Pages are streamed to a temporary file that replaces the shard file once every
+    page has been written.
+    """
+    filename = TrackingExport.SHARD_FILE.format(job.carrier_slug)
+    path = os.path.join(job.directory, filename)
+    checkpoint = None
+    if job.resume:
+        checkpoint = PaginationCheckpoint(
+            os.path.join(job.directory, TrackingExport.CHECKPOINT_DIR, job.carrier_slug)
+        )
+    results = CarrierTrackingsRequest.iter_results(
+        api_session=job.session(),
+        params={"carrier_slug": job.carrier_slug},
+        max_workers=job.max_workers,
+        checkpoint=checkpoint,
+        page_size=job.page_size,
+        query=job.filters,
+    )
+    with tempfile.NamedTemporaryFile(
+        "wb", dir=job.directory, delete=False, suffix=".tmp"
+    ) as f:
+        try:
+            count = write_ndjson(results, f)
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+    os.replace(f.name, path)
+    if checkpoint is not None:
+        shutil.rmtree(checkpoint.directory, ignore_errors=True)
+    return ExportShard(
+        carrier_slug=job.carrier_slug,
+        filename=filename,
+        count=count,
+        size=os.path.getsize(path),
+    )
+
+
+class TrackingExport:
+    """Export every tracked package to newline delimited JSON, one file per carrier.
+
+    The carriers are requested first and each carrier's packages are requested
+    and written by a pool of worker processes, so decoding and writing use every
+    core instead of one. Each carrier's file is written as its own shard and an
+    index listing the shards is written when the export finishes. Packages are
+    written as received from the API, without creating model objects.
+
+    Packages that do not belong to a carrier returned by get_carriers are not
+    exported.
+
+    Workers use the exporting session's token, credentials, retry policy,
+    timeouts and rate limiter. A rate limiter that is not backed by a file cannot
+    be shared between processes, so each worker is given an equal share of its rate.
+
+    Kwargs:
+        scurri_api (scurri.ScurriAPI): An authorised API session.
+        directory (str): The directory the shards and index are written to. It is
+            created if it does not exist.
+        processes (int): The number of worker processes. Defaults to the number of
+            CPUs.
+        max_workers (int): The number of pages each worker requests concurrently.
+            Default 1.
+        page_size (int): The number of packages to request in each page.
+        filters (dict): Query parameters used by the server to filter the
+            packages exported.
+        resume (bool): If True, shards already in the index are not exported
+            again and pages of unfinished shards are checkpointed, so an export
+            that is stopped can be resumed. Default False.
+    """
+
+    INDEX_FILE = "index.json"
+    SHARD_FILE = "{}.ndjson"
+    CHECKPOINT_DIR = ".checkpoints"
+
+    CREATED_AT = "created_at"
+    COUNT = "count"
+    SHARDS = "shards"
+
+    def __init__(
+        self,
+        scurri_api: ScurriAPI,
+        directory: str,
+        processes: Optional[int] = None,
+        max_workers: int = 1,
+        page_size: Optional[int] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+        resume: bool = False,
+    ) -> None:
+        """Create a tracking export."""
+        self.scurri_api = scurri_api
+        self.directory = directory
+        self.processes = processes or os.cpu_count() or 1
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.filters = filters
+        self.resume = resume
+        self.shards: Dict[str, ExportShard] = {}
+        os.makedirs(directory, exist_ok=True)
+        if resume:
+            self.load()
+
+    @property
+    def count(self) -> int:
+        """Return the number of packages in the exported shards."""
+        return sum(shard.count for shard in self.shards.values())
+
+    def load(self) -> None:
+        """Load the shards listed in the index, if there is one."""
+        try:
+            with open(self._path(self.INDEX_FILE)) as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return
+        shards = [ExportShard.from_dict(shard) for shard in index[self.SHARDS]]
+        self.shards = {shard.carrier_slug: shard for shard in shards}
+
+    def run(
+        self,
+        carrier_slugs: Optional[List[str]] = None,
+        progress: Optional[Callable[[ExportShard], None]] = None,
+    ) -> List[ExportShard]:
+        """Export the packages from every carrier and write the index.
+
+        Kwargs:
+            carrier_slugs (list(str)): If given only these carriers are exported.
+                Defaults to every carrier returned by get_carriers.
+            progress (callable): Called with each shard when it has been written.
+
+        Returns:
+            list(scurri.export.ExportShard): The shards in the index.
+
+        Raises:
+            scurri.exceptions.ExportFailed: If any carrier could not be exported.
+                The index lists the carriers that were exported.
+        """
+        if carrier_slugs is None:
+            carrier_slugs = [carrier.slug for carrier in self.scurri_api.get_carriers()]
+        if not self.resume:
+            self.shards = {}
+        pending = [slug for slug in carrier_slugs if slug not in self.shards]
+        errors: Dict[str, str] = {}
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            futures: Dict[Future, str] = {
+                executor.submit(_export_shard, self._job(slug)): slug
+                for slug in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    shard = future.result()
+                except Exception as e:
+                    errors[futures[future]] = str(e)
+                    continue
+                self.shards[shard.carrier_slug] = shard
+                self.save()
+                if progress is not None:
+                    progress(shard)
+        self.save()
+        if errors:
+            raise exceptions.ExportFailed(errors)
+        return list(self.shards.values())
+
+    def save(self) -> None:
+        """Atomically write the index of exported shards."""
+        shards = sorted(self.shards.values(), key=lambda shard: shard.carrier_slug)
+        index = {
+            self.CREATED_AT: datetime.now(timezone.utc).isoformat(),
+            self.COUNT: self.count,
+            self.SHARDS: [shard.to_dict() for shard in shards],
+        }
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, delete=False, suffix=".tmp"
+        ) as f:
+            json.dump(index, f, indent=2)
+        os.replace(f.name, self._path(self.INDEX_FILE))
+
+    def iter_results(self) -> Iterator[Dict[str, Any]]:
+        """Yield the exported response data, shard by shard in carrier order."""
+        for slug in sorted(self.shards):
+            yield from read_ndjson(self._path(self.shards[slug].filename))
+
+    def merge(self, path: str) -> int:
+        """Concatenate the shards into one newline delimited JSON file.
+
+        Returns:
+            int: The number of packages written.
+        """
+        with open(path, "wb") as output:
+            for slug in sorted(self.shards):
+                with open(self._path(self.shards[slug].filename), "rb") as f:
+                    shutil.copyfileobj(f, output)
+        return self.count
+
+    def _job(self, carrier_slug: str) -> _ShardJob:
+        return _ShardJob(
+            session=self.scurri_api.session,
+            carrier_slug=carrier_slug,
+            directory=self.directory,
+            max_workers=self.max_workers,
+            page_size=self.page_size,
+            filters=self.filters,
+            processes=self.processes,
+            resume=self.resume,
+        )
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
@@ -0,0 +1,243 @@
+"""Request metrics observers and an in-memory metrics collector."""
+
+import threading
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+
+class RequestEvent:
+    """One HTTP request attempt made by a request class.
+
+    Attributes:
+        endpoint (str): The name of the request class, for example TrackingsRequest.
+        method (str): The HTTP method.
+        uri (str): The requested URL.
+        attempt (int): The attempt number, starting at 1. A request replayed after
+            its token was refreshed has the same attempt number.
+        duration (float): The seconds taken to receive the response.
+        status (int): The response status code, or None if no response was
+            received.
+        size (int): The number of response body bytes received.
+        error (Exception): The exception raised if no response was received.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        method: str,
+        uri: str,
+        attempt: int,
+        duration: float,
+        status: Optional[int] = None,
+        size: int = 0,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Create a request event."""
+        self.endpoint = endpoint
+        self.method = method
+        self.uri = uri
+        self.attempt = attempt
+        self.duration = duration
+        self.status = status
+        self.size = size
+        self.error = error
+
+    @property
+    def failed(self) -> bool:
+        """Return True if no response was received or the response was an error."""
+        return self.status is None or self.status >= 400
+
+
+class PaginationEvent:
+    """The totals for one paginated request.
+
+    Attributes:
+        endpoint (str): The name of the request class.
+        uri (str): The URL of the first page.
+        pages (int): The number of pages yielded, including pages read from a
+            checkpoint.
+        items (int): The number of results in those pages.
+        size (int): The number of response body bytes received for those pages.
+        duration (float): The seconds from the start of the request until it
+            finished or was stopped.
+        complete (bool): True if every page was yielded.
+        error (Exception): The exception that stopped the request, if any.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        uri: str,
+        pages: int,
+        items: int,
+        size: int,
+        duration: float,
+        complete: bool,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Create a pagination event."""
+        self.endpoint = endpoint
+        self.uri = uri
+        self.pages = pages
+        self.items = items
+        self.size = size
+        self.duration = duration
+        self.complete = complete
+        self.error = error
+
+
+class RequestObserver:
+    """Base class for objects that receive request metrics from a session.
+
+    Subclass this and override its methods to send metrics elsewhere, for example
+    to a Prometheus or StatsD client. Methods are called on the thread, or in the
+    event loop, that made the request, so they should be quick and thread safe.
+    """
+
+    def request_finished(self, event: RequestEvent) -> None:
+        """Receive the metrics of an HTTP request attempt."""
+
+    def pagination_finished(self, event: PaginationEvent) -> None:
+        """Receive the totals of a paginated request that has finished or stopped."""
+
+
+def percentile(samples: Iterable[float], percent: float) -> Optional[float]:
+    """Return the percent percentile of samples, or None if there are none.
+
+    Values between samples are linearly interpolated.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class _EndpointMetrics:
+    """Metrics for one endpoint."""
+
+    def __init__(self, sample_size: int) -> None:
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.bytes = 0
+        self.statuses: Counter = Counter()
+        self.durations: Deque[float] = deque(maxlen=sample_size)
+        self.paginations = 0
+        self.pages = 0
+        self.items = 0
+        self.pagination_bytes = 0
+        self.pagination_durations: Deque[float] = deque(maxlen=sample_size)
+
+
+class MetricsCollector(RequestObserver):
+    """Aggregate request metrics in memory by endpoint.
+
+    Counts and byte totals cover every request. Percentiles are calculated from the
+    durations of the most recent sample_size requests for each endpoint.
+
+    Kwargs:
+        sample_size (int): The number of durations kept for each endpoint. Default
+            10000.
+        percentiles (list(float)): The percentiles included in summary. Default
+            [50, 90, 99].
+    """
+
+    def __init__(
+        self, sample_size: int = 10000, percentiles: Optional[List[float]] = None
+    ) -> None:
+        """Create a metrics collector."""
+        self.sample_size = sample_size
+        if percentiles is None:
+            percentiles = [50, 90, 99]
+        self.percentiles = percentiles
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointMetrics] = {}
+
+    def request_finished(self, event: RequestEvent) -> None:
+        """Record a request attempt."""
+        with self._lock:
+            metrics = self._get_endpoint(event.endpoint)
+            metrics.requests += 1
+            if event.failed:
+                metrics.failures += 1
+            if event.attempt > 1:
+                metrics.retries += 1
+            metrics.bytes += event.size
+            metrics.statuses[event.status] += 1
+            metrics.durations.append(event.duration)
+
+    def pagination_finished(self, event: PaginationEvent) -> None:
+        """Record the totals for a paginated request."""
+        with self._lock:
+            metrics = self._get_endpoint(event.endpoint)
+            metrics.paginations += 1
+            metrics.pages += event.pages
+            metrics.items += event.items
+            metrics.pagination_bytes += event.size
+            metrics.pagination_durations.append(event.duration)
+
+    def percentile(self, endpoint: str, percent: float) -> Optional[float]:
+        """Return a percentile of request durations for endpoint in seconds.
+
+        Returns None if no requests have been recorded for endpoint.
+        """
+        with self._lock:
+            metrics = self._endpoints.get(endpoint)
+            if metrics is None:
+                return None
+            samples = list(metrics.durations)
+        return percentile(samples, percent)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return the metrics for each endpoint.
+
+        Returns:
+            dict: Keyed by endpoint. Each value holds counts of requests, failures,
+                retries, bytes and statuses, request duration percentiles in
+                seconds as p50, p90 and so on, and the totals for paginated
+                requests.
+        """
+        with self._lock:
+            endpoints = {
+                endpoint: self._summarise(metrics)
+                for endpoint, metrics in self._endpoints.items()
+            }
+        return endpoints
+
+    def reset(self) -> None:
+        """Discard all recorded metrics."""
+        with self._lock:
+            self._endpoints = {}
+
+    def _get_endpoint(self, endpoint: str) -> _EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = _EndpointMetrics(self.sample_size)
+            self._endpoints[endpoint] = metrics
+        return metrics
+
+    def _summarise(self, metrics: _EndpointMetrics) -> Dict[str, Any]:
+        durations = sorted(metrics.durations)
+        summary: Dict[str, Any] = {
+            "requests": metrics.requests,
+            "failures": metrics.failures,
+            "retries": metrics.retries,
+            "bytes": metrics.bytes,
+            "statuses": dict(metrics.statuses),
+            "max": durations[-1] if durations else None,
+        }
+        for percent in self.percentiles:
+            summary[f"p{percent:g}"] = percentile(durations, percent)
+        summary.update(
+            {
+                "paginations": metrics.paginations,
+                "pages": metrics.pages,
+                "items": metrics.items,
+                "pagination_bytes": metrics.pagination_bytes,
+                "pagination_p50": percentile(metrics.pagination_durations, 50),
+            }
+        )
+        return summary
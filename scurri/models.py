@@ -1,11 +1,30 @@
 """Models for scurri data."""
 
-from datetime import datetime
-from typing import Any, Dict, List
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
 from dateutil.parser import isoparse
 
 
+def parse_timestamp(value: str) -> datetime:
+    """Return a datetime from an ISO 8601 timestamp returned by the Scurri API.
+
+    The standard library parser is tried first as it is much faster than dateutil,
+    which is used as a fallback for formats it does not support.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return isoparse(value)
+
+
+def to_utc(value: datetime) -> datetime:
+    """Return value in UTC, treating datetimes without a timezone as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
 class Carrier:
     """Model for carrier data."""
 
@@ -14,6 +33,8 @@ class Carrier:
     URL = "url"
     TRACKING_URL = "trackings_url"
 
+    __slots__ = ("slug", "name", "url", "tracking_url")
+
     def __init__(self, kwargs: Dict[str, Any]) -> None:
         self.slug: str = kwargs[self.SLUG]
         self.name: str = kwargs[self.NAME]
@@ -22,7 +43,10 @@ class Carrier:
 
 
 class TrackingEvent:
-    """Model for tracking event data."""
+    """Model for tracking event data.
+
+    The timestamp is parsed when it is first accessed.
+    """
 
     ID = "id"
     STATUS = "status"
@@ -31,17 +55,49 @@ class TrackingEvent:
     TIMESTAMP = "timestamp"
     LOCATION = "location"
 
+    __slots__ = (
+        "id",
+        "status",
+        "carrier_code",
+        "description",
+        "location",
+        "_raw_timestamp",
+        "_timestamp",
+    )
+
     def __init__(self, kwargs: Dict[str, Any]) -> None:
         self.id: str = kwargs[self.ID]
         self.status: str = kwargs[self.STATUS]
         self.carrier_code: str = kwargs[self.CARRIER_CODE]
         self.description: str = kwargs[self.DESCRIPTION]
-        self.timestamp: datetime = isoparse(kwargs[self.TIMESTAMP])
+        self._raw_timestamp: str = kwargs[self.TIMESTAMP]
+        self._timestamp: Optional[datetime] = None
         self.location: str = kwargs[self.LOCATION]
 
+    @property
+    def timestamp(self) -> datetime:
+        """Return the date and time of the event."""
+        if self._timestamp is None:
+            self._timestamp = parse_timestamp(self._raw_timestamp)
+        return self._timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the event as API response data."""
+        return {
+            self.ID: self.id,
+            self.STATUS: self.status,
+            self.CARRIER_CODE: self.carrier_code,
+            self.DESCRIPTION: self.description,
+            self.TIMESTAMP: self._raw_timestamp,
+            self.LOCATION: self.location,
+        }
+
 
 class TrackedPackage:
-    """Model for tracked package data."""
+    """Model for tracked package data.
+
+    The created_at timestamp is parsed when it is first accessed.
+    """
 
     ID = "id"
     TRACKING_NUMBER = "tracking_number"
@@ -51,14 +107,46 @@ class TrackedPackage:
     CARRIER_URL = "carrier_url"
     EVENTS = "events"
 
+    __slots__ = (
+        "id",
+        "tracking_number",
+        "url",
+        "carrier",
+        "carrier_url",
+        "carrier_slug",
+        "events",
+        "_raw_created_at",
+        "_created_at",
+    )
+
     def __init__(self, kwargs: Dict[str, Any]) -> None:
         self.id: str = kwargs[self.ID]
         self.tracking_number: str = kwargs[self.TRACKING_NUMBER]
         self.url: str = kwargs[self.URL]
-        self.created_at: datetime = isoparse(kwargs[self.CREATED_AT])
+        self._raw_created_at: str = kwargs[self.CREATED_AT]
+        self._created_at: Optional[datetime] = None
         self.carrier: str = kwargs[self.CARRIER]
         self.carrier_url: str = kwargs[self.CARRIER_URL]
         self.carrier_slug: str = self.carrier_url.split("/")[-1]
         self.events: List[TrackingEvent] = [
             TrackingEvent(event) for event in kwargs[self.EVENTS]
         ]
+
+    @property
+    def created_at(self) -> datetime:
+        """Return the date and time the package was added to Scurri."""
+        if self._created_at is None:
+            self._created_at = parse_timestamp(self._raw_created_at)
+        return self._created_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the package as API response data."""
+        return {
+            self.ID: self.id,
+            self.TRACKING_NUMBER: self.tracking_number,
+            self.URL: self.url,
+            self.CREATED_AT: self._raw_created_at,
+            self.CARRIER: self.carrier,
+            self.CARRIER_URL: self.carrier_url,
+            self.EVENTS: [event.to_dict() for event in self.events],
+        }
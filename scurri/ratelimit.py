@@ -0,0 +1,175 @@
+"""Client side rate limiting for Scurri API requests."""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+TOO_MANY_REQUESTS = 429
+
+
+class RateLimiter:
+    """Limit the rate of requests with a token bucket.
+
+    Each request takes a token from the bucket and the bucket is refilled at the
+    current rate, up to burst tokens. If the bucket is empty the request waits for
+    the next token. Waiting requests reserve their token before sleeping, so the
+    order they were made in is kept.
+
+    The rate adapts to the server: after a 429 Too Many Requests response it is
+    multiplied by decrease_factor, and after each other response it is increased by
+    increase_step, up to the configured rate. Decreases happen at most once every
+    cooldown seconds, so a burst of 429s from requests that were already in flight
+    only reduces the rate once.
+
+    If path is given the bucket is kept in that file and locked with fcntl.flock, so
+    every RateLimiter using the same path, in any process on the host, shares it.
+
+    Kwargs:
+        rate (float): The maximum number of requests per second.
+        burst (float): The number of requests that can be made at once after a
+            quiet period. Default the larger of rate and 1.
+        min_rate (float): The rate is never reduced below this. Default 5% of rate.
+        decrease_factor (float): The rate is multiplied by this after a 429
+            response. Default 0.5.
+        increase_step (float): The rate is increased by this after every other
+            response. Default 1% of rate.
+        cooldown (float): The minimum number of seconds between decreases.
+            Default 1.
+        path (str): If given the bucket is shared through this file.
+        clock (callable): Returns the current time in seconds. Default time.time.
+        sleep (callable): Waits for a number of seconds. Default time.sleep.
+    """
+
+    TOKENS = "tokens"
+    UPDATED = "updated"
+    RATE = "rate"
+    LAST_DECREASE = "last_decrease"
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        increase_step: Optional[float] = None,
+        cooldown: float = 1,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Create a rate limiter."""
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero.")
+        self.max_rate = rate
+        self.burst = max(rate, 1) if burst is None else burst
+        self.min_rate = rate * 0.05 if min_rate is None else min_rate
+        self.decrease_factor = decrease_factor
+        self.increase_step = rate * 0.01 if increase_step is None else increase_step
+        self.cooldown = cooldown
+        self.path = path
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = self._initial_state()
+        if path is not None:
+            try:
+                import fcntl  # noqa: F401
+            except ImportError as e:  # pragma: no cover
+                raise ImportError(
+                    "Sharing a RateLimiter between processes requires fcntl."
+                ) from e
+
+    @property
+    def rate(self) -> float:
+        """Return the current number of requests allowed per second."""
+        with self._locked_state() as state:
+            return float(state[self.RATE])
+
+    def acquire(self) -> None:
+        """Wait until a request can be made."""
+        delay = self._reserve()
+        if delay > 0:
+            self.sleep(delay)
+
+    async def async_acquire(self) -> None:
+        """Wait until a request can be made without blocking the event loop."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record_response(self, status: int) -> None:
+        """Adapt the rate to the status code of a response."""
+        with self._locked_state() as state:
+            now = self.clock()
+            self._refill(state, now)
+            if status == TOO_MANY_REQUESTS:
+                if now - state[self.LAST_DECREASE] >= self.cooldown:
+                    state[self.RATE] = max(
+                        state[self.RATE] * self.decrease_factor, self.min_rate
+                    )
+                    state[self.LAST_DECREASE] = now
+            else:
+                state[self.RATE] = min(
+                    state[self.RATE] + self.increase_step, self.max_rate
+                )
+
+    def reset(self) -> None:
+        """Restore the full rate and a full bucket."""
+        with self._locked_state() as state:
+            state.clear()
+            state.update(self._initial_state())
+
+    def _reserve(self) -> float:
+        """Take a token and return the number of seconds to wait for it."""
+        with self._locked_state() as state:
+            now = self.clock()
+            self._refill(state, now)
+            state[self.TOKENS] -= 1
+            if state[self.TOKENS] >= 0:
+                return 0
+            return float(-state[self.TOKENS] / state[self.RATE])
+
+    def _refill(self, state: Dict[str, Any], now: float) -> None:
+        elapsed = max(now - state[self.UPDATED], 0)
+        state[self.TOKENS] = min(
+            state[self.TOKENS] + elapsed * state[self.RATE], self.burst
+        )
+        state[self.UPDATED] = now
+
+    def _initial_state(self) -> Dict[str, Any]:
+        return {
+            self.TOKENS: self.burst,
+            self.UPDATED: self.clock(),
+            self.RATE: self.max_rate,
+            self.LAST_DECREASE: float("-inf"),
+        }
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[Dict[str, Any]]:
+        """Hold the bucket exclusively, loading and saving it if it is shared."""
+        with self._lock:
+            if self.path is None:
+                yield self._state
+                return
+            import fcntl
+
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            with os.fdopen(fd, "r+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    contents = f.read()
+                    try:
+                        state = json.loads(contents)
+                    except ValueError:
+                        state = self._initial_state()
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
@@ -1,9 +1,72 @@
 """The requests module provides classes for Scurri API requests."""
 
-from typing import Any, Dict, List, Mapping, Optional
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
 
 from . import exceptions
-from .apisession import ScurriAPISession
+from .apisession import BaseScurriAPISession, ScurriAPISession
+from .asyncapisession import AsyncScurriAPISession
+from .cache import CachedResponse
+from .checkpoint import PaginationCheckpoint
+from .metrics import PaginationEvent, RequestEvent
+from .retry import RetryPolicy
+
+NOT_MODIFIED = 304
+UNAUTHORIZED = 401
+
+
+def build_url(
+    base_url: str, path: str, query: Optional[Mapping[str, Any]] = None
+) -> str:
+    """Return the URL for path with query encoded as its query string.
+
+    Query values that are None are left out. Lists and tuples add the parameter
+    once for each item. Dates and datetimes are sent in ISO 8601 format and booleans
+    as true or false.
+
+    Args:
+        base_url (str): The URL of the API.
+        path (str): The endpoint path.
+
+    Kwargs:
+        query (dict): Query string parameters.
+    """
+    url = base_url + path
+    pairs = []
+    for key, value in (query or {}).items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is not None:
+                pairs.append((key, _format_query_value(item)))
+    if not pairs:
+        return url
+    return f"{url}?{urlencode(pairs)}"
+
+
+def _format_query_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
 
 
 class PaginatedResponse:
@@ -14,19 +77,108 @@ class PaginatedResponse:
     PREVIOUS = "previous"
     RESULTS = "results"
 
-    def __init__(self, kwargs: Dict[str, Any]) -> None:
-        """Parse paginated request response data."""
+    def __init__(self, kwargs: Dict[str, Any], size: int = 0) -> None:
+        """Parse paginated request response data.
+
+        Args:
+            kwargs (dict): The decoded response data.
+
+        Kwargs:
+            size (int): The size of the response body in bytes. Default 0.
+        """
+        self.size = size
         self.count: int = kwargs[self.COUNT]
         self.next: Optional[str] = kwargs[self.NEXT]
         self.previous: Optional[str] = kwargs[self.PREVIOUS]
         self.results: List[Dict[str, Any]] = kwargs[self.RESULTS]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the response data."""
+        return {
+            self.COUNT: self.count,
+            self.NEXT: self.next,
+            self.PREVIOUS: self.previous,
+            self.RESULTS: self.results,
+        }
+
+
+class PaginationLimits:
+    """Optional limits on how much a paginated request may fetch.
+
+    Pagination is otherwise unbounded. A request that would go past a limit raises
+    scurri.exceptions.PaginationLimitExceeded. Pages already yielded are kept.
+
+    Kwargs:
+        max_items (int): The maximum number of results. A page that would take the
+            total past this is not yielded.
+        max_pages (int): The maximum number of pages.
+        max_bytes (int): The maximum number of response body bytes received. A page
+            that would take the total past this is not yielded.
+        deadline (float): The number of seconds after the request starts that no
+            more pages are requested.
+    """
+
+    def __init__(
+        self,
+        max_items: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> None:
+        """Create pagination limits."""
+        self.max_items = max_items
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+
+
+class _PaginationState:
+    """Enforce PaginationLimits and detect cycles in next links for one request."""
+
+    def __init__(self, uri: str, limits: PaginationLimits) -> None:
+        self.limits = limits
+        self.seen_uris = {uri}
+        self.pages = 0
+        self.items = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+
+    def add_page(self, page: PaginatedResponse) -> None:
+        """Count a received page, raising if it takes the request past a limit."""
+        limits = self.limits
+        self.pages += 1
+        self.items += len(page.results)
+        self.bytes += page.size
+        if limits.max_items is not None and self.items > limits.max_items:
+            raise exceptions.PaginationLimitExceeded("max_items", limits.max_items)
+        if limits.max_bytes is not None and self.bytes > limits.max_bytes:
+            raise exceptions.PaginationLimitExceeded("max_bytes", limits.max_bytes)
+
+    def check_next(self, uri: Optional[str]) -> None:
+        """Raise if the page at uri should not be requested."""
+        if uri is None:
+            return
+        limits = self.limits
+        if uri in self.seen_uris:
+            raise exceptions.PaginationCycleError(uri)
+        self.seen_uris.add(uri)
+        if limits.max_pages is not None and self.pages >= limits.max_pages:
+            raise exceptions.PaginationLimitExceeded("max_pages", limits.max_pages)
+        if (
+            limits.deadline is not None
+            and time.monotonic() - self.started >= limits.deadline
+        ):
+            raise exceptions.PaginationLimitExceeded("deadline", limits.deadline)
+
 
 class BaseRequest:
     """Base class for Scurri API requests."""
 
     method: str
-    MAX_ATTEMPTS = 5
+    USE_HTTP_CACHE = False
+    # Deprecated: set retry_policy on the session instead. If set, this overrides
+    # the retry policy's max_attempts for requests made by this class.
+    MAX_ATTEMPTS: Optional[int] = None
 
     @classmethod
     def uri(cls, *args: List[Any], **kwargs: Dict[str, Any]) -> str:
@@ -46,35 +198,301 @@ class BaseRequest:
         uri: str,
         headers: Dict[str, str],
         data: Optional[Dict[str, str]],
-        attempt: int = 1,
     ) -> Dict[str, Any]:
-        auth_headers = api_session.get_headers()
-        request_headers = auth_headers | headers
-        response = api_session.session.request(
+        response_data, _ = cls._make_sized_request(
+            api_session=api_session, method=method, uri=uri, headers=headers, data=data
+        )
+        return response_data
+
+    @classmethod
+    def _make_sized_request(
+        cls,
+        api_session: ScurriAPISession,
+        method: str,
+        uri: str,
+        headers: Dict[str, str],
+        data: Optional[Dict[str, str]],
+    ) -> Tuple[Dict[str, Any], int]:
+        """Make a request, returning the response data and the body size in bytes."""
+        cached_response = cls._get_cached_response(api_session, method, uri)
+        if cached_response is not None:
+            headers = headers | cached_response.conditional_headers()
+        response = cls._send(
+            api_session=api_session,
             method=method,
-            url=uri,
-            headers=request_headers,
-            json=data,
+            uri=uri,
+            headers=headers,
+            data=data,
         )
-        if response.text == """{"detail": "Internal server error"}""":
-            if attempt >= cls.MAX_ATTEMPTS:
+        if cached_response is not None and response.status_code == NOT_MODIFIED:
+            return cls._use_cached_response(api_session, uri, cached_response), 0
+        response_data = cls._decode_response(
+            api_session=api_session, uri=uri, body=response.content
+        )
+        if cls._uses_http_cache(api_session, method):
+            cls._cache_response(api_session, uri, response.headers, response.content)
+        return response_data, len(response.content)
+
+    @classmethod
+    def _send(
+        cls,
+        api_session: ScurriAPISession,
+        method: str,
+        uri: str,
+        headers: Dict[str, str],
+        data: Optional[Dict[str, str]],
+    ) -> requests.Response:
+        """Make a request, retrying it as directed by the session's retry policy.
+
+        If the session's token is rejected and the session can authorise itself
+        again, the token is refreshed once and the request is replayed.
+        """
+        retry_policy = api_session.retry_policy
+        rate_limiter = api_session.rate_limiter
+        if api_session.token is None:
+            api_session.refresh_token(None)
+        token_refreshed = False
+        attempt = 0
+        while True:
+            attempt += 1
+            token = api_session.token
+            request_headers = api_session.get_headers() | headers
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = api_session.session.request(
+                    method=method,
+                    url=uri,
+                    headers=request_headers,
+                    json=data,
+                    timeout=api_session.timeout,
+                )
+            except Exception as e:
+                cls._record_request(api_session, method, uri, attempt, started, error=e)
+                if not retry_policy.is_retryable_exception(e):
+                    raise
+                if not cls._can_retry(retry_policy, attempt):
+                    raise exceptions.TooManyRequestAtemptsError(uri) from e
+                time.sleep(retry_policy.get_delay(attempt))
+                continue
+            cls._record_request(
+                api_session,
+                method,
+                uri,
+                attempt,
+                started,
+                status=response.status_code,
+                size=len(response.content),
+            )
+            if rate_limiter is not None:
+                rate_limiter.record_response(response.status_code)
+            if (
+                response.status_code == UNAUTHORIZED
+                and not token_refreshed
+                and api_session.refresh_token(token)
+            ):
+                token_refreshed = True
+                attempt -= 1
+                continue
+            if not retry_policy.is_retryable_response(
+                response.status_code, response.content
+            ):
+                return response
+            if not cls._can_retry(retry_policy, attempt):
                 raise exceptions.TooManyRequestAtemptsError(uri)
-            return cls._make_request(
-                api_session=api_session,
+            time.sleep(
+                retry_policy.get_delay(attempt, response.headers.get("Retry-After"))
+            )
+
+    @classmethod
+    def _can_retry(cls, retry_policy: RetryPolicy, attempt: int) -> bool:
+        """Return True if another attempt may be made after attempt."""
+        if cls.MAX_ATTEMPTS is not None:
+            return attempt < cls.MAX_ATTEMPTS
+        return retry_policy.can_retry(attempt)
+
+    @classmethod
+    def _record_request(
+        cls,
+        api_session: BaseScurriAPISession,
+        method: str,
+        uri: str,
+        attempt: int,
+        started: float,
+        status: Optional[int] = None,
+        size: int = 0,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Send a request attempt that started at started to the session observer."""
+        if api_session.observer is None:
+            return
+        api_session.observer.request_finished(
+            RequestEvent(
+                endpoint=cls.__name__,
                 method=method,
                 uri=uri,
-                headers=headers,
-                data=data,
-                attempt=attempt + 1,
+                attempt=attempt,
+                duration=time.monotonic() - started,
+                status=status,
+                size=size,
+                error=error,
             )
+        )
+
+    @classmethod
+    def _uses_http_cache(cls, api_session: BaseScurriAPISession, method: str) -> bool:
+        return (
+            cls.USE_HTTP_CACHE
+            and method == "GET"
+            and api_session.http_cache is not None
+        )
+
+    @classmethod
+    def _get_cached_response(
+        cls, api_session: BaseScurriAPISession, method: str, uri: str
+    ) -> Optional[CachedResponse]:
+        """Return a cached response that can be revalidated, if there is one."""
+        if api_session.http_cache is None or not cls._uses_http_cache(
+            api_session, method
+        ):
+            return None
+        return api_session.http_cache.get(uri)
+
+    @classmethod
+    def _use_cached_response(
+        cls,
+        api_session: BaseScurriAPISession,
+        uri: str,
+        cached_response: CachedResponse,
+    ) -> Dict[str, Any]:
+        """Record a cache hit and return a newly decoded copy of the response."""
+        if api_session.http_cache is not None:
+            api_session.http_cache.record_hit(cached_response)
+        return cls._decode_response(
+            api_session=api_session, uri=uri, body=cached_response.body
+        )
+
+    @classmethod
+    def _cache_response(
+        cls,
+        api_session: BaseScurriAPISession,
+        uri: str,
+        response_headers: Mapping[str, str],
+        body: bytes,
+    ) -> None:
+        if api_session.http_cache is not None:
+            api_session.http_cache.store(uri, response_headers, body)
+
+    @classmethod
+    def _decode_response(
+        cls, api_session: BaseScurriAPISession, uri: str, body: bytes
+    ) -> Dict[str, Any]:
+        """Decode a response body with the session's JSON decoder."""
         try:
-            return dict(response.json())
+            response_data = api_session.json_decoder(body)
         except Exception as e:
-            raise exceptions.InvalidResponse(uri, response.text) from e
+            raise exceptions.InvalidResponse(uri, str(body, errors="replace")) from e
+        if not isinstance(response_data, dict):
+            raise exceptions.InvalidResponse(uri, str(body, errors="replace"))
+        return response_data
+
+    @classmethod
+    async def _make_async_request(
+        cls,
+        api_session: AsyncScurriAPISession,
+        method: str,
+        uri: str,
+        headers: Dict[str, str],
+        data: Optional[Dict[str, str]],
+    ) -> Dict[str, Any]:
+        response_data, _ = await cls._make_sized_async_request(
+            api_session=api_session, method=method, uri=uri, headers=headers, data=data
+        )
+        return response_data
+
+    @classmethod
+    async def _make_sized_async_request(
+        cls,
+        api_session: AsyncScurriAPISession,
+        method: str,
+        uri: str,
+        headers: Dict[str, str],
+        data: Optional[Dict[str, str]],
+    ) -> Tuple[Dict[str, Any], int]:
+        """Make an asyncio request, returning the data and the body size in bytes."""
+        cached_response = cls._get_cached_response(api_session, method, uri)
+        if cached_response is not None:
+            headers = headers | cached_response.conditional_headers()
+        retry_policy = api_session.retry_policy
+        rate_limiter = api_session.rate_limiter
+        if api_session.token is None:
+            await api_session.refresh_token(None)
+        token_refreshed = False
+        attempt = 0
+        while True:
+            attempt += 1
+            token = api_session.token
+            request_headers = api_session.get_headers() | headers
+            if rate_limiter is not None:
+                await rate_limiter.async_acquire()
+            started = time.monotonic()
+            try:
+                async with api_session.session.request(
+                    method=method, url=uri, headers=request_headers, json=data
+                ) as response:
+                    body = await response.read()
+            except Exception as e:
+                cls._record_request(api_session, method, uri, attempt, started, error=e)
+                if not retry_policy.is_retryable_exception(e):
+                    raise
+                if not cls._can_retry(retry_policy, attempt):
+                    raise exceptions.TooManyRequestAtemptsError(uri) from e
+                await asyncio.sleep(retry_policy.get_delay(attempt))
+                continue
+            cls._record_request(
+                api_session,
+                method,
+                uri,
+                attempt,
+                started,
+                status=response.status,
+                size=len(body),
+            )
+            if rate_limiter is not None:
+                rate_limiter.record_response(response.status)
+            if (
+                response.status == UNAUTHORIZED
+                and not token_refreshed
+                and await api_session.refresh_token(token)
+            ):
+                token_refreshed = True
+                attempt -= 1
+                continue
+            if not retry_policy.is_retryable_response(response.status, body):
+                break
+            if not cls._can_retry(retry_policy, attempt):
+                raise exceptions.TooManyRequestAtemptsError(uri)
+            await asyncio.sleep(
+                retry_policy.get_delay(attempt, response.headers.get("Retry-After"))
+            )
+        if cached_response is not None and response.status == NOT_MODIFIED:
+            return cls._use_cached_response(api_session, uri, cached_response), 0
+        response_data = cls._decode_response(
+            api_session=api_session, uri=uri, body=body
+        )
+        if cls._uses_http_cache(api_session, method):
+            cls._cache_response(api_session, uri, response.headers, body)
+        return response_data, len(body)
 
 
 class SingleRequest(BaseRequest):
-    """Base class for unpaginated Scurri API requests."""
+    """Base class for unpaginated Scurri API requests.
+
+    If the session has an HTTP cache, GET responses are cached and revalidated.
+    """
+
+    USE_HTTP_CACHE = True
 
     @classmethod
     def parse_response(cls, response_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -100,11 +518,34 @@ class SingleRequest(BaseRequest):
         )
         return cls.parse_response(response)
 
+    @classmethod
+    async def async_request(
+        cls,
+        api_session: AsyncScurriAPISession,
+        data: Optional[Dict[str, str]] = None,
+        params: Optional[Mapping] = None,
+    ) -> Dict[str, Any]:
+        """Make an API call with an asyncio session."""
+        if params is None:
+            params = {}
+        response = await cls._make_async_request(
+            api_session=api_session,
+            method=cls.method,
+            uri=api_session.base_url + cls.uri(**params),
+            headers=cls.headers(),
+            data=data,
+        )
+        return cls.parse_response(response)
+
 
 class PaginatedRequest(BaseRequest):
     """Base class for paginated Scurri API requests."""
 
-    MAX_PAGE_REQUESTS = 1500
+    # Deprecated: pass PaginationLimits(max_pages=...) instead. If set, this is used
+    # as max_pages for requests made by this class that are not given limits.
+    MAX_PAGE_REQUESTS: Optional[int] = None
+    PAGE_QUERY_PARAM = "page"
+    PAGE_SIZE_QUERY_PARAM = "page_size"
 
     @classmethod
     def request(
@@ -112,32 +553,534 @@ class PaginatedRequest(BaseRequest):
         api_session: ScurriAPISession,
         data: Optional[Dict[str, str]] = None,
         params: Optional[Mapping] = None,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        query: Optional[Mapping[str, Any]] = None,
+        page_size: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """Make an API call."""
+        responses = list(
+            cls.iter_pages(
+                api_session=api_session,
+                data=data,
+                params=params,
+                max_workers=max_workers,
+                checkpoint=checkpoint,
+                limits=limits,
+                query=query,
+                page_size=page_size,
+            )
+        )
+        return cls.parse_responses(responses)
+
+    @classmethod
+    def iter_pages(
+        cls,
+        api_session: ScurriAPISession,
+        data: Optional[Dict[str, str]] = None,
+        params: Optional[Mapping] = None,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        query: Optional[Mapping[str, Any]] = None,
+        page_size: Optional[int] = None,
+    ) -> Iterator[PaginatedResponse]:
+        """Make an API call, yielding each page as soon as it is received.
+
+        By default the next page is not requested until the previous one has been
+        consumed, so only one page is held in memory at a time.
+
+        If max_workers is greater than one the URLs of the remaining pages are
+        calculated from the first page and up to max_workers pages are requested
+        concurrently on the shared session. Pages are still yielded in order.
+
+        If a checkpoint is given each page is saved to it as it is received. If the
+        checkpoint already holds pages they are yielded first and the request
+        continues from the page after them, one page at a time.
+
+        There is no limit on the number of pages unless limits are given, but a
+        next link that points back to a page already requested raises
+        scurri.exceptions.PaginationCycleError.
+
+        query is added to the query string of the first page, see build_url. If
+        page_size is given the server is asked for pages of that many results.
+        """
+        uri = cls.build_uri(
+            api_session=api_session, params=params, query=query, page_size=page_size
+        )
+        state = _PaginationState(uri, cls._get_limits(limits))
+        complete = False
+        error: Optional[BaseException] = None
+        try:
+            for response_data in cls._iter_checkpointed_pages(
+                api_session=api_session,
+                uri=uri,
+                data=data,
+                max_workers=max_workers,
+                checkpoint=checkpoint,
+            ):
+                state.add_page(response_data)
+                yield response_data
+                state.check_next(response_data.next)
+            complete = True
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            cls._record_pagination(api_session, uri, state, complete, error)
+
+    @classmethod
+    def build_uri(
+        cls,
+        api_session: BaseScurriAPISession,
+        params: Optional[Mapping] = None,
+        query: Optional[Mapping[str, Any]] = None,
+        page_size: Optional[int] = None,
+    ) -> str:
+        """Return the URL of the first page of the request."""
         if params is None:
             params = {}
-        responses = []
-        uri = api_session.base_url + cls.uri(**params)
-        for _ in range(cls.MAX_PAGE_REQUESTS):
-            response = cls._make_request(
+        query = dict(query or {})
+        if page_size is not None:
+            query[cls.PAGE_SIZE_QUERY_PARAM] = page_size
+        return build_url(api_session.base_url, cls.uri(**params), query)
+
+    @classmethod
+    def _record_pagination(
+        cls,
+        api_session: BaseScurriAPISession,
+        uri: str,
+        state: _PaginationState,
+        complete: bool,
+        error: Optional[BaseException],
+    ) -> None:
+        """Send the totals of a paginated request to the session observer."""
+        if api_session.observer is None:
+            return
+        api_session.observer.pagination_finished(
+            PaginationEvent(
+                endpoint=cls.__name__,
+                uri=uri,
+                pages=state.pages,
+                items=state.items,
+                size=state.bytes,
+                duration=time.monotonic() - state.started,
+                complete=complete,
+                error=error,
+            )
+        )
+
+    @classmethod
+    def _get_limits(cls, limits: Optional[PaginationLimits]) -> PaginationLimits:
+        if limits is not None:
+            return limits
+        return PaginationLimits(max_pages=cls.MAX_PAGE_REQUESTS)
+
+    @classmethod
+    def _iter_checkpointed_pages(
+        cls,
+        api_session: ScurriAPISession,
+        uri: str,
+        data: Optional[Dict[str, str]],
+        max_workers: int,
+        checkpoint: Optional[PaginationCheckpoint],
+    ) -> Iterator[PaginatedResponse]:
+        """Request every page, saving pages to and resuming from checkpoint."""
+        if checkpoint is None:
+            yield from cls._iter_pages(
+                api_session=api_session, uri=uri, data=data, max_workers=max_workers
+            )
+            return
+        checkpoint.start(uri)
+        for page_data in checkpoint.iter_pages():
+            yield PaginatedResponse(page_data)
+        if checkpoint.page_count == 0:
+            pages = cls._iter_pages(
+                api_session=api_session, uri=uri, data=data, max_workers=max_workers
+            )
+        elif checkpoint.next is not None:
+            pages = cls._follow_pages(
+                api_session=api_session, uri=checkpoint.next, data=data
+            )
+        else:
+            return
+        for response_data in pages:
+            checkpoint.save_page(response_data.to_dict(), response_data.next)
+            yield response_data
+
+    @classmethod
+    def _iter_pages(
+        cls,
+        api_session: ScurriAPISession,
+        uri: str,
+        data: Optional[Dict[str, str]],
+        max_workers: int,
+    ) -> Iterator[PaginatedResponse]:
+        """Request every page, starting with the page at uri."""
+        response_data = cls._request_page(api_session=api_session, uri=uri, data=data)
+        yield response_data
+        if max_workers > 1 and response_data.next is not None:
+            page_uris = cls._page_uris(response_data)
+            if page_uris is not None:
+                for response_data in cls._request_pages_concurrently(
+                    api_session=api_session,
+                    uris=page_uris,
+                    data=data,
+                    max_workers=max_workers,
+                ):
+                    yield response_data
+        yield from cls._follow_pages(
+            api_session=api_session, uri=response_data.next, data=data
+        )
+
+    @classmethod
+    def _follow_pages(
+        cls,
+        api_session: ScurriAPISession,
+        uri: Optional[str],
+        data: Optional[Dict[str, str]],
+    ) -> Iterator[PaginatedResponse]:
+        """Request pages one at a time by following next links from uri."""
+        while uri is not None:
+            response_data = cls._request_page(
+                api_session=api_session, uri=uri, data=data
+            )
+            yield response_data
+            uri = response_data.next
+
+    @classmethod
+    def iter_results(
+        cls,
+        api_session: ScurriAPISession,
+        data: Optional[Dict[str, str]] = None,
+        params: Optional[Mapping] = None,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        query: Optional[Mapping[str, Any]] = None,
+        page_size: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Make an API call, yielding each result as its page is received."""
+        for response in cls.iter_pages(
+            api_session=api_session,
+            data=data,
+            params=params,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            limits=limits,
+            query=query,
+            page_size=page_size,
+        ):
+            yield from response.results
+
+    @classmethod
+    def _request_page(
+        cls,
+        api_session: ScurriAPISession,
+        uri: str,
+        data: Optional[Dict[str, str]],
+    ) -> PaginatedResponse:
+        """Request a single page."""
+        response, size = cls._make_sized_request(
+            api_session=api_session,
+            method=cls.method,
+            uri=uri,
+            headers=cls.headers(),
+            data=data,
+        )
+        try:
+            return PaginatedResponse(response, size=size)
+        except KeyError:
+            raise exceptions.InvalidResponse(uri=uri, response=str(response))
+
+    @classmethod
+    def _page_uris(cls, first_page: PaginatedResponse) -> Optional[List[str]]:
+        """Return the URLs of the pages following first_page.
+
+        Returns None if the page URLs cannot be calculated from the first page.
+        """
+        page_size = len(first_page.results)
+        if first_page.next is None or page_size == 0:
+            return None
+        page_count = -(-first_page.count // page_size)
+        url = urlsplit(first_page.next)
+        query = parse_qsl(url.query, keep_blank_values=True)
+        if (cls.PAGE_QUERY_PARAM, "2") not in query:
+            return None
+        uris = []
+        for page_number in range(2, page_count + 1):
+            page_query = [
+                (key, str(page_number) if key == cls.PAGE_QUERY_PARAM else value)
+                for key, value in query
+            ]
+            uris.append(urlunsplit(url._replace(query=urlencode(page_query))))
+        return uris
+
+    @classmethod
+    def _request_pages_concurrently(
+        cls,
+        api_session: ScurriAPISession,
+        uris: List[str],
+        data: Optional[Dict[str, str]],
+        max_workers: int,
+    ) -> Iterator[PaginatedResponse]:
+        """Request pages with a thread pool, yielding them in order.
+
+        No more than max_workers pages are requested ahead of the page being
+        consumed. Iteration stops at the first page without a next link, so pages
+        that were requested ahead but no longer exist because records were removed
+        during the pull are discarded.
+        """
+        uri_iterator = iter(uris)
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for uri in islice(uri_iterator, max_workers):
+                    pending.append(
+                        executor.submit(cls._request_page, api_session, uri, data)
+                    )
+                while pending:
+                    response_data = pending.popleft().result()
+                    if response_data.next is None:
+                        yield response_data
+                        return
+                    for uri in islice(uri_iterator, 1):
+                        pending.append(
+                            executor.submit(cls._request_page, api_session, uri, data)
+                        )
+                    yield response_data
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @classmethod
+    async def async_request(
+        cls,
+        api_session: AsyncScurriAPISession,
+        data: Optional[Dict[str, str]] = None,
+        params: Optional[Mapping] = None,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        query: Optional[Mapping[str, Any]] = None,
+        page_size: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Make an API call with an asyncio session."""
+        responses = [
+            response
+            async for response in cls.aiter_pages(
+                api_session=api_session,
+                data=data,
+                params=params,
+                max_workers=max_workers,
+                checkpoint=checkpoint,
+                limits=limits,
+                query=query,
+                page_size=page_size,
+            )
+        ]
+        return cls.parse_responses(responses)
+
+    @classmethod
+    async def aiter_pages(
+        cls,
+        api_session: AsyncScurriAPISession,
+        data: Optional[Dict[str, str]] = None,
+        params: Optional[Mapping] = None,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        query: Optional[Mapping[str, Any]] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[PaginatedResponse]:
+        """Make an API call with an asyncio session, yielding each page.
+
+        Behaves as PaginatedRequest.iter_pages, with up to max_workers pages
+        requested concurrently as tasks on the running event loop.
+        """
+        uri = cls.build_uri(
+            api_session=api_session, params=params, query=query, page_size=page_size
+        )
+        state = _PaginationState(uri, cls._get_limits(limits))
+        complete = False
+        error: Optional[BaseException] = None
+        try:
+            async for response_data in cls._aiter_checkpointed_pages(
                 api_session=api_session,
-                method=cls.method,
                 uri=uri,
-                headers=cls.headers(),
                 data=data,
+                max_workers=max_workers,
+                checkpoint=checkpoint,
+            ):
+                state.add_page(response_data)
+                yield response_data
+                state.check_next(response_data.next)
+            complete = True
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            cls._record_pagination(api_session, uri, state, complete, error)
+
+    @classmethod
+    async def _aiter_checkpointed_pages(
+        cls,
+        api_session: AsyncScurriAPISession,
+        uri: str,
+        data: Optional[Dict[str, str]],
+        max_workers: int,
+        checkpoint: Optional[PaginationCheckpoint],
+    ) -> AsyncIterator[PaginatedResponse]:
+        """Request every page with an asyncio session, using checkpoint."""
+        if checkpoint is None:
+            async for response_data in cls._aiter_pages(
+                api_session=api_session, uri=uri, data=data, max_workers=max_workers
+            ):
+                yield response_data
+            return
+        checkpoint.start(uri)
+        for page_data in checkpoint.iter_pages():
+            yield PaginatedResponse(page_data)
+        if checkpoint.page_count == 0:
+            pages = cls._aiter_pages(
+                api_session=api_session, uri=uri, data=data, max_workers=max_workers
+            )
+        elif checkpoint.next is not None:
+            pages = cls._async_follow_pages(
+                api_session=api_session, uri=checkpoint.next, data=data
             )
-            try:
-                response_data = PaginatedResponse(response)
-            except KeyError:
-                raise exceptions.InvalidResponse(uri=uri, response=str(response))
-            else:
-                responses.append(response_data)
-                if response_data.next is None:
-                    break
-            uri = response_data.next
         else:
-            raise exceptions.TooManyRequestsError()
-        return cls.parse_responses(responses)
+            return
+        async for response_data in pages:
+            checkpoint.save_page(response_data.to_dict(), response_data.next)
+            yield response_data
+
+    @classmethod
+    async def _aiter_pages(
+        cls,
+        api_session: AsyncScurriAPISession,
+        uri: str,
+        data: Optional[Dict[str, str]],
+        max_workers: int,
+    ) -> AsyncIterator[PaginatedResponse]:
+        """Request every page with an asyncio session, starting at uri."""
+        response_data = await cls._async_request_page(
+            api_session=api_session, uri=uri, data=data
+        )
+        yield response_data
+        if max_workers > 1 and response_data.next is not None:
+            page_uris = cls._page_uris(response_data)
+            if page_uris is not None:
+                async for response_data in cls._async_request_pages_concurrently(
+                    api_session=api_session,
+                    uris=page_uris,
+                    data=data,
+                    max_workers=max_workers,
+                ):
+                    yield response_data
+        async for response_data in cls._async_follow_pages(
+            api_session=api_session, uri=response_data.next, data=data
+        ):
+            yield response_data
+
+    @classmethod
+    async def _async_follow_pages(
+        cls,
+        api_session: AsyncScurriAPISession,
+        uri: Optional[str],
+        data: Optional[Dict[str, str]],
+    ) -> AsyncIterator[PaginatedResponse]:
+        """Request pages one at a time with an asyncio session from uri."""
+        while uri is not None:
+            response_data = await cls._async_request_page(
+                api_session=api_session, uri=uri, data=data
+            )
+            yield response_data
+            uri = response_data.next
+
+    @classmethod
+    async def aiter_results(
+        cls,
+        api_session: AsyncScurriAPISession,
+        data: Optional[Dict[str, str]] = None,
+        params: Optional[Mapping] = None,
+        max_workers: int = 1,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        limits: Optional[PaginationLimits] = None,
+        query: Optional[Mapping[str, Any]] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Make an API call with an asyncio session, yielding each result."""
+        async for response in cls.aiter_pages(
+            api_session=api_session,
+            data=data,
+            params=params,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+            limits=limits,
+            query=query,
+            page_size=page_size,
+        ):
+            for result in response.results:
+                yield result
+
+    @classmethod
+    async def _async_request_page(
+        cls,
+        api_session: AsyncScurriAPISession,
+        uri: str,
+        data: Optional[Dict[str, str]],
+    ) -> PaginatedResponse:
+        """Request a single page with an asyncio session."""
+        response, size = await cls._make_sized_async_request(
+            api_session=api_session,
+            method=cls.method,
+            uri=uri,
+            headers=cls.headers(),
+            data=data,
+        )
+        try:
+            return PaginatedResponse(response, size=size)
+        except KeyError:
+            raise exceptions.InvalidResponse(uri=uri, response=str(response))
+
+    @classmethod
+    async def _async_request_pages_concurrently(
+        cls,
+        api_session: AsyncScurriAPISession,
+        uris: List[str],
+        data: Optional[Dict[str, str]],
+        max_workers: int,
+    ) -> AsyncIterator[PaginatedResponse]:
+        """Request pages as concurrent tasks, yielding them in order.
+
+        Behaves as PaginatedRequest._request_pages_concurrently.
+        """
+        uri_iterator = iter(uris)
+        pending: Deque[asyncio.Future] = deque()
+        try:
+            for uri in islice(uri_iterator, max_workers):
+                pending.append(
+                    asyncio.ensure_future(
+                        cls._async_request_page(api_session, uri, data)
+                    )
+                )
+            while pending:
+                response_data = await pending.popleft()
+                if response_data.next is None:
+                    yield response_data
+                    return
+                for uri in islice(uri_iterator, 1):
+                    pending.append(
+                        asyncio.ensure_future(
+                            cls._async_request_page(api_session, uri, data)
+                        )
+                    )
+                yield response_data
+        finally:
+            for task in pending:
+                task.cancel()
 
     @classmethod
     def parse_responses(
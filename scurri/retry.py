@@ -0,0 +1,131 @@
+"""Retry policies for Scurri API requests."""
+
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Collection, Optional, Tuple, Type
+
+import requests
+
+SERVER_ERROR_RESPONSE = b"""{"detail": "Internal server error"}"""
+
+
+def default_retry_exceptions() -> Tuple[Type[BaseException], ...]:
+    """Return the connection and timeout errors that are retried by default."""
+    retry_exceptions: Tuple[Type[BaseException], ...] = (
+        requests.ConnectionError,
+        requests.Timeout,
+        asyncio.TimeoutError,
+    )
+    try:
+        import aiohttp
+    except ImportError:  # pragma: no cover
+        return retry_exceptions
+    return retry_exceptions + (aiohttp.ClientConnectionError,)
+
+
+class RetryPolicy:
+    """Decide whether and when failed requests are retried.
+
+    Requests are retried when the response has a retryable status code, when the
+    Scurri API returns its internal server error body, or when a connection or
+    timeout error is raised. The delay before each retry grows exponentially and is
+    randomised with full jitter, unless the response has a Retry-After header.
+
+    Kwargs:
+        max_attempts (int): The maximum number of times a request is made.
+            Default 5.
+        backoff_factor (float): The delay in seconds before the first retry. Each
+            following delay is doubled. Default 0.5.
+        max_backoff (float): The maximum delay in seconds between attempts.
+            Default 30.
+        jitter (bool): If True each delay is a random time between zero and the
+            calculated delay. Default True.
+        retry_statuses (collection(int)): HTTP status codes that are retried.
+            Default 429, 500, 502, 503 and 504.
+        retry_exceptions (tuple(type)): Exceptions that are retried. Default
+            connection errors and timeouts.
+        respect_retry_after (bool): If True the Retry-After header is used as the
+            delay when it is present. Default True.
+        max_retry_after (float): The longest Retry-After delay in seconds that is
+            honoured. Default 300.
+        rng (callable): Returns a random number between 0 and 1 for jitter.
+            Default random.random.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        jitter: bool = True,
+        retry_statuses: Collection[int] = RETRY_STATUSES,
+        retry_exceptions: Optional[Tuple[Type[BaseException], ...]] = None,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 300,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        """Create a retry policy."""
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+        if retry_exceptions is None:
+            retry_exceptions = default_retry_exceptions()
+        self.retry_exceptions = retry_exceptions
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.rng = rng
+
+    def is_retryable_response(self, status: int, body: bytes) -> bool:
+        """Return True if a response with this status and body should be retried."""
+        return status in self.retry_statuses or body == SERVER_ERROR_RESPONSE
+
+    def is_retryable_exception(self, exception: BaseException) -> bool:
+        """Return True if a request that raised exception should be retried."""
+        return isinstance(exception, self.retry_exceptions)
+
+    def can_retry(self, attempt: int) -> bool:
+        """Return True if another attempt may be made after attempt."""
+        return attempt < self.max_attempts
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Return the number of seconds to wait after a failed attempt.
+
+        Args:
+            attempt (int): The number of the attempt that failed, starting at 1.
+
+        Kwargs:
+            retry_after (str): The value of the response's Retry-After header.
+        """
+        if self.respect_retry_after and retry_after is not None:
+            retry_after_delay = self.parse_retry_after(retry_after)
+            if retry_after_delay is not None:
+                return min(retry_after_delay, self.max_retry_after)
+        exponent = min(attempt - 1, 64)
+        delay: float = min(self.backoff_factor * 2.0**exponent, self.max_backoff)
+        if self.jitter:
+            delay *= self.rng()
+        return delay
+
+    @staticmethod
+    def parse_retry_after(retry_after: str) -> Optional[float]:
+        """Return the delay from a Retry-After header in seconds.
+
+        Returns None if the header is neither a number of seconds nor a date.
+        """
+        try:
+            return max(float(retry_after), 0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
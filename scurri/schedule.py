@@ -0,0 +1,316 @@
+"""Adaptive polling of in-flight packages."""
+
+import heapq
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from . import exceptions
+from .api import ScurriAPI
+from .metrics import percentile
+from .models import TrackedPackage, to_utc
+from .ratelimit import RateLimiter
+
+DEFAULT_STATUS_INTERVALS = {
+    "OUT_FOR_DELIVERY": 300,
+    "ATTEMPTED_DELIVERY": 900,
+    "EXCEPTION": 900,
+    "IN_TRANSIT": 1800,
+    "MANIFESTED": 3600,
+}
+
+
+class PollPolicy:
+    """Choose when a package should next be polled from its latest event.
+
+    Each status has a base interval. Packages whose latest event is old are polled
+    less often: the interval grows to recency_factor times the age of the latest
+    event, up to max_interval. Packages with a terminal status are not polled again.
+
+    Kwargs:
+        status_intervals (dict): Seconds between polls for each event status.
+            Default DEFAULT_STATUS_INTERVALS.
+        default_interval (float): Seconds between polls for other statuses and for
+            packages without events. Default 3600.
+        terminal_statuses (iterable(str)): Statuses after which a package is not
+            polled again. Default ("DELIVERED",).
+        recency_factor (float): The share of the latest event's age the interval
+            grows to. Default 0.1.
+        min_interval (float): The shortest interval. Default 60.
+        max_interval (float): The longest interval. Default 86400.
+        error_interval (float): Seconds to wait before polling again after a
+            request fails or the package is not found. Default 300.
+    """
+
+    def __init__(
+        self,
+        status_intervals: Optional[Dict[str, float]] = None,
+        default_interval: float = 3600,
+        terminal_statuses: Tuple[str, ...] = ("DELIVERED",),
+        recency_factor: float = 0.1,
+        min_interval: float = 60,
+        max_interval: float = 86400,
+        error_interval: float = 300,
+    ) -> None:
+        """Create a polling policy."""
+        if status_intervals is None:
+            status_intervals = DEFAULT_STATUS_INTERVALS
+        self.status_intervals = status_intervals
+        self.default_interval = default_interval
+        self.terminal_statuses = frozenset(terminal_statuses)
+        self.recency_factor = recency_factor
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.error_interval = error_interval
+
+    def next_interval(
+        self, package: TrackedPackage, now: Optional[datetime] = None
+    ) -> Optional[float]:
+        """Return the seconds until package should be polled again.
+
+        Kwargs:
+            package (scurri.models.TrackedPackage): The package just received.
+            now (datetime.datetime): The current time. Default the current UTC time.
+
+        Returns:
+            float or None if the package has a terminal status.
+        """
+        if not package.events:
+            return self._clamp(self.default_interval)
+        latest = max(package.events, key=lambda event: to_utc(event.timestamp))
+        if latest.status in self.terminal_statuses:
+            return None
+        if now is None:
+            now = datetime.now(timezone.utc)
+        age = (to_utc(now) - to_utc(latest.timestamp)).total_seconds()
+        interval = self.status_intervals.get(latest.status, self.default_interval)
+        return self._clamp(max(interval, age * self.recency_factor))
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+
+class PollingScheduler:
+    """Poll packages by ID when they are due, adapting the interval to each package.
+
+    Packages are kept in a priority queue ordered by the time they are next due.
+    Due packages are dispatched to a pool of worker threads, at most rate polls per
+    second across all workers. After each poll the policy chooses the next due
+    time, and packages with a terminal status are dropped from the queue.
+
+    Polls use scurri.ScurriAPI.get_tracking_by_package_id, so the API's store and
+    the session's retry policy, rate limiter and observer apply to each request.
+    The scheduler's own queue depth and lag metrics are returned by stats.
+    Exceptions raised by a poll or the callback are counted as failures, and the
+    package is polled again after the policy's error_interval.
+
+    Kwargs:
+        scurri_api (scurri.ScurriAPI): An authorised API session.
+        policy (scurri.schedule.PollPolicy): Chooses the interval between polls.
+            Default PollPolicy().
+        max_workers (int): The number of polls made concurrently. Default 4.
+        rate (float): If given, the maximum number of polls started per second.
+        callback (callable): Called from a worker thread with each
+            scurri.models.TrackedPackage received.
+        lag_sample_size (int): The number of lag samples kept for percentiles.
+            Default 10000.
+    """
+
+    def __init__(
+        self,
+        scurri_api: ScurriAPI,
+        policy: Optional[PollPolicy] = None,
+        max_workers: int = 4,
+        rate: Optional[float] = None,
+        callback: Optional[Callable[[TrackedPackage], None]] = None,
+        lag_sample_size: int = 10000,
+    ) -> None:
+        """Create a polling scheduler."""
+        self.scurri_api = scurri_api
+        self.policy = PollPolicy() if policy is None else policy
+        self.max_workers = max_workers
+        self.budget = None if rate is None else RateLimiter(rate, burst=1)
+        self.callback = callback
+        self.polls = 0
+        self.failures = 0
+        self.finished = 0
+        self._queue: List[Tuple[float, int, str]] = []
+        # The due time of each scheduled package, or None while it is being polled.
+        self._packages: Dict[str, Optional[float]] = {}
+        self._sequence = 0
+        self._in_flight = 0
+        self._lags: Deque[float] = deque(maxlen=lag_sample_size)
+        self._condition = threading.Condition()
+        self._stopped = False
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._packages)
+
+    def __contains__(self, package_id: object) -> bool:
+        with self._condition:
+            return str(package_id) in self._packages
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of packages waiting to be polled."""
+        with self._condition:
+            return self._queued()
+
+    def add(self, package_id: str, delay: float = 0) -> None:
+        """Schedule a package to be polled after delay seconds.
+
+        A package that is already scheduled is rescheduled.
+        """
+        with self._condition:
+            self._push(str(package_id), time.monotonic() + delay)
+            self._condition.notify_all()
+
+    def remove(self, package_id: str) -> None:
+        """Stop polling a package. A poll already in progress is not rescheduled."""
+        with self._condition:
+            self._packages.pop(str(package_id), None)
+            self._condition.notify_all()
+
+    def run(self, until_idle: bool = False) -> None:
+        """Dispatch due polls to the worker pool until stop is called.
+
+        Kwargs:
+            until_idle (bool): If True, return once no packages are scheduled and
+                no polls are in progress. Default False.
+        """
+        with self._condition:
+            self._stopped = False
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                package_id = self._next_due(until_idle)
+                if package_id is None:
+                    return
+                executor.submit(self._poll, package_id)
+
+    def stop(self) -> None:
+        """Stop run once the polls in progress have finished, from any thread."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the scheduler's metrics.
+
+        Returns:
+            dict: The number of packages scheduled, queued, due and in flight, the
+                number of polls made, failed and finished with a terminal status,
+                and the median, 99th percentile and maximum lag in seconds between
+                a package being due and its poll starting.
+        """
+        with self._condition:
+            now = time.monotonic()
+            lags = sorted(self._lags)
+            return {
+                "scheduled": len(self._packages),
+                "queued": self._queued(),
+                "due": sum(
+                    1
+                    for due in self._packages.values()
+                    if due is not None and due <= now
+                ),
+                "in_flight": self._in_flight,
+                "polls": self.polls,
+                "failures": self.failures,
+                "finished": self.finished,
+                "lag_p50": percentile(lags, 50),
+                "lag_p99": percentile(lags, 99),
+                "lag_max": lags[-1] if lags else None,
+            }
+
+    def _queued(self) -> int:
+        return sum(1 for due in self._packages.values() if due is not None)
+
+    def _push(self, package_id: str, due: float) -> None:
+        """Queue a package. Entries for earlier due times become stale."""
+        self._packages[package_id] = due
+        self._sequence += 1
+        heapq.heappush(self._queue, (due, self._sequence, package_id))
+
+    def _next_due(self, until_idle: bool) -> Optional[str]:
+        """Wait for a worker, the next due package and the budget, and return it.
+
+        Returns None when the scheduler is stopped, or is idle and until_idle is set.
+        """
+        with self._condition:
+            due_package = self._wait_for_due(until_idle)
+        if due_package is None:
+            return None
+        package_id, due = due_package
+        if self.budget is not None:
+            self.budget.acquire()
+        lag = time.monotonic() - due
+        with self._condition:
+            self._lags.append(lag)
+        return package_id
+
+    def _wait_for_due(self, until_idle: bool) -> Optional[Tuple[str, float]]:
+        """Take the next due package from the queue. Call with the condition held."""
+        while not self._stopped:
+            self._discard_stale()
+            if self._in_flight >= self.max_workers:
+                self._condition.wait()
+                continue
+            if not self._queue:
+                if until_idle and not self._in_flight:
+                    return None
+                self._condition.wait()
+                continue
+            due, _, package_id = self._queue[0]
+            now = time.monotonic()
+            if due > now:
+                self._condition.wait(due - now)
+                continue
+            heapq.heappop(self._queue)
+            self._packages[package_id] = None
+            self._in_flight += 1
+            return package_id, due
+        return None
+
+    def _discard_stale(self) -> None:
+        """Remove queue entries for removed or rescheduled packages."""
+        while self._queue:
+            due, _, package_id = self._queue[0]
+            if self._packages.get(package_id, -1.0) == due:
+                return
+            heapq.heappop(self._queue)
+
+    def _poll(self, package_id: str) -> None:
+        """Poll a package in a worker thread and schedule its next poll."""
+        interval: Optional[float] = self.policy.error_interval
+        failed = False
+        try:
+            package = self.scurri_api.get_tracking_by_package_id(package_id)
+            interval = self.policy.next_interval(package)
+            if self.callback is not None:
+                self.callback(package)
+        except exceptions.PackageNotFound:
+            pass
+        except Exception:
+            failed = True
+        finally:
+            self._finish_poll(package_id, interval, failed)
+
+    def _finish_poll(
+        self, package_id: str, interval: Optional[float], failed: bool
+    ) -> None:
+        """Count a poll and schedule the package again, unless it has finished."""
+        with self._condition:
+            self.polls += 1
+            self.failures += failed
+            self._in_flight -= 1
+            if package_id in self._packages:
+                if interval is None:
+                    self.finished += 1
+                    del self._packages[package_id]
+                else:
+                    self._push(package_id, time.monotonic() + interval)
+            self._condition.notify_all()
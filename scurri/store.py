@@ -0,0 +1,231 @@
+"""Local SQLite storage of tracking information."""
+
+import json
+import sqlite3
+import threading
+import time
+from types import TracebackType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Type
+
+from .models import TrackedPackage, TrackingEvent
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages (
+    id TEXT PRIMARY KEY,
+    tracking_number TEXT NOT NULL,
+    carrier_slug TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS packages_carrier_tracking_number
+    ON packages (carrier_slug, tracking_number);
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT NOT NULL,
+    package_id TEXT NOT NULL REFERENCES packages (id) ON DELETE CASCADE,
+    status TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (package_id, id)
+);
+CREATE INDEX IF NOT EXISTS events_status ON events (status);
+"""
+
+
+class TrackingStore:
+    """Store tracked packages and their events in an SQLite database.
+
+    Packages are indexed by ID, by carrier slug and tracking number, and by carrier
+    slug alone. Events are stored in their own table so they can be queried by
+    status. Each package records the time it was fetched so stale packages can be
+    ignored. The store can be shared between threads.
+
+    Kwargs:
+        path (str): The path of the database file. Default ":memory:".
+        clock (callable): Returns the current time in seconds since the epoch.
+            Default time.time.
+    """
+
+    def __init__(
+        self, path: str = ":memory:", clock: Callable[[], float] = time.time
+    ) -> None:
+        """Open or create a tracking store."""
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM packages"
+            ).fetchone()
+        return int(count)
+
+    def __enter__(self) -> "TrackingStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def save(self, results: Iterable[Dict[str, Any]]) -> None:
+        """Insert or replace packages from tracked package response data."""
+        fetched_at = self.clock()
+        packages = []
+        events = []
+        for result in results:
+            package_id = str(result[TrackedPackage.ID])
+            packages.append(
+                (
+                    package_id,
+                    result[TrackedPackage.TRACKING_NUMBER],
+                    result[TrackedPackage.CARRIER_URL].split("/")[-1],
+                    result[TrackedPackage.CREATED_AT],
+                    fetched_at,
+                    json.dumps(result),
+                )
+            )
+            for event in result[TrackedPackage.EVENTS]:
+                events.append(
+                    (
+                        str(event[TrackingEvent.ID]),
+                        package_id,
+                        event[TrackingEvent.STATUS],
+                        event[TrackingEvent.TIMESTAMP],
+                    )
+                )
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM events WHERE package_id = ?",
+                [(package[0],) for package in packages],
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO packages VALUES (?, ?, ?, ?, ?, ?)", packages
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?)", events
+            )
+
+    def save_iter(
+        self, results: Iterable[Dict[str, Any]], batch_size: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield results unchanged, saving them in batches of batch_size.
+
+        Results that have been yielded are saved even if iteration stops early.
+        """
+        batch: List[Dict[str, Any]] = []
+        try:
+            for result in results:
+                batch.append(result)
+                yield result
+                if len(batch) >= batch_size:
+                    self.save(batch)
+                    batch = []
+        finally:
+            if batch:
+                self.save(batch)
+
+    def get_package(
+        self, package_id: str, max_age: Optional[float] = None
+    ) -> Optional[TrackedPackage]:
+        """Return a stored package by ID.
+
+        Kwargs:
+            package_id (str): The ID of the package.
+            max_age (float): If given, packages fetched more than this many seconds
+                ago are ignored.
+
+        Returns:
+            scurri.models.TrackedPackage or None if no matching package is stored.
+        """
+        return self._get_one("id = ?", (str(package_id),), max_age)
+
+    def get_package_by_tracking_number(
+        self, carrier_slug: str, tracking_number: str, max_age: Optional[float] = None
+    ) -> Optional[TrackedPackage]:
+        """Return a stored package by carrier slug and tracking number.
+
+        Kwargs:
+            carrier_slug (str): The slug of the package's carrier.
+            tracking_number (str): The tracking number of the package.
+            max_age (float): If given, packages fetched more than this many seconds
+                ago are ignored.
+
+        Returns:
+            scurri.models.TrackedPackage or None if no matching package is stored.
+        """
+        return self._get_one(
+            "carrier_slug = ? AND tracking_number = ?",
+            (carrier_slug, tracking_number),
+            max_age,
+        )
+
+    def get_carrier_packages(
+        self, carrier_slug: str, max_age: Optional[float] = None
+    ) -> List[TrackedPackage]:
+        """Return all stored packages for a carrier.
+
+        Kwargs:
+            carrier_slug (str): The slug of the carrier.
+            max_age (float): If given, packages fetched more than this many seconds
+                ago are ignored.
+        """
+        return self._get_many("carrier_slug = ?", (carrier_slug,), max_age)
+
+    def get_packages_with_status(
+        self, status: str, max_age: Optional[float] = None
+    ) -> List[TrackedPackage]:
+        """Return all stored packages with an event of the given status.
+
+        Kwargs:
+            status (str): The event status, eg. "DELIVERED".
+            max_age (float): If given, packages fetched more than this many seconds
+                ago are ignored.
+        """
+        return self._get_many(
+            "id IN (SELECT package_id FROM events WHERE status = ?)",
+            (status,),
+            max_age,
+        )
+
+    def delete(self, package_id: str) -> None:
+        """Remove a package and its events from the store."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM packages WHERE id = ?", (str(package_id),)
+            )
+
+    def _get_one(
+        self, where: str, parameters: tuple, max_age: Optional[float]
+    ) -> Optional[TrackedPackage]:
+        packages = self._get_many(where, parameters, max_age, limit=1)
+        return packages[0] if packages else None
+
+    def _get_many(
+        self,
+        where: str,
+        parameters: tuple,
+        max_age: Optional[float],
+        limit: Optional[int] = None,
+    ) -> List[TrackedPackage]:
+        query = f"SELECT data FROM packages WHERE {where}"
+        if max_age is not None:
+            query += " AND fetched_at >= ?"
+            parameters = (*parameters, self.clock() - max_age)
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        return [TrackedPackage(json.loads(data)) for (data,) in rows]
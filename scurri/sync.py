@@ -0,0 +1,141 @@
+"""Incremental synchronisation of tracking information."""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .api import ScurriAPI
+from .models import TrackedPackage, TrackingEvent, parse_timestamp, to_utc
+from .request import CarrierTrackingsRequest, TrackingsRequest
+
+
+class TrackingUpdate:
+    """A package that is new or has new events since the last sync."""
+
+    __slots__ = ("package", "events")
+
+    def __init__(self, package: TrackedPackage, events: List[TrackingEvent]) -> None:
+        """Create a tracking update.
+
+        Args:
+            package (scurri.models.TrackedPackage): The new or changed package.
+            events (list(scurri.models.TrackingEvent)): The package's events that
+                are new since the last sync.
+        """
+        self.package = package
+        self.events = events
+
+
+class TrackingSync:
+    """Yield tracked packages that have changed since the previous sync.
+
+    The sync remembers a high water mark, the latest package creation or event time
+    seen, and on the next sync only yields packages created, or with events, after
+    it. The mark is advanced once every package has been processed, so a sync that
+    is stopped early is repeated in full next time.
+
+    Response data for unchanged packages is skipped without creating model objects.
+    If the API has a store, every package received is saved to it.
+    The Scurri API does not provide a way to request only changed packages, so every
+    page is still requested.
+
+    Kwargs:
+        scurri_api (scurri.ScurriAPI): An authorised API session.
+        state_path (str): If given the high water mark is saved to this file and
+            loaded from it when the sync is created.
+        carrier_slug (str): If given only packages from this carrier are synced.
+        lookback (datetime.timedelta): Events up to this long before the high water
+            mark are treated as new, to catch events that carriers report late.
+            Events in this window may be yielded more than once. Default zero.
+        max_workers (int): The number of pages to request concurrently. Default 1.
+    """
+
+    WATERMARK = "watermark"
+
+    def __init__(
+        self,
+        scurri_api: ScurriAPI,
+        state_path: Optional[str] = None,
+        carrier_slug: Optional[str] = None,
+        lookback: timedelta = timedelta(0),
+        max_workers: int = 1,
+    ) -> None:
+        """Create a tracking sync."""
+        self.scurri_api = scurri_api
+        self.state_path = state_path
+        self.carrier_slug = carrier_slug
+        self.lookback = lookback
+        self.max_workers = max_workers
+        self.watermark: Optional[datetime] = None
+        if state_path is not None and os.path.exists(state_path):
+            self.load()
+
+    def load(self) -> None:
+        """Load the high water mark from the state file."""
+        if self.state_path is None:
+            return
+        with open(self.state_path) as f:
+            state = json.load(f)
+        watermark = state.get(self.WATERMARK)
+        self.watermark = None if watermark is None else parse_timestamp(watermark)
+
+    def save(self) -> None:
+        """Atomically write the high water mark to the state file."""
+        if self.state_path is None:
+            return
+        watermark = None if self.watermark is None else self.watermark.isoformat()
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, delete=False, suffix=".tmp"
+        ) as f:
+            json.dump({self.WATERMARK: watermark}, f)
+        os.replace(f.name, self.state_path)
+
+    def reset(self) -> None:
+        """Forget the high water mark so the next sync yields every package."""
+        self.watermark = None
+        self.save()
+
+    def sync(self) -> Iterator[TrackingUpdate]:
+        """Yield packages that are new or have new events since the last sync."""
+        since = None if self.watermark is None else self.watermark - self.lookback
+        latest = self.watermark
+        for result in self._iter_results():
+            created_at = to_utc(parse_timestamp(result[TrackedPackage.CREATED_AT]))
+            event_times = [
+                to_utc(parse_timestamp(event[TrackingEvent.TIMESTAMP]))
+                for event in result[TrackedPackage.EVENTS]
+            ]
+            result_latest = max([created_at, *event_times])
+            if latest is None or result_latest > latest:
+                latest = result_latest
+            if since is not None and result_latest <= since:
+                continue
+            package = TrackedPackage(result)
+            if since is None or created_at > since:
+                events = package.events
+            else:
+                events = [
+                    event
+                    for event, event_time in zip(package.events, event_times)
+                    if event_time > since
+                ]
+            yield TrackingUpdate(package=package, events=events)
+        self.watermark = latest
+        self.save()
+
+    def _iter_results(self) -> Iterable[Dict[str, Any]]:
+        """Yield response data, saving it to the API's store if it has one."""
+        if self.carrier_slug is None:
+            results = TrackingsRequest.iter_results(
+                api_session=self.scurri_api.session, max_workers=self.max_workers
+            )
+        else:
+            results = CarrierTrackingsRequest.iter_results(
+                api_session=self.scurri_api.session,
+                params={"carrier_slug": self.carrier_slug},
+                max_workers=self.max_workers,
+            )
+        return self.scurri_api._save_iter_results(results)
@@ -0,0 +1,189 @@
+"""Column oriented containers for large amounts of Scurri data."""
+
+import sys
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from .models import TrackedPackage, TrackingEvent, parse_timestamp, to_utc
+
+
+def datetime_to_epoch(value: datetime) -> int:
+    """Return a datetime as seconds since the epoch, treating naive values as UTC."""
+    return int(to_utc(value).timestamp())
+
+
+def timestamp_to_epoch(value: str) -> int:
+    """Return an ISO 8601 timestamp as seconds since the epoch.
+
+    Timestamps without a timezone are treated as UTC.
+    """
+    return datetime_to_epoch(parse_timestamp(value))
+
+
+class _Categories:
+    """Map repeated strings to small integer codes."""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        """Return the code for value, adding it if it has not been seen."""
+        try:
+            return self.codes[value]
+        except KeyError:
+            code = len(self.values)
+            self.values.append(sys.intern(value))
+            self.codes[value] = code
+            return code
+
+
+class TrackingTable:
+    """Tracked package data stored in parallel arrays.
+
+    Each package is a row identified by its index. Carrier slugs and event statuses
+    are stored as codes into lists of unique values and timestamps are stored as
+    integer seconds since the epoch, in UTC. The events of package i are the events
+    from event_offsets[i] up to event_offsets[i + 1].
+
+    Only the fields needed to filter and group packages are kept. Use the package
+    IDs to request full tracking information when it is needed.
+    """
+
+    NO_STATUS = -1
+
+    def __init__(self, results: Iterable[Dict[str, Any]] = ()) -> None:
+        """Create a table, optionally filled with tracked package response data."""
+        self.ids: List[Any] = []
+        self.tracking_numbers: List[str] = []
+        self.carrier_codes = array("I")
+        self.created_at = array("q")
+        self.latest_status_codes = array("i")
+        self.event_offsets = array("Q", [0])
+        self.event_status_codes = array("I")
+        self.event_timestamps = array("q")
+        self._carriers = _Categories()
+        self._statuses = _Categories()
+        self.extend(results)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def carriers(self) -> List[str]:
+        """Return the unique carrier slugs, indexed by carrier code."""
+        return self._carriers.values
+
+    @property
+    def statuses(self) -> List[str]:
+        """Return the unique event statuses, indexed by status code."""
+        return self._statuses.values
+
+    @property
+    def event_count(self) -> int:
+        """Return the total number of events in the table."""
+        return len(self.event_timestamps)
+
+    def append(self, result: Dict[str, Any]) -> None:
+        """Add a package from tracked package response data."""
+        carrier_slug = result[TrackedPackage.CARRIER_URL].split("/")[-1]
+        latest_status_code = self.NO_STATUS
+        latest_timestamp = None
+        for event in result[TrackedPackage.EVENTS]:
+            status_code = self._statuses.code(event[TrackingEvent.STATUS])
+            timestamp = timestamp_to_epoch(event[TrackingEvent.TIMESTAMP])
+            self.event_status_codes.append(status_code)
+            self.event_timestamps.append(timestamp)
+            if latest_timestamp is None or timestamp >= latest_timestamp:
+                latest_timestamp = timestamp
+                latest_status_code = status_code
+        self.ids.append(result[TrackedPackage.ID])
+        self.tracking_numbers.append(result[TrackedPackage.TRACKING_NUMBER])
+        self.carrier_codes.append(self._carriers.code(carrier_slug))
+        self.created_at.append(timestamp_to_epoch(result[TrackedPackage.CREATED_AT]))
+        self.latest_status_codes.append(latest_status_code)
+        self.event_offsets.append(len(self.event_timestamps))
+
+    def extend(self, results: Iterable[Dict[str, Any]]) -> None:
+        """Add packages from tracked package response data."""
+        for result in results:
+            self.append(result)
+
+    def carrier_slug(self, index: int) -> str:
+        """Return the carrier slug of the package at index."""
+        return self._carriers.values[self.carrier_codes[index]]
+
+    def latest_status(self, index: int) -> Optional[str]:
+        """Return the status of the most recent event of the package at index."""
+        code = self.latest_status_codes[index]
+        if code == self.NO_STATUS:
+            return None
+        return self._statuses.values[code]
+
+    def created_at_datetime(self, index: int) -> datetime:
+        """Return the time the package at index was created as a datetime."""
+        return datetime.fromtimestamp(self.created_at[index], tz=timezone.utc)
+
+    def event_range(self, index: int) -> range:
+        """Return the indexes of the events of the package at index."""
+        return range(self.event_offsets[index], self.event_offsets[index + 1])
+
+    def where(
+        self,
+        carrier_slug: Optional[str] = None,
+        latest_status: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> List[int]:
+        """Return the indexes of packages matching all of the given filters.
+
+        Kwargs:
+            carrier_slug (str): Only include packages from this carrier.
+            latest_status (str): Only include packages whose most recent event has
+                this status.
+            created_after (datetime.datetime): Only include packages created at or
+                after this time. Naive datetimes are treated as UTC.
+            created_before (datetime.datetime): Only include packages created before
+                this time. Naive datetimes are treated as UTC.
+        """
+        indexes: Iterable[int] = range(len(self))
+        if carrier_slug is not None:
+            if carrier_slug not in self._carriers.codes:
+                return []
+            carrier_code = self._carriers.codes[carrier_slug]
+            codes = self.carrier_codes
+            indexes = [i for i in indexes if codes[i] == carrier_code]
+        if latest_status is not None:
+            if latest_status not in self._statuses.codes:
+                return []
+            status_code = self._statuses.codes[latest_status]
+            status_codes = self.latest_status_codes
+            indexes = [i for i in indexes if status_codes[i] == status_code]
+        if created_after is not None:
+            after = datetime_to_epoch(created_after)
+            indexes = [i for i in indexes if self.created_at[i] >= after]
+        if created_before is not None:
+            before = datetime_to_epoch(created_before)
+            indexes = [i for i in indexes if self.created_at[i] < before]
+        return list(indexes)
+
+    def count_by_carrier(self) -> Dict[str, int]:
+        """Return the number of packages for each carrier slug."""
+        counts = [0] * len(self._carriers.values)
+        for code in self.carrier_codes:
+            counts[code] += 1
+        return dict(zip(self._carriers.values, counts))
+
+    def count_by_latest_status(self) -> Dict[Optional[str], int]:
+        """Return the number of packages for each latest event status.
+
+        Packages without events are counted under None.
+        """
+        counts: Dict[Optional[str], int] = {}
+        for code in self.latest_status_codes:
+            status = None if code == self.NO_STATUS else self._statuses.values[code]
+            counts[status] = counts.get(status, 0) + 1
+        return counts
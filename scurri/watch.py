@@ -0,0 +1,241 @@
+"""Watch packages for new tracking events."""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from . import exceptions
+from .api import NOT_FOUND_RESPONSE, ScurriAPI
+from .models import TrackedPackage, TrackingEvent
+from .request import TrackingByPackageID
+from .sync import TrackingUpdate
+
+
+class SeenEvents:
+    """Remember the IDs of the tracking events seen for each package.
+
+    Packages are kept in least recently used order. When there are more than
+    max_packages the least recently used package is forgotten, and its events are
+    treated as new if it is seen again. The class can be shared between threads.
+
+    Kwargs:
+        max_packages (int): The maximum number of packages remembered. If None the
+            number is not limited. Default None.
+        path (str): If given the seen events are saved to this file by save and
+            loaded from it when the object is created.
+    """
+
+    def __init__(
+        self, max_packages: Optional[int] = None, path: Optional[str] = None
+    ) -> None:
+        """Create an empty record of seen events."""
+        self.max_packages = max_packages
+        self.path = path
+        self._packages: "OrderedDict[str, set]" = OrderedDict()
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._packages)
+
+    def __contains__(self, package_id: object) -> bool:
+        with self._lock:
+            return str(package_id) in self._packages
+
+    def new_events(
+        self, package_id: str, events: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Return the event response data not seen before and record it as seen.
+
+        Args:
+            package_id (str): The ID of the package the events belong to.
+            events (iterable(dict)): The package's events as returned by the API.
+        """
+        with self._lock:
+            seen = self._packages.get(str(package_id))
+            if seen is None:
+                seen = self._packages[str(package_id)] = set()
+            self._packages.move_to_end(str(package_id))
+            new = [event for event in events if event[TrackingEvent.ID] not in seen]
+            seen.update(event[TrackingEvent.ID] for event in new)
+            self._evict()
+        return new
+
+    def forget(self, package_id: str) -> None:
+        """Forget the events seen for a package."""
+        with self._lock:
+            self._packages.pop(str(package_id), None)
+
+    def load(self) -> None:
+        """Load the seen events from the file."""
+        if self.path is None:
+            return
+        with open(self.path) as f:
+            packages = json.load(f)
+        with self._lock:
+            self._packages = OrderedDict(
+                (package_id, set(event_ids)) for package_id, event_ids in packages
+            )
+            self._evict()
+
+    def save(self) -> None:
+        """Atomically write the seen events to the file, oldest package first."""
+        if self.path is None:
+            return
+        with self._lock:
+            packages = [
+                [package_id, sorted(event_ids, key=str)]
+                for package_id, event_ids in self._packages.items()
+            ]
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, delete=False, suffix=".tmp"
+        ) as f:
+            json.dump(packages, f)
+        os.replace(f.name, self.path)
+
+    def _evict(self) -> None:
+        if self.max_packages is None:
+            return
+        while len(self._packages) > self.max_packages:
+            self._packages.popitem(last=False)
+
+
+class TrackingWatcher:
+    """Poll a set of packages and yield only the tracking events not seen before.
+
+    Each poll requests every watched package by ID and compares its event IDs with
+    those already seen. Model objects are only created for packages with new
+    events, so the work done after each response is proportional to the number of
+    changes rather than the total number of events. Packages that are not found are
+    skipped, as they may not have been added to Scurri yet.
+
+    Single package lookups bypass the API's store, if it has one, so every poll
+    sees the latest events, but responses are still saved to it.
+
+    Kwargs:
+        scurri_api (scurri.ScurriAPI): An authorised API session.
+        package_ids (iterable(str)): The IDs of the packages to watch.
+        interval (float): The number of seconds between the start of each poll.
+            Default 60.
+        seen (scurri.watch.SeenEvents): The record of events already seen. Pass one
+            with max_packages or path to limit its size or to keep it between runs.
+            Default a new unlimited record kept in memory.
+        max_workers (int): The number of packages requested concurrently. Default 1.
+        skip_existing (bool): If True, the events a package already has the first
+            time it is polled are recorded without being yielded. Default False.
+    """
+
+    def __init__(
+        self,
+        scurri_api: ScurriAPI,
+        package_ids: Iterable[str] = (),
+        interval: float = 60,
+        seen: Optional[SeenEvents] = None,
+        max_workers: int = 1,
+        skip_existing: bool = False,
+    ) -> None:
+        """Create a tracking watcher."""
+        self.scurri_api = scurri_api
+        self.interval = interval
+        self.seen = SeenEvents() if seen is None else seen
+        self.max_workers = max_workers
+        self.skip_existing = skip_existing
+        self._package_ids = dict.fromkeys(str(package_id) for package_id in package_ids)
+        self._stopped = threading.Event()
+
+    @property
+    def package_ids(self) -> List[str]:
+        """Return the IDs of the watched packages."""
+        return list(self._package_ids)
+
+    def add(self, package_id: str) -> None:
+        """Watch a package from the next poll."""
+        self._package_ids[str(package_id)] = None
+
+    def remove(self, package_id: str) -> None:
+        """Stop watching a package and forget its seen events."""
+        self._package_ids.pop(str(package_id), None)
+        self.seen.forget(package_id)
+
+    def poll(self) -> List[TrackingUpdate]:
+        """Request every watched package once and return those with new events.
+
+        The seen events are saved once every package has been requested.
+        """
+        package_ids = self.package_ids
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            updates = list(executor.map(self._poll_package, package_ids))
+        self.seen.save()
+        return [update for update in updates if update is not None]
+
+    def watch(self, max_polls: Optional[int] = None) -> Iterator[TrackingUpdate]:
+        """Poll every interval seconds, yielding packages with new events.
+
+        Kwargs:
+            max_polls (int): If given, stop after this many polls. By default
+                polling continues until stop is called.
+        """
+        self._stopped.clear()
+        polls = 0
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            yield from self.poll()
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                return
+            self._stopped.wait(max(self.interval - (time.monotonic() - started), 0))
+
+    def run(
+        self,
+        callback: Callable[[TrackingUpdate], None],
+        max_polls: Optional[int] = None,
+    ) -> None:
+        """Poll every interval seconds, calling callback with each package update.
+
+        Kwargs:
+            callback (callable): Called with a scurri.sync.TrackingUpdate for each
+                package with new events.
+            max_polls (int): If given, stop after this many polls.
+        """
+        for update in self.watch(max_polls=max_polls):
+            callback(update)
+
+    def stop(self) -> None:
+        """Stop watch or run after the current poll, from any thread."""
+        self._stopped.set()
+
+    def _poll_package(self, package_id: str) -> Optional[TrackingUpdate]:
+        """Request a package and return an update if it has new events."""
+        first_poll = package_id not in self.seen
+        try:
+            response = self._request(package_id)
+        except exceptions.PackageNotFound:
+            return None
+        events = self.seen.new_events(package_id, response[TrackedPackage.EVENTS])
+        if not events or (first_poll and self.skip_existing):
+            return None
+        package = TrackedPackage(response)
+        event_ids = {event[TrackingEvent.ID] for event in events}
+        return TrackingUpdate(
+            package=package,
+            events=[event for event in package.events if event.id in event_ids],
+        )
+
+    def _request(self, package_id: str) -> Dict[str, Any]:
+        response: Dict[str, Any] = TrackingByPackageID.request(
+            api_session=self.scurri_api.session, params={"package_id": package_id}
+        )
+        if response == NOT_FOUND_RESPONSE:
+            raise exceptions.PackageNotFound(
+                f'No package found with ID "{package_id}".'
+            )
+        self.scurri_api._save_results([response])
+        return response
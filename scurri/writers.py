@@ -0,0 +1,191 @@
+"""Writers that stream tracking response data to NDJSON, CSV or Parquet files."""
+
+import csv
+import io
+from types import TracebackType
+from typing import IO, Any, Dict, Iterator, List, Optional, Type
+
+from .export import default_json_encoder
+from .models import TrackedPackage, TrackingEvent
+
+FORMATS = ("ndjson", "csv", "parquet")
+
+EVENT_COLUMNS = [
+    "package_id",
+    "tracking_number",
+    "carrier",
+    "carrier_slug",
+    "created_at",
+    "event_id",
+    "status",
+    "carrier_code",
+    "description",
+    "timestamp",
+    "location",
+]
+
+
+def iter_event_rows(result: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield a row for each event of a package's response data.
+
+    A package without events gives one row with empty event columns.
+    """
+    package = {
+        "package_id": result[TrackedPackage.ID],
+        "tracking_number": result[TrackedPackage.TRACKING_NUMBER],
+        "carrier": result[TrackedPackage.CARRIER],
+        "carrier_slug": result[TrackedPackage.CARRIER_URL].split("/")[-1],
+        "created_at": result[TrackedPackage.CREATED_AT],
+    }
+    events = result[TrackedPackage.EVENTS]
+    if not events:
+        yield dict.fromkeys(EVENT_COLUMNS) | package
+    for event in events:
+        yield package | {
+            "event_id": event[TrackingEvent.ID],
+            "status": event[TrackingEvent.STATUS],
+            "carrier_code": event[TrackingEvent.CARRIER_CODE],
+            "description": event[TrackingEvent.DESCRIPTION],
+            "timestamp": event[TrackingEvent.TIMESTAMP],
+            "location": event.get(TrackingEvent.LOCATION),
+        }
+
+
+class ResultWriter:
+    """Base class for writers of package response data.
+
+    Results are written as they are given, so memory use does not grow with the
+    number of packages. Writers can be used as context managers.
+    """
+
+    def __init__(self, f: IO[bytes]) -> None:
+        """Create a writer for the binary file f."""
+        self.f = f
+        self.count = 0
+
+    def write(self, result: Dict[str, Any]) -> None:
+        """Write the response data of one package."""
+        self._write(result)
+        self.count += 1
+
+    def close(self) -> None:
+        """Flush any buffered data. The file is not closed."""
+        self.f.flush()
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        raise NotImplementedError()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class NDJSONWriter(ResultWriter):
+    """Write each package as a line of JSON, as received from the API."""
+
+    def __init__(self, f: IO[bytes]) -> None:
+        """Create an NDJSON writer for the binary file f."""
+        super().__init__(f)
+        self.encoder = default_json_encoder()
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        self.f.write(self.encoder(result))
+        self.f.write(b"\n")
+
+
+class CSVWriter(ResultWriter):
+    """Write a CSV row for each tracking event, see EVENT_COLUMNS."""
+
+    def __init__(self, f: IO[bytes]) -> None:
+        """Create a CSV writer for the binary file f."""
+        super().__init__(f)
+        self.text = io.TextIOWrapper(
+            f, encoding="utf-8", newline="", write_through=True
+        )
+        self.writer = csv.DictWriter(self.text, fieldnames=EVENT_COLUMNS)
+        self.writer.writeheader()
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        self.writer.writerows(iter_event_rows(result))
+
+    def close(self) -> None:
+        """Flush the CSV rows, leaving the file open."""
+        self.text.flush()
+        self.text.detach()
+        super().close()
+
+
+class ParquetWriter(ResultWriter):
+    """Write a Parquet row for each tracking event, see EVENT_COLUMNS.
+
+    Rows are buffered and written as a row group every batch_size rows. Every
+    column is a string. Requires the pyarrow package, which can be installed with
+    the parquet extra.
+
+    Kwargs:
+        batch_size (int): The number of rows in each row group. Default 50000.
+    """
+
+    def __init__(self, f: IO[bytes], batch_size: int = 50000) -> None:
+        """Create a Parquet writer for the binary file f."""
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:  # pragma: no cover
+            raise ImportError(
+                "Parquet output requires pyarrow. "
+                "Install it with `pip install scurri[parquet]`."
+            ) from e
+        super().__init__(f)
+        self.pyarrow = pyarrow
+        self.batch_size = batch_size
+        self.schema = pyarrow.schema(
+            [(column, pyarrow.string()) for column in EVENT_COLUMNS]
+        )
+        self.writer = pyarrow.parquet.ParquetWriter(f, self.schema)
+        self.rows: List[Dict[str, Any]] = []
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        self.rows.extend(iter_event_rows(result))
+        if len(self.rows) >= self.batch_size:
+            self._flush()
+
+    def close(self) -> None:
+        """Write any buffered rows and the Parquet footer, leaving the file open."""
+        self._flush()
+        self.writer.close()
+        super().close()
+
+    def _flush(self) -> None:
+        if not self.rows:
+            return
+        columns = {
+            column: [
+                None if row[column] is None else str(row[column]) for row in self.rows
+            ]
+            for column in EVENT_COLUMNS
+        }
+        self.writer.write_table(self.pyarrow.table(columns, schema=self.schema))
+        self.rows = []
+
+
+def get_writer(format: str, f: IO[bytes]) -> ResultWriter:
+    """Return a writer for format, one of FORMATS, that writes to f.
+
+    Raises:
+        ValueError: If format is not supported.
+    """
+    if format == "ndjson":
+        return NDJSONWriter(f)
+    if format == "csv":
+        return CSVWriter(f)
+    if format == "parquet":
+        return ParquetWriter(f)
+    raise ValueError(f"Unsupported format '{format}'.")
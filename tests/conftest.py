@@ -1,6 +1,7 @@
 import pytest
 
 import scurri
+from scurri.retry import RetryPolicy
 
 
 @pytest.fixture
@@ -20,7 +21,7 @@ def token():
 
 @pytest.fixture
 def authenticated_scurri_api(requests_mock, token):
-    scurri_api = scurri.ScurriAPISession()
+    scurri_api = scurri.ScurriAPISession(retry_policy=RetryPolicy(backoff_factor=0))
     scurri_api.token = token
     return scurri_api
 
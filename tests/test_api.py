@@ -2,8 +2,10 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from scurri import exceptions, models
+from scurri import ScurriAPISession, exceptions, models
 from scurri.api import ScurriAPI
+from scurri.store import TrackingStore
+from scurri.tables import TrackingTable
 
 
 @pytest.fixture
@@ -62,7 +64,13 @@ def test_get_carrier_trackings_method(scurri_api, trackings_response_data):
     with patch("scurri.api.CarrierTrackingsRequest.request", mock_request_method):
         response = scurri_api.get_carrier_trackings(carrier_slug)
     mock_request_method.assert_called_once_with(
-        api_session=scurri_api.session, params={"carrier_slug": carrier_slug}
+        api_session=scurri_api.session,
+        params={"carrier_slug": carrier_slug},
+        max_workers=1,
+        checkpoint=None,
+        limits=None,
+        page_size=None,
+        query=None,
     )
     assert len(response) == len(trackings_response_data)
     assert isinstance(response[0], models.TrackedPackage)
@@ -72,7 +80,14 @@ def test_get_trackings_method(scurri_api, trackings_response_data):
     mock_request_method = Mock(return_value=trackings_response_data)
     with patch("scurri.api.TrackingsRequest.request", mock_request_method):
         response = scurri_api.get_trackings()
-    mock_request_method.assert_called_once_with(api_session=scurri_api.session)
+    mock_request_method.assert_called_once_with(
+        api_session=scurri_api.session,
+        max_workers=1,
+        checkpoint=None,
+        limits=None,
+        page_size=None,
+        query=None,
+    )
     assert len(response) == len(trackings_response_data)
     assert isinstance(response[0], models.TrackedPackage)
 
@@ -124,3 +139,273 @@ def test_get_tracking_by_tracking_number_raises_when_package_not_found(
             scurri_api.get_tracking_by_tracking_number(
                 carrier_slug=carrier_slug, tracking_number=tracking_number
             )
+
+
+def test_iter_carrier_trackings_method(scurri_api, trackings_response_data):
+    mock_request_method = Mock(return_value=iter(trackings_response_data))
+    carrier_slug = "test_carrier"
+    with patch("scurri.api.CarrierTrackingsRequest.iter_results", mock_request_method):
+        response = list(scurri_api.iter_carrier_trackings(carrier_slug))
+    mock_request_method.assert_called_once_with(
+        api_session=scurri_api.session,
+        params={"carrier_slug": carrier_slug},
+        max_workers=1,
+        checkpoint=None,
+        limits=None,
+        page_size=None,
+        query=None,
+    )
+    assert len(response) == len(trackings_response_data)
+    assert isinstance(response[0], models.TrackedPackage)
+
+
+def test_iter_trackings_method(scurri_api, trackings_response_data):
+    mock_request_method = Mock(return_value=iter(trackings_response_data))
+    with patch("scurri.api.TrackingsRequest.iter_results", mock_request_method):
+        response = list(scurri_api.iter_trackings())
+    mock_request_method.assert_called_once_with(
+        api_session=scurri_api.session,
+        max_workers=1,
+        checkpoint=None,
+        limits=None,
+        page_size=None,
+        query=None,
+    )
+    assert len(response) == len(trackings_response_data)
+    assert isinstance(response[0], models.TrackedPackage)
+
+
+def test_get_trackings_method_with_filters(scurri_api, trackings_response_data):
+    mock_request_method = Mock(return_value=trackings_response_data)
+    filters = {"status": "DELIVERED"}
+    with patch("scurri.api.TrackingsRequest.request", mock_request_method):
+        scurri_api.get_trackings(page_size=100, filters=filters)
+    mock_request_method.assert_called_once_with(
+        api_session=scurri_api.session,
+        max_workers=1,
+        checkpoint=None,
+        limits=None,
+        page_size=100,
+        query=filters,
+    )
+
+
+def test_get_trackings_method_with_max_workers(scurri_api, trackings_response_data):
+    mock_request_method = Mock(return_value=trackings_response_data)
+    with patch("scurri.api.TrackingsRequest.request", mock_request_method):
+        scurri_api.get_trackings(max_workers=4)
+    mock_request_method.assert_called_once_with(
+        api_session=scurri_api.session,
+        max_workers=4,
+        checkpoint=None,
+        limits=None,
+        page_size=None,
+        query=None,
+    )
+
+
+def test_get_trackings_by_package_ids_method(scurri_api, tracking_response_data):
+    def get_tracking(package_id):
+        if package_id == "missing":
+            raise exceptions.PackageNotFound(package_id)
+        return models.TrackedPackage(dict(tracking_response_data, id=package_id))
+
+    with patch.object(scurri_api, "get_tracking_by_package_id", get_tracking):
+        response = scurri_api.get_trackings_by_package_ids(
+            ["1", "missing", "2", "1"], max_workers=2
+        )
+    assert list(response.keys()) == ["1", "missing", "2"]
+    assert response["1"].id == "1"
+    assert response["2"].id == "2"
+    assert isinstance(response["missing"], exceptions.PackageNotFound)
+
+
+def test_get_trackings_by_tracking_numbers_method(scurri_api, tracking_response_data):
+    mock_request_method = Mock(
+        side_effect=[tracking_response_data, {"detail": "Not found."}]
+    )
+    keys = [("hermes", "TRACK1"), ("hermes", "TRACK2")]
+    with patch("scurri.api.TrackingByTrackingNumber.request", mock_request_method):
+        response = scurri_api.get_trackings_by_tracking_numbers(keys, max_workers=1)
+    assert isinstance(response[keys[0]], models.TrackedPackage)
+    assert isinstance(response[keys[1]], exceptions.PackageNotFound)
+
+
+def test_get_trackings_by_package_ids_raises_other_errors(scurri_api):
+    mock_request_method = Mock(side_effect=exceptions.InvalidResponse("uri", ""))
+    with patch("scurri.api.TrackingByPackageID.request", mock_request_method):
+        with pytest.raises(exceptions.InvalidResponse):
+            scurri_api.get_trackings_by_package_ids(["1", "2"])
+
+
+def test_get_trackings_table_method(scurri_api, trackings_response_data):
+    mock_request_method = Mock(return_value=iter(trackings_response_data))
+    with patch("scurri.api.TrackingsRequest.iter_results", mock_request_method):
+        response = scurri_api.get_trackings_table()
+    mock_request_method.assert_called_once_with(
+        api_session=scurri_api.session, max_workers=1, page_size=None, query=None
+    )
+    assert isinstance(response, TrackingTable)
+    assert len(response) == len(trackings_response_data)
+
+
+def test_get_trackings_table_method_with_carrier(scurri_api, trackings_response_data):
+    mock_request_method = Mock(return_value=iter(trackings_response_data))
+    carrier_slug = "test_carrier"
+    with patch("scurri.api.CarrierTrackingsRequest.iter_results", mock_request_method):
+        scurri_api.get_trackings_table(
+            carrier_slug=carrier_slug,
+            max_workers=2,
+            page_size=500,
+            filters={"status": "DELIVERED"},
+        )
+    mock_request_method.assert_called_once_with(
+        api_session=scurri_api.session,
+        params={"carrier_slug": carrier_slug},
+        max_workers=2,
+        page_size=500,
+        query={"status": "DELIVERED"},
+    )
+
+
+@pytest.fixture
+def caching_scurri_api():
+    return ScurriAPI(carrier_cache_ttl=3600)
+
+
+def test_get_carriers_is_cached(caching_scurri_api, carriers_response_data):
+    response_data = carriers_response_data[0]["results"]
+    mock_request_method = Mock(return_value=response_data)
+    with patch("scurri.api.CarriersRequest.request", mock_request_method):
+        caching_scurri_api.get_carriers()
+        response = caching_scurri_api.get_carriers()
+    mock_request_method.assert_called_once_with(api_session=caching_scurri_api.session)
+    assert len(response) == len(response_data)
+
+
+def test_get_carrier_uses_cached_carriers(caching_scurri_api, carriers_response_data):
+    response_data = carriers_response_data[0]["results"]
+    mock_carriers_request = Mock(return_value=response_data)
+    mock_carrier_request = Mock()
+    with patch("scurri.api.CarriersRequest.request", mock_carriers_request):
+        with patch("scurri.api.CarrierRequest.request", mock_carrier_request):
+            for carrier_data in response_data:
+                carrier = caching_scurri_api.get_carrier(carrier_data["slug"])
+                assert carrier.slug == carrier_data["slug"]
+    mock_carriers_request.assert_called_once()
+    mock_carrier_request.assert_not_called()
+
+
+def test_get_carrier_requests_carriers_missing_from_cache(
+    caching_scurri_api, carriers_response_data
+):
+    mock_carriers_request = Mock(return_value=carriers_response_data[0]["results"])
+    carrier_data = carriers_response_data[1]["results"][0]
+    mock_carrier_request = Mock(return_value=carrier_data)
+    with patch("scurri.api.CarriersRequest.request", mock_carriers_request):
+        with patch("scurri.api.CarrierRequest.request", mock_carrier_request):
+            caching_scurri_api.get_carrier(carrier_data["slug"])
+            carrier = caching_scurri_api.get_carrier(carrier_data["slug"])
+    mock_carrier_request.assert_called_once()
+    assert carrier.slug == carrier_data["slug"]
+
+
+def test_carrier_not_found_is_cached(
+    caching_scurri_api, carriers_response_data, not_found_response
+):
+    mock_carriers_request = Mock(return_value=carriers_response_data[0]["results"])
+    mock_carrier_request = Mock(return_value=not_found_response)
+    with patch("scurri.api.CarriersRequest.request", mock_carriers_request):
+        with patch("scurri.api.CarrierRequest.request", mock_carrier_request):
+            for _ in range(2):
+                with pytest.raises(exceptions.CarrierNotFound):
+                    caching_scurri_api.get_carrier("missing")
+    mock_carrier_request.assert_called_once()
+
+
+def test_invalidate_carrier_cache(caching_scurri_api, carriers_response_data):
+    mock_request_method = Mock(return_value=carriers_response_data[0]["results"])
+    with patch("scurri.api.CarriersRequest.request", mock_request_method):
+        caching_scurri_api.get_carriers()
+        caching_scurri_api.invalidate_carrier_cache()
+        caching_scurri_api.get_carriers()
+    assert mock_request_method.call_count == 2
+
+
+@pytest.fixture
+def tracking_store():
+    with TrackingStore() as store:
+        yield store
+
+
+def test_get_tracking_by_package_id_saves_to_store(
+    tracking_store, tracking_response_data
+):
+    scurri_api = ScurriAPI(store=tracking_store)
+    mock_request_method = Mock(return_value=tracking_response_data)
+    with patch("scurri.api.TrackingByPackageID.request", mock_request_method):
+        scurri_api.get_tracking_by_package_id(tracking_response_data["id"])
+        scurri_api.get_tracking_by_package_id(tracking_response_data["id"])
+    assert mock_request_method.call_count == 2
+    assert tracking_store.get_package(tracking_response_data["id"]) is not None
+
+
+def test_get_tracking_by_package_id_reads_from_store(
+    tracking_store, tracking_response_data
+):
+    tracking_store.save([tracking_response_data])
+    scurri_api = ScurriAPI(store=tracking_store, store_max_age=60)
+    mock_request_method = Mock()
+    with patch("scurri.api.TrackingByPackageID.request", mock_request_method):
+        package = scurri_api.get_tracking_by_package_id(tracking_response_data["id"])
+    mock_request_method.assert_not_called()
+    assert package.id == tracking_response_data["id"]
+
+
+def test_get_tracking_by_tracking_number_reads_from_store(
+    tracking_store, tracking_response_data
+):
+    tracking_store.save([tracking_response_data])
+    scurri_api = ScurriAPI(store=tracking_store, store_max_age=60)
+    mock_request_method = Mock()
+    with patch("scurri.api.TrackingByTrackingNumber.request", mock_request_method):
+        package = scurri_api.get_tracking_by_tracking_number(
+            "hermes", tracking_response_data["tracking_number"]
+        )
+    mock_request_method.assert_not_called()
+    assert package.id == tracking_response_data["id"]
+
+
+def test_get_tracking_by_tracking_number_saves_to_store(
+    tracking_store, tracking_response_data
+):
+    scurri_api = ScurriAPI(store=tracking_store, store_max_age=60)
+    mock_request_method = Mock(return_value=tracking_response_data)
+    with patch("scurri.api.TrackingByTrackingNumber.request", mock_request_method):
+        scurri_api.get_tracking_by_tracking_number(
+            "hermes", tracking_response_data["tracking_number"]
+        )
+    assert len(tracking_store) == 1
+
+
+def test_get_trackings_saves_to_store(tracking_store, trackings_response_data):
+    scurri_api = ScurriAPI(store=tracking_store)
+    mock_request_method = Mock(return_value=trackings_response_data)
+    with patch("scurri.api.TrackingsRequest.request", mock_request_method):
+        scurri_api.get_trackings()
+    assert len(tracking_store) == len(trackings_response_data)
+
+
+def test_iter_carrier_trackings_saves_to_store(tracking_store, trackings_response_data):
+    scurri_api = ScurriAPI(store=tracking_store)
+    mock_request_method = Mock(return_value=iter(trackings_response_data))
+    with patch("scurri.api.CarrierTrackingsRequest.iter_results", mock_request_method):
+        list(scurri_api.iter_carrier_trackings("hermes"))
+    assert len(tracking_store.get_carrier_packages("hermes")) == len(
+        trackings_response_data
+    )
+
+
+def test_scurri_api_uses_given_session():
+    session = ScurriAPISession(pool_maxsize=100)
+    assert ScurriAPI(session=session).session is session
@@ -0,0 +1,393 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, call
+
+import pytest
+from aiohttp import web
+
+from scurri import AsyncScurriAPI, AsyncScurriAPISession, exceptions, models
+from scurri.cache import HTTPCache
+from scurri.checkpoint import PaginationCheckpoint
+from scurri.metrics import MetricsCollector
+from scurri.request import PaginationLimits
+from scurri.retry import RetryPolicy
+
+
+@pytest.fixture
+def server_errors():
+    return {"count": 0}
+
+
+@pytest.fixture
+def trackings_queries():
+    return []
+
+
+@pytest.fixture
+def routes(
+    token,
+    carriers_response_data,
+    carrier_response_data,
+    tracking_response_data,
+    server_errors,
+    trackings_queries,
+):
+    routes = web.RouteTableDef()
+
+    @routes.post("/authorizations")
+    async def authorizations(request):
+        body = await request.json()
+        if body.get("password") != "mock_password1":
+            return web.json_response({"non_field_errors": ["Unable to log in."]})
+        return web.json_response({"token": token})
+
+    @routes.get("/carriers")
+    async def carriers(request):
+        assert request.headers["Authorization"] == f"Token {token}"
+        page = int(request.query.get("page", 1))
+        response = dict(carriers_response_data[page - 1])
+        if page == 1:
+            response["next"] = str(request.url.with_query(page=2))
+        return web.json_response(response)
+
+    @routes.get("/carriers/{carrier_slug}")
+    async def carrier(request):
+        if request.headers["Authorization"] != f"Token {token}":
+            return web.json_response({"detail": "Invalid token."}, status=401)
+        if request.match_info["carrier_slug"] == "missing":
+            return web.json_response({"detail": "Not found."}, status=404)
+        return web.json_response(carrier_response_data)
+
+    @routes.get("/trackings")
+    async def trackings(request):
+        trackings_queries.append(dict(request.query))
+        page = int(request.query.get("page", 1))
+        results = [dict(tracking_response_data, id=page * 10 + i) for i in range(2)]
+        next_url = str(request.url.update_query(page=page + 1)) if page < 4 else None
+        return web.json_response(
+            {"count": 8, "next": next_url, "previous": None, "results": results}
+        )
+
+    @routes.get("/carriers/{carrier_slug}/trackings")
+    async def carrier_trackings(request):
+        # Records are removed after the first page is served, so page 3 goes away.
+        page = int(request.query.get("page", 1))
+        if page > 2:
+            return web.json_response({"detail": "Invalid page."}, status=404)
+        results = [dict(tracking_response_data, id=page * 10 + i) for i in range(2)]
+        next_url = str(request.url.with_query(page=2)) if page == 1 else None
+        return web.json_response(
+            {
+                "count": 5 if page == 1 else 4,
+                "next": next_url,
+                "previous": None,
+                "results": results,
+            }
+        )
+
+    @routes.get("/trackings/{package_id}")
+    async def tracking(request):
+        if request.match_info["package_id"] == "missing":
+            return web.json_response({"detail": "Not found."}, status=404)
+        if request.match_info["package_id"] == "etag":
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.json_response(tracking_response_data, headers={"ETag": '"v1"'})
+        if request.match_info["package_id"] == "flaky" and server_errors["count"] < 2:
+            server_errors["count"] += 1
+            return web.Response(
+                text="""{"detail": "Internal server error"}""", status=500
+            )
+        return web.json_response(tracking_response_data)
+
+    @routes.get("/carriers/{carrier_slug}/trackings/{tracking_number}")
+    async def tracking_by_number(request):
+        return web.json_response(tracking_response_data)
+
+    return routes
+
+
+@pytest.fixture
+def run_with_server(routes, username, password):
+    def run(coroutine_function, authenticate=True):
+        async def main():
+            app = web.Application()
+            app.add_routes(routes)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = runner.addresses[0][1]
+            async with AsyncScurriAPI() as scurri_api:
+                scurri_api.session.base_url = f"http://127.0.0.1:{port}"
+                scurri_api.session.retry_policy = RetryPolicy(backoff_factor=0)
+                try:
+                    if authenticate:
+                        await scurri_api.auth(username=username, password=password)
+                    return await coroutine_function(scurri_api)
+                finally:
+                    await runner.cleanup()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_auth_sets_token(run_with_server, token):
+    async def get_token(scurri_api):
+        return scurri_api.session.token
+
+    assert run_with_server(get_token) == token
+
+
+def test_failed_authorization(run_with_server, username):
+    async def auth(scurri_api):
+        await scurri_api.auth(username=username, password="wrong")
+
+    with pytest.raises(exceptions.InvalidAuthRequestResponse):
+        run_with_server(auth, authenticate=False)
+
+
+def test_request_without_auth(run_with_server):
+    async def get_carriers(scurri_api):
+        return await scurri_api.get_carriers()
+
+    with pytest.raises(exceptions.NotAuthorizedException):
+        run_with_server(get_carriers, authenticate=False)
+
+
+def test_get_carriers(run_with_server, carriers_response_data):
+    async def get_carriers(scurri_api):
+        return await scurri_api.get_carriers()
+
+    carriers = run_with_server(get_carriers)
+    assert len(carriers) == len(carriers_response_data[0]["results"]) + len(
+        carriers_response_data[1]["results"]
+    )
+    assert isinstance(carriers[0], models.Carrier)
+
+
+def test_get_carrier(run_with_server, carrier_response_data):
+    async def get_carrier(scurri_api):
+        return await scurri_api.get_carrier("dummy_carrier")
+
+    carrier = run_with_server(get_carrier)
+    assert carrier.slug == carrier_response_data["slug"]
+
+
+def test_get_carrier_raises_when_carrier_not_found(run_with_server):
+    async def get_carrier(scurri_api):
+        return await scurri_api.get_carrier("missing")
+
+    with pytest.raises(exceptions.CarrierNotFound):
+        run_with_server(get_carrier)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_get_trackings(run_with_server, max_workers):
+    async def get_trackings(scurri_api):
+        return await scurri_api.get_trackings(max_workers=max_workers)
+
+    packages = run_with_server(get_trackings)
+    assert [package.id for package in packages] == [10, 11, 20, 21, 30, 31, 40, 41]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_carrier_trackings_with_records_removed_during_pull(
+    run_with_server, max_workers
+):
+    async def get_carrier_trackings(scurri_api):
+        return await scurri_api.get_carrier_trackings("hermes", max_workers=max_workers)
+
+    packages = run_with_server(get_carrier_trackings)
+    assert [package.id for package in packages] == [10, 11, 20, 21]
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_get_trackings_with_page_size_and_filters(
+    run_with_server, trackings_queries, max_workers
+):
+    async def get_trackings(scurri_api):
+        return await scurri_api.get_trackings(
+            max_workers=max_workers, page_size=2, filters={"status": "DELIVERED"}
+        )
+
+    packages = run_with_server(get_trackings)
+    assert len(packages) == 8
+    assert len(trackings_queries) == 4
+    for query in trackings_queries:
+        assert query["status"] == "DELIVERED"
+        assert query["page_size"] == "2"
+
+
+def test_get_trackings_sends_metrics_to_collector(run_with_server):
+    collector = MetricsCollector()
+
+    async def get_trackings(scurri_api):
+        scurri_api.session.observer = collector
+        return await scurri_api.get_trackings(max_workers=2)
+
+    run_with_server(get_trackings)
+    summary = collector.summary()["TrackingsRequest"]
+    assert summary["requests"] == 4
+    assert summary["statuses"] == {200: 4}
+    assert summary["paginations"] == 1
+    assert summary["items"] == 8
+    assert summary["p50"] is not None
+
+
+def test_iter_trackings(run_with_server):
+    async def iter_trackings(scurri_api):
+        return [package async for package in scurri_api.iter_trackings()]
+
+    packages = run_with_server(iter_trackings)
+    assert len(packages) == 8
+    assert isinstance(packages[0], models.TrackedPackage)
+
+
+def test_get_tracking_by_package_id(run_with_server, tracking_response_data):
+    async def get_tracking(scurri_api):
+        return await scurri_api.get_tracking_by_package_id("443018")
+
+    package = run_with_server(get_tracking)
+    assert package.id == tracking_response_data["id"]
+
+
+def test_get_tracking_by_package_id_raises_when_package_not_found(run_with_server):
+    async def get_tracking(scurri_api):
+        return await scurri_api.get_tracking_by_package_id("missing")
+
+    with pytest.raises(exceptions.PackageNotFound):
+        run_with_server(get_tracking)
+
+
+def test_get_tracking_by_package_id_retries_server_errors(
+    run_with_server, server_errors
+):
+    async def get_tracking(scurri_api):
+        return await scurri_api.get_tracking_by_package_id("flaky")
+
+    assert isinstance(run_with_server(get_tracking), models.TrackedPackage)
+    assert server_errors["count"] == 2
+
+
+def test_get_tracking_by_tracking_number(run_with_server, tracking_response_data):
+    async def get_tracking(scurri_api):
+        return await scurri_api.get_tracking_by_tracking_number(
+            carrier_slug="hermes", tracking_number="9669689010150297"
+        )
+
+    package = run_with_server(get_tracking)
+    assert package.tracking_number == tracking_response_data["tracking_number"]
+
+
+def test_concurrent_lookups(run_with_server):
+    async def get_trackings(scurri_api):
+        return await asyncio.gather(
+            *(scurri_api.get_tracking_by_package_id(str(i)) for i in range(20))
+        )
+
+    assert len(run_with_server(get_trackings)) == 20
+
+
+def test_get_trackings_by_package_ids(run_with_server):
+    async def get_trackings(scurri_api):
+        return await scurri_api.get_trackings_by_package_ids(
+            ["1", "missing", "2"], max_workers=2
+        )
+
+    response = run_with_server(get_trackings)
+    assert isinstance(response["1"], models.TrackedPackage)
+    assert isinstance(response["2"], models.TrackedPackage)
+    assert isinstance(response["missing"], exceptions.PackageNotFound)
+
+
+def test_get_trackings_by_tracking_numbers(run_with_server):
+    keys = [("hermes", "1"), ("hermes", "2")]
+
+    async def get_trackings(scurri_api):
+        return await scurri_api.get_trackings_by_tracking_numbers(keys)
+
+    response = run_with_server(get_trackings)
+    assert list(response.keys()) == keys
+
+
+def test_conditional_requests(run_with_server, tracking_response_data):
+    http_cache = HTTPCache()
+
+    async def get_tracking(scurri_api):
+        scurri_api.session.http_cache = http_cache
+        first = await scurri_api.get_tracking_by_package_id("etag")
+        second = await scurri_api.get_tracking_by_package_id("etag")
+        return first, second
+
+    first, second = run_with_server(get_tracking)
+    assert first.id == second.id == tracking_response_data["id"]
+    assert http_cache.hits == 1
+    assert http_cache.misses == 1
+
+
+def test_requests_wait_for_rate_limiter(run_with_server):
+    rate_limiter = MagicMock(async_acquire=AsyncMock())
+
+    async def get_carriers(scurri_api):
+        scurri_api.session.rate_limiter = rate_limiter
+        return await scurri_api.get_carriers()
+
+    run_with_server(get_carriers)
+    assert rate_limiter.async_acquire.await_count == 2
+    assert rate_limiter.record_response.call_args_list == [call(200), call(200)]
+
+
+def test_session_timeouts_and_keep_alive():
+    async def get_session():
+        scurri_api = AsyncScurriAPISession(
+            connect_timeout=3, read_timeout=4, keep_alive=False
+        )
+        async with scurri_api:
+            return scurri_api.session.timeout, scurri_api.session.connector.force_close
+
+    timeout, force_close = asyncio.run(get_session())
+    assert timeout.connect == 3
+    assert timeout.sock_read == 4
+    assert force_close is True
+
+
+def test_rejected_token_is_refreshed(run_with_server, carrier_response_data, token):
+    async def get_carrier(scurri_api):
+        scurri_api.session.token = "expired"
+        return await scurri_api.get_carrier("dummy_carrier")
+
+    carrier = run_with_server(get_carrier)
+    assert carrier.slug == carrier_response_data["slug"]
+
+
+def test_credential_provider_authorises_session(
+    run_with_server, carrier_response_data, username, password
+):
+    async def get_carrier(scurri_api):
+        scurri_api.session.credential_provider = lambda: (username, password)
+        return await scurri_api.get_carrier("dummy_carrier")
+
+    carrier = run_with_server(get_carrier, authenticate=False)
+    assert carrier.slug == carrier_response_data["slug"]
+
+
+def test_get_trackings_with_checkpoint(run_with_server, tmp_path):
+    async def get_trackings(scurri_api):
+        checkpoint = PaginationCheckpoint(str(tmp_path))
+        first = await scurri_api.get_trackings(checkpoint=checkpoint)
+        second = await scurri_api.get_trackings(checkpoint=checkpoint)
+        return checkpoint, first, second
+
+    checkpoint, first, second = run_with_server(get_trackings)
+    assert checkpoint.complete
+    assert checkpoint.page_count == 4
+    assert [package.id for package in first] == [package.id for package in second]
+
+
+def test_get_trackings_with_limits(run_with_server):
+    async def get_trackings(scurri_api):
+        return await scurri_api.get_trackings(limits=PaginationLimits(max_pages=2))
+
+    with pytest.raises(exceptions.PaginationLimitExceeded):
+        run_with_server(get_trackings)
@@ -0,0 +1,55 @@
+import pytest
+
+from benchmarks import bench_client
+from benchmarks.server import FakeScurriServer
+from scurri import ScurriAPI, exceptions
+
+
+@pytest.fixture
+def server():
+    with FakeScurriServer(packages=25, page_size=10) as server:
+        yield server
+
+
+def test_fake_server_paginates(server):
+    scurri_api = ScurriAPI(session=server.session())
+    packages = scurri_api.get_trackings(max_workers=2)
+    assert [package.id for package in packages] == list(range(25))
+    assert server.request_count == 3
+
+
+def test_fake_server_honours_page_size(server):
+    scurri_api = ScurriAPI(session=server.session())
+    packages = scurri_api.get_carrier_trackings("dpd", page_size=4)
+    assert [package.id for package in packages] == server.carrier_packages("dpd")
+    assert server.request_count == 2
+
+
+def test_fake_server_lookups(server):
+    scurri_api = ScurriAPI(session=server.session())
+    response = scurri_api.get_trackings_by_package_ids(["3", "99"])
+    assert response["3"].id == 3
+    assert isinstance(response["99"], exceptions.PackageNotFound)
+
+
+def test_fake_server_injects_errors():
+    with FakeScurriServer(packages=5, error_rate=1) as server:
+        scurri_api = ScurriAPI(session=server.session())
+        with pytest.raises(exceptions.TooManyRequestAtemptsError):
+            scurri_api.get_trackings()
+        assert server.request_count == 5
+
+
+def test_fake_server_in_child_process():
+    with FakeScurriServer(packages=5, throttle_rate=0.5, process=True) as server:
+        scurri_api = ScurriAPI(session=server.session())
+        assert len(scurri_api.get_trackings()) == 5
+        assert server.request_count >= 1
+
+
+def test_bench_client_runs(capsys):
+    lines = bench_client.main(
+        packages=20, page_size=5, events=1, latency=0, lookups=4, repeat=1
+    )
+    assert len(lines) == 10
+    assert capsys.readouterr().out.splitlines() == lines
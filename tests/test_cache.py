@@ -0,0 +1,123 @@
+import pytest
+
+from scurri.cache import CachedResponse, HTTPCache, TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_get_missing_key():
+    assert TTLCache().get("missing") is None
+
+
+def test_set_and_get():
+    cache = TTLCache()
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    assert "key" in cache
+    assert len(cache) == 1
+
+
+def test_entries_expire(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("key", "value")
+    clock.time = 9.9
+    assert cache.get("key") == "value"
+    clock.time = 10
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_entry_ttl_overrides_cache_ttl(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("key", "value", ttl=1)
+    clock.time = 1
+    assert cache.get("key") is None
+
+
+def test_entries_without_ttl_do_not_expire(clock):
+    cache = TTLCache(clock=clock)
+    cache.set("key", "value")
+    clock.time = 1e9
+    assert cache.get("key") == "value"
+
+
+def test_least_recently_used_entry_is_removed():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_invalidate():
+    cache = TTLCache()
+    cache.set("key", "value")
+    cache.invalidate("key")
+    cache.invalidate("missing")
+    assert cache.get("key") is None
+
+
+def test_clear():
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_cached_response_conditional_headers():
+    cached_response = CachedResponse(
+        body=b"{}", etag='"abc"', last_modified="yesterday"
+    )
+    assert cached_response.conditional_headers() == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "yesterday",
+    }
+
+
+def test_http_cache_store_and_get():
+    cache = HTTPCache()
+    cache.store("url", {"ETag": '"abc"'}, b'{"a": 1}')
+    cached_response = cache.get("url")
+    assert cached_response.body == b'{"a": 1}'
+    assert cached_response.size == 8
+    assert cached_response.etag == '"abc"'
+    assert cached_response.last_modified is None
+    assert cache.misses == 1
+
+
+def test_http_cache_store_without_validators_removes_entry():
+    cache = HTTPCache()
+    cache.store("url", {"ETag": '"abc"'}, b'{"a": 1}')
+    cache.store("url", {}, b'{"a": 2}')
+    assert cache.get("url") is None
+
+
+def test_http_cache_record_hit():
+    cache = HTTPCache()
+    cache.store("url", {"ETag": '"abc"'}, b'{"a": 1}')
+    cache.record_hit(cache.get("url"))
+    assert cache.hits == 1
+    assert cache.bytes_saved == 8
+
+
+def test_http_cache_max_size():
+    cache = HTTPCache(max_size=1)
+    cache.store("url_1", {"ETag": '"1"'}, b"{}")
+    cache.store("url_2", {"ETag": '"2"'}, b"{}")
+    assert cache.get("url_1") is None
+    assert len(cache) == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from scurri.checkpoint import PaginationCheckpoint
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / "checkpoint")
+
+
+def page(number, next_uri):
+    return {"count": 4, "next": next_uri, "previous": None, "results": [number]}
+
+
+def test_new_checkpoint_is_empty(directory):
+    checkpoint = PaginationCheckpoint(directory)
+    assert checkpoint.page_count == 0
+    assert checkpoint.next is None
+    assert not checkpoint.complete
+    assert list(checkpoint.iter_pages()) == []
+
+
+def test_saved_pages_are_loaded(directory):
+    checkpoint = PaginationCheckpoint(directory)
+    checkpoint.start("uri")
+    checkpoint.save_page(page(1, "uri?page=2"), "uri?page=2")
+    checkpoint.save_page(page(2, "uri?page=3"), "uri?page=3")
+    loaded = PaginationCheckpoint(directory)
+    assert loaded.uri == "uri"
+    assert loaded.next == "uri?page=3"
+    assert loaded.page_count == 2
+    assert list(loaded.iter_pages()) == [
+        page(1, "uri?page=2"),
+        page(2, "uri?page=3"),
+    ]
+
+
+def test_complete(directory):
+    checkpoint = PaginationCheckpoint(directory)
+    checkpoint.start("uri")
+    checkpoint.save_page(page(1, None), None)
+    assert checkpoint.complete
+
+
+def test_checkpoint_for_another_request(directory):
+    checkpoint = PaginationCheckpoint(directory)
+    checkpoint.start("uri")
+    with pytest.raises(ValueError):
+        checkpoint.start("other_uri")
+
+
+def test_clear(directory):
+    checkpoint = PaginationCheckpoint(directory)
+    checkpoint.start("uri")
+    checkpoint.save_page(page(1, "uri?page=2"), "uri?page=2")
+    checkpoint.clear()
+    assert checkpoint.page_count == 0
+    assert PaginationCheckpoint(directory).uri is None
+    checkpoint.start("other_uri")
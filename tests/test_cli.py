@@ -0,0 +1,120 @@
+import csv
+import json
+import os
+
+import pytest
+
+from benchmarks.server import FakeScurriServer
+from scurri import cli
+from scurri.apisession import ScurriAPISession
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with FakeScurriServer(packages=30, page_size=4) as server:
+        monkeypatch.setattr(ScurriAPISession, "LIVE_URL", server.base_url)
+        monkeypatch.setenv(cli.USERNAME_VARIABLE, "user")
+        monkeypatch.setenv(cli.PASSWORD_VARIABLE, "password")
+        yield server
+
+
+def read_ids(path):
+    with open(path) as f:
+        return [json.loads(line)["id"] for line in f]
+
+
+def test_export_trackings_ndjson(server, tmp_path, capsys):
+    output = str(tmp_path / "trackings.ndjson")
+    assert cli.main(["export-trackings", output, "--max-workers", "3"]) == 0
+    assert read_ids(output) == list(range(30))
+    assert "30 packages, 8 pages" in capsys.readouterr().err
+
+
+def test_export_carrier_trackings_csv(server, tmp_path):
+    output = str(tmp_path / "hermes.csv")
+    status = cli.main(
+        [
+            "export-carrier-trackings",
+            "hermes",
+            output,
+            "--format",
+            "csv",
+            "--page-size",
+            "100",
+            "--quiet",
+        ]
+    )
+    assert status == 0
+    with open(output) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10 * server.events
+    assert {row["carrier_slug"] for row in rows} == {"hermes"}
+
+
+def test_export_trackings_parquet(server, tmp_path):
+    import pyarrow.parquet
+
+    output = str(tmp_path / "trackings.parquet")
+    assert cli.main(["export-trackings", output, "--format", "parquet"]) == 0
+    assert pyarrow.parquet.read_table(output).num_rows == 30 * server.events
+
+
+def test_export_trackings_with_processes(server, tmp_path):
+    output = str(tmp_path / "trackings.ndjson")
+    status = cli.main(
+        ["export-trackings", output, "--processes", "2", "--resume", "--quiet"]
+    )
+    assert status == 0
+    assert sorted(read_ids(output)) == list(range(30))
+    assert not os.path.exists(f"{output}.shards")
+
+
+def test_resumed_export_requests_remaining_pages(server, tmp_path, monkeypatch):
+    output = str(tmp_path / "trackings.ndjson")
+    update = cli.Progress.update
+
+    def interrupt(progress, packages, pages=1):
+        update(progress, packages, pages)
+        if progress.pages == 3:
+            raise KeyboardInterrupt()
+
+    monkeypatch.setattr(cli.Progress, "update", interrupt)
+    assert cli.main(["export-trackings", output, "--resume", "--quiet"]) == 1
+    assert os.path.exists(f"{output}.checkpoint")
+    monkeypatch.setattr(cli.Progress, "update", update)
+    request_count = server.request_count
+    assert cli.main(["export-trackings", output, "--resume", "--quiet"]) == 0
+    assert read_ids(output) == list(range(30))
+    assert server.request_count - request_count < 8
+    assert not os.path.exists(f"{output}.checkpoint")
+
+
+def test_api_errors_are_reported(server, tmp_path, capsys):
+    server.error_rate = 1
+    assert cli.main(["export-trackings", str(tmp_path / "out"), "--quiet"]) == 1
+    assert "Invalid response from auth request" in capsys.readouterr().err
+
+
+def test_lookup(server, capsys):
+    assert cli.main(["lookup", "3", "5", "--quiet"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [3, 5]
+
+
+def test_lookup_reports_missing_packages(server, capsys):
+    assert cli.main(["lookup", "--tracking-numbers", "hermes:3", "hermes:99"]) == 1
+    captured = capsys.readouterr()
+    assert len(captured.out.splitlines()) == 1
+    assert "Not found: ('hermes', '99')" in captured.err
+
+
+def test_invalid_filter(server, tmp_path):
+    with pytest.raises(SystemExit):
+        cli.main(["export-trackings", str(tmp_path / "out"), "--filter", "status"])
+
+
+def test_parse_filters():
+    assert cli.parse_filters(["status=DELIVERED", "status=LOST", "a=b=c"]) == {
+        "status": ["DELIVERED", "LOST"],
+        "a": ["b=c"],
+    }
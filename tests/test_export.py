@@ -0,0 +1,118 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.server import FakeScurriServer
+from scurri import ScurriAPI, exceptions
+from scurri.export import (
+    ExportShard,
+    TrackingExport,
+    _ShardJob,
+    read_ndjson,
+    write_ndjson,
+)
+from scurri.ratelimit import RateLimiter
+from scurri.retry import RetryPolicy
+
+
+@pytest.fixture
+def server():
+    with FakeScurriServer(packages=30, page_size=4) as server:
+        yield server
+
+
+@pytest.fixture
+def scurri_api(server):
+    return ScurriAPI(session=server.session())
+
+
+def test_write_and_read_ndjson(tmp_path):
+    path = str(tmp_path / "results.ndjson")
+    results = [{"id": 1}, {"id": 2, "events": []}]
+    with open(path, "wb") as f:
+        assert write_ndjson(results, f) == 2
+    assert list(read_ndjson(path)) == results
+
+
+def test_export_writes_a_shard_per_carrier(tmp_path, server, scurri_api):
+    export = TrackingExport(scurri_api, str(tmp_path), processes=2)
+    progress = []
+    shards = export.run(progress=progress.append)
+    assert sorted(shard.carrier_slug for shard in shards) == sorted(server.carriers)
+    assert len(progress) == 3
+    assert export.count == 30
+    for slug in server.carriers:
+        ids = [result["id"] for result in read_ndjson(str(tmp_path / f"{slug}.ndjson"))]
+        assert ids == server.carrier_packages(slug)
+    with open(tmp_path / TrackingExport.INDEX_FILE) as f:
+        index = json.load(f)
+    assert index["count"] == 30
+    assert [shard["carrier_slug"] for shard in index["shards"]] == sorted(
+        server.carriers
+    )
+    assert sorted(result["id"] for result in export.iter_results()) == list(range(30))
+
+
+def test_export_merge(tmp_path, scurri_api):
+    export = TrackingExport(scurri_api, str(tmp_path / "shards"), processes=2)
+    export.run()
+    path = str(tmp_path / "all.ndjson")
+    assert export.merge(path) == 30
+    assert len(list(read_ndjson(path))) == 30
+
+
+def test_export_selected_carriers_with_page_size(tmp_path, server, scurri_api):
+    export = TrackingExport(scurri_api, str(tmp_path), processes=1, page_size=100)
+    shards = export.run(carrier_slugs=["dpd"])
+    assert [shard.count for shard in shards] == [10]
+    assert server.request_count == 1
+    assert not os.path.exists(tmp_path / "hermes.ndjson")
+
+
+def test_resumed_export_skips_exported_shards(tmp_path, server, scurri_api):
+    TrackingExport(scurri_api, str(tmp_path), processes=1).run(carrier_slugs=["hermes"])
+    requests_made = server.request_count
+    export = TrackingExport(scurri_api, str(tmp_path), processes=2, resume=True)
+    assert list(export.shards) == ["hermes"]
+    export.run()
+    # One request for the carriers and three pages each for dpd and royal-mail.
+    assert server.request_count - requests_made == 7
+    assert export.count == 30
+    assert not os.listdir(tmp_path / TrackingExport.CHECKPOINT_DIR)
+
+
+def test_failed_shards_raise_export_failed(tmp_path):
+    with FakeScurriServer(packages=6, error_rate=1) as server:
+        session = server.session(retry_policy=RetryPolicy(max_attempts=1))
+        export = TrackingExport(ScurriAPI(session=session), str(tmp_path))
+        with pytest.raises(exceptions.ExportFailed) as error:
+            export.run(carrier_slugs=["hermes", "dpd"])
+    assert sorted(error.value.errors) == ["dpd", "hermes"]
+    assert "TooManyRequestAtemptsError" in error.value.errors["dpd"]
+    with open(tmp_path / TrackingExport.INDEX_FILE) as f:
+        assert json.load(f)["shards"] == []
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+def test_shard_job_shares_rate_limiter(scurri_api):
+    scurri_api.session.rate_limiter = RateLimiter(rate=8)
+    job = _ShardJob(
+        session=scurri_api.session,
+        carrier_slug="hermes",
+        directory="",
+        max_workers=1,
+        page_size=None,
+        filters=None,
+        processes=4,
+        resume=False,
+    )
+    session = job.session()
+    assert session.rate_limiter.rate == 2
+    assert session.token == scurri_api.session.token
+    assert session.base_url == scurri_api.session.base_url
+
+
+def test_export_shard_round_trip():
+    shard = ExportShard("hermes", "hermes.ndjson", 3, 100)
+    assert ExportShard.from_dict(shard.to_dict()).to_dict() == shard.to_dict()
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from scurri.metrics import (
+    MetricsCollector,
+    PaginationEvent,
+    RequestEvent,
+    percentile,
+)
+
+
+def make_event(duration, status=200, attempt=1, size=10, endpoint="TrackingsRequest"):
+    return RequestEvent(
+        endpoint=endpoint,
+        method="GET",
+        uri="https://api/trackings",
+        attempt=attempt,
+        duration=duration,
+        status=status,
+        size=size,
+    )
+
+
+def test_percentile():
+    samples = [4, 1, 3, 2, 5]
+    assert percentile(samples, 0) == 1
+    assert percentile(samples, 50) == 3
+    assert percentile(samples, 100) == 5
+    assert percentile(samples, 90) == pytest.approx(4.6)
+
+
+def test_percentile_without_samples():
+    assert percentile([], 50) is None
+
+
+def test_request_event_failed():
+    assert not make_event(0.1).failed
+    assert make_event(0.1, status=500).failed
+    assert make_event(0.1, status=None).failed
+
+
+def test_collector_summary():
+    collector = MetricsCollector()
+    for duration in range(1, 101):
+        collector.request_finished(make_event(duration / 100))
+    collector.request_finished(make_event(2.0, status=503, attempt=2, size=0))
+    collector.request_finished(make_event(0.5, endpoint="CarriersRequest"))
+    summary = collector.summary()
+    trackings = summary["TrackingsRequest"]
+    assert trackings["requests"] == 101
+    assert trackings["failures"] == 1
+    assert trackings["retries"] == 1
+    assert trackings["bytes"] == 1000
+    assert trackings["statuses"] == {200: 100, 503: 1}
+    assert trackings["p50"] == pytest.approx(0.51)
+    assert trackings["max"] == 2.0
+    assert summary["CarriersRequest"]["requests"] == 1
+
+
+def test_collector_pagination_totals():
+    collector = MetricsCollector()
+    for _ in range(2):
+        collector.pagination_finished(
+            PaginationEvent(
+                endpoint="TrackingsRequest",
+                uri="https://api/trackings",
+                pages=3,
+                items=30,
+                size=300,
+                duration=1.5,
+                complete=True,
+            )
+        )
+    summary = collector.summary()["TrackingsRequest"]
+    assert summary["paginations"] == 2
+    assert summary["pages"] == 6
+    assert summary["items"] == 60
+    assert summary["pagination_bytes"] == 600
+    assert summary["pagination_p50"] == 1.5
+    assert summary["requests"] == 0
+
+
+def test_collector_percentiles_use_recent_samples():
+    collector = MetricsCollector(sample_size=10, percentiles=[95])
+    for duration in range(100):
+        collector.request_finished(make_event(duration))
+    assert collector.percentile("TrackingsRequest", 0) == 90
+    assert collector.summary()["TrackingsRequest"]["p95"] == pytest.approx(98.55)
+    assert collector.percentile("CarriersRequest", 50) is None
+
+
+def test_collector_reset():
+    collector = MetricsCollector()
+    collector.request_finished(make_event(0.1))
+    collector.reset()
+    assert collector.summary() == {}
+
+
+def test_collector_is_thread_safe():
+    collector = MetricsCollector()
+    threads = [
+        threading.Thread(
+            target=lambda: [
+                collector.request_finished(make_event(0.1)) for _ in range(500)
+            ]
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert collector.summary()["TrackingsRequest"]["requests"] == 4000
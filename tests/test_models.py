@@ -127,3 +127,51 @@ def test_tracked_package_sets_events(tracked_package, tracking_data):
     assert len(tracked_package.events) == 2
     for item in tracked_package.events:
         assert type(item) == models.TrackingEvent
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    [
+        "2019-02-11T15:19:06",
+        "2019-02-11T15:19:06+00:00",
+        "2019-02-11T15:19:06.123456+01:00",
+        "2019-02-11T15:19:06Z",
+        "20190211T151906",
+    ],
+)
+def test_parse_timestamp(timestamp):
+    assert models.parse_timestamp(timestamp) == isoparse(timestamp)
+
+
+def test_tracked_package_parses_created_at_when_accessed(tracking_data):
+    tracked_package = models.TrackedPackage(tracking_data)
+    assert tracked_package._created_at is None
+    assert tracked_package.created_at == isoparse(tracking_data["created_at"])
+    assert tracked_package._created_at is not None
+
+
+def test_tracking_event_parses_timestamp_when_accessed(tracking_event_data):
+    tracking_event = models.TrackingEvent(tracking_event_data)
+    assert tracking_event._timestamp is None
+    assert tracking_event.timestamp == isoparse(tracking_event_data["timestamp"])
+    assert tracking_event._timestamp is not None
+
+
+@pytest.fixture
+def model(request):
+    return request.getfixturevalue(request.param)
+
+
+@pytest.mark.parametrize(
+    "model", ["carrier", "tracking_event", "tracked_package"], indirect=True
+)
+def test_models_do_not_have_instance_dict(model):
+    assert not hasattr(model, "__dict__")
+
+
+def test_tracking_event_to_dict(tracking_event, tracking_event_data):
+    assert tracking_event.to_dict() == tracking_event_data
+
+
+def test_tracked_package_to_dict(tracked_package, tracking_data):
+    assert tracked_package.to_dict() == tracking_data
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+
+import pytest
+
+from scurri.ratelimit import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_limiter(clock, **kwargs):
+    return RateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_burst_does_not_wait(clock):
+    limiter = make_limiter(clock, rate=5)
+    for _ in range(5):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+
+def test_waits_when_bucket_is_empty(clock):
+    limiter = make_limiter(clock, rate=5)
+    for _ in range(7):
+        limiter.acquire()
+    assert clock.sleeps == pytest.approx([0.2, 0.2])
+
+
+def test_bucket_refills_over_time(clock):
+    limiter = make_limiter(clock, rate=2, burst=2)
+    limiter.acquire()
+    limiter.acquire()
+    clock.now += 10
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == []
+
+
+def test_concurrent_callers_reserve_consecutive_slots(clock):
+    limiter = make_limiter(clock, rate=10, burst=1)
+    delays = [limiter._reserve() for _ in range(4)]
+    assert delays == pytest.approx([0, 0.1, 0.2, 0.3])
+
+
+def test_throttled_response_decreases_rate(clock):
+    limiter = make_limiter(clock, rate=10)
+    limiter.record_response(429)
+    assert limiter.rate == 5
+
+
+def test_throttled_responses_within_cooldown_decrease_rate_once(clock):
+    limiter = make_limiter(clock, rate=10, cooldown=1)
+    limiter.record_response(429)
+    limiter.record_response(429)
+    assert limiter.rate == 5
+    clock.now += 1
+    limiter.record_response(429)
+    assert limiter.rate == 2.5
+
+
+def test_rate_does_not_fall_below_min_rate(clock):
+    limiter = make_limiter(clock, rate=10, min_rate=4, cooldown=0)
+    for _ in range(5):
+        limiter.record_response(429)
+    assert limiter.rate == 4
+
+
+def test_successful_responses_increase_rate_up_to_max(clock):
+    limiter = make_limiter(clock, rate=10, increase_step=2)
+    limiter.record_response(429)
+    limiter.record_response(200)
+    assert limiter.rate == 7
+    for _ in range(5):
+        limiter.record_response(200)
+    assert limiter.rate == 10
+
+
+def test_reset(clock):
+    limiter = make_limiter(clock, rate=10)
+    limiter.record_response(429)
+    limiter.reset()
+    assert limiter.rate == 10
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+def test_async_acquire(monkeypatch, clock):
+    sleeps = []
+
+    async def mock_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr("scurri.ratelimit.asyncio.sleep", mock_sleep)
+    limiter = make_limiter(clock, rate=2, burst=1)
+
+    async def acquire_twice():
+        await limiter.async_acquire()
+        await limiter.async_acquire()
+
+    asyncio.run(acquire_twice())
+    assert sleeps == [0.5]
+
+
+def test_limiters_with_the_same_path_share_a_bucket(tmp_path, clock):
+    path = str(tmp_path / "bucket.json")
+    first = make_limiter(clock, rate=10, burst=2, path=path)
+    second = make_limiter(clock, rate=10, burst=2, path=path)
+    first.acquire()
+    second.acquire()
+    assert clock.sleeps == []
+    second.acquire()
+    assert clock.sleeps == pytest.approx([0.1])
+    first.record_response(429)
+    assert second.rate == 5
+
+
+def test_limiter_is_thread_safe():
+    limiter = RateLimiter(rate=1, burst=1000, clock=lambda: 0, sleep=lambda _: None)
+    threads = [
+        threading.Thread(target=lambda: [limiter.acquire() for _ in range(100)])
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert limiter._state[RateLimiter.TOKENS] == 0
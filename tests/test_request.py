@@ -1,8 +1,17 @@
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from unittest.mock import MagicMock, call
 
 import pytest
+import requests
 
 from scurri import exceptions
+from scurri.cache import HTTPCache
+from scurri.checkpoint import PaginationCheckpoint
+from scurri.metrics import MetricsCollector, RequestObserver
 from scurri.request import (
     BaseRequest,
     CarrierRequest,
@@ -10,11 +19,14 @@ from scurri.request import (
     CarrierTrackingsRequest,
     PaginatedRequest,
     PaginatedResponse,
+    PaginationLimits,
     SingleRequest,
     TrackingByPackageID,
     TrackingByTrackingNumber,
     TrackingsRequest,
+    build_url,
 )
+from scurri.retry import RetryPolicy
 
 GET = "GET"
 POST = "POST"
@@ -87,12 +99,13 @@ def mock_paginated_request_subclass(mock_uri, mock_headers, mock_data):
     return MockPaginatedRequestSubclass
 
 
+def make_mock_response(response_data):
+    return MagicMock(content=json.dumps(response_data).encode())
+
+
 @pytest.fixture
 def mock_request_response(mock_response_data):
-    mock_json = MagicMock(return_value=mock_response_data)
-    mock_response = MagicMock()
-    mock_response.attach_mock(mock_json, "json")
-    return mock_response
+    return make_mock_response(mock_response_data)
 
 
 def test_scurri_response_sets_count(mock_response_data):
@@ -147,15 +160,51 @@ def test_make_request_method(
         url=mock_uri,
         headers=authenticated_scurri_api.get_headers() | mock_headers,
         json=mock_data,
+        timeout=authenticated_scurri_api.timeout,
     )
     assert isinstance(response, dict)
-    mock_request_response.json.assert_called_once_with()
+    assert response == mock_response_data
+
+
+def test_make_request_method_uses_session_json_decoder(
+    authenticated_scurri_api, mock_uri, mock_request_response, mock_response_data
+):
+    authenticated_scurri_api.session.request = MagicMock(
+        return_value=mock_request_response
+    )
+    authenticated_scurri_api.json_decoder = MagicMock(return_value={"a": "b"})
+    response = BaseRequest._make_request(
+        api_session=authenticated_scurri_api,
+        method=GET,
+        uri=mock_uri,
+        headers={},
+        data=None,
+    )
+    authenticated_scurri_api.json_decoder.assert_called_once_with(
+        mock_request_response.content
+    )
+    assert response == {"a": "b"}
+
+
+def test_make_request_method_with_non_object_response(
+    requests_mock, authenticated_scurri_api
+):
+    uri = "http://test_url.com"
+    requests_mock.get(uri, json=[1, 2, 3])
+    with pytest.raises(exceptions.InvalidResponse):
+        BaseRequest._make_request(
+            api_session=authenticated_scurri_api,
+            method=GET,
+            uri=uri,
+            headers={},
+            data=None,
+        )
 
 
 def test_make_request_method_with_request_error(
     authenticated_scurri_api, mock_uri, mock_headers, mock_data
 ):
-    mock_response = MagicMock(json=MagicMock(side_effect=Exception()))
+    mock_response = MagicMock(content=b"<html>Bad Gateway</html>")
     authenticated_scurri_api.session.request = MagicMock(return_value=mock_response)
     authenticated_scurri_api.session.request
     request = BaseRequest()
@@ -196,8 +245,8 @@ def single_request_subclass_mocked_for_request_method(
 def paginated_request_subclass_mocked_for_request_method(
     mock_paginated_request_subclass, carriers_response_data
 ):
-    mock_paginated_request_subclass._make_request = MagicMock(
-        return_value=carriers_response_data[1]
+    mock_paginated_request_subclass._make_sized_request = MagicMock(
+        return_value=(carriers_response_data[1], 0)
     )
     mock_paginated_request_subclass.parse_response = MagicMock()
     return mock_paginated_request_subclass
@@ -207,8 +256,8 @@ def paginated_request_subclass_mocked_for_request_method(
 def paginated_request_subclass_mocked_for_request_method_with_not_found_response(
     mock_paginated_request_subclass, not_found_response
 ):
-    mock_paginated_request_subclass._make_request = MagicMock(
-        return_value=not_found_response
+    mock_paginated_request_subclass._make_sized_request = MagicMock(
+        return_value=(not_found_response, 0)
     )
     mock_paginated_request_subclass.parse_response = MagicMock()
     return mock_paginated_request_subclass
@@ -318,7 +367,10 @@ def test_request_is_reattempted_on_server_error(
             headers={},
             data={},
         )
-    assert len(requests_mock.request_history) == BaseRequest.MAX_ATTEMPTS
+    assert (
+        len(requests_mock.request_history)
+        == authenticated_scurri_api.retry_policy.max_attempts
+    )
 
 
 def test_request_recovers_after_sever_error_response(
@@ -341,20 +393,45 @@ def test_request_recovers_after_sever_error_response(
     assert response == correct_response
 
 
+def test_request_attempts_are_sent_to_observer(
+    requests_mock, authenticated_scurri_api, server_error_response
+):
+    uri = "http://test_url.com"
+    requests_mock.get(
+        uri,
+        [
+            {"json": server_error_response, "status_code": 500},
+            {"exc": requests.exceptions.ConnectionError},
+            {"json": {"data": "ok"}},
+        ],
+    )
+    observer = MagicMock(spec=RequestObserver)
+    authenticated_scurri_api.observer = observer
+    authenticated_scurri_api.retry_policy = RetryPolicy(backoff_factor=0)
+    CarrierRequest._make_request(
+        api_session=authenticated_scurri_api,
+        method="GET",
+        uri=uri,
+        headers={},
+        data=None,
+    )
+    events = [c.args[0] for c in observer.request_finished.call_args_list]
+    assert [event.endpoint for event in events] == ["CarrierRequest"] * 3
+    assert [event.attempt for event in events] == [1, 2, 3]
+    assert [event.status for event in events] == [500, None, 200]
+    assert isinstance(events[1].error, requests.exceptions.ConnectionError)
+    assert events[2].size == len(b'{"data": "ok"}')
+    assert all(event.duration >= 0 for event in events)
+
+
 @pytest.fixture
 def mock_carriers_request_response_page_1(carriers_response_data):
-    mock_json = MagicMock(return_value=carriers_response_data[0])
-    mock_response = MagicMock()
-    mock_response.attach_mock(mock_json, "json")
-    return mock_response
+    return make_mock_response(carriers_response_data[0])
 
 
 @pytest.fixture
 def mock_carriers_request_response_page_2(carriers_response_data):
-    mock_json = MagicMock(return_value=carriers_response_data[1])
-    mock_response = MagicMock()
-    mock_response.attach_mock(mock_json, "json")
-    return mock_response
+    return make_mock_response(carriers_response_data[1])
 
 
 @pytest.fixture
@@ -390,12 +467,14 @@ def test_paginated_request_request_method_makes_requests(
             + mock_paginated_request_subclass.uri(),
             headers=authenticated_scurri_api.get_headers(),
             json=None,
+            timeout=authenticated_scurri_api.timeout,
         ),
         call(
             method=GET,
             url=carriers_response_data[0]["next"],
             headers=authenticated_scurri_api.get_headers(),
             json=None,
+            timeout=authenticated_scurri_api.timeout,
         ),
     ]
     mock_request.assert_has_calls(calls)
@@ -426,6 +505,396 @@ def test_paginated_request_terminates(
         )
 
 
+def test_paginated_request_iter_pages_requests_pages_lazily(
+    authenticated_scurri_api,
+    mock_paginated_request_subclass,
+    mock_carriers_request_response_page_1,
+    mock_carriers_request_response_page_2,
+    carriers_response_data,
+):
+    mock_request = MagicMock()
+    mock_request.side_effect = [
+        mock_carriers_request_response_page_1,
+        mock_carriers_request_response_page_2,
+    ]
+    authenticated_scurri_api.session.request = mock_request
+    pages = mock_paginated_request_subclass.iter_pages(
+        api_session=authenticated_scurri_api
+    )
+    assert mock_request.call_count == 0
+    first_page = next(pages)
+    assert mock_request.call_count == 1
+    assert first_page.results == carriers_response_data[0]["results"]
+    assert [page.results for page in pages] == [carriers_response_data[1]["results"]]
+    assert mock_request.call_count == 2
+
+
+def test_paginated_request_iter_results(
+    authenticated_scurri_api,
+    mock_paginated_request_subclass,
+    mock_carriers_request_response_page_1,
+    mock_carriers_request_response_page_2,
+    carriers_response_data,
+):
+    mock_request = MagicMock()
+    mock_request.side_effect = [
+        mock_carriers_request_response_page_1,
+        mock_carriers_request_response_page_2,
+    ]
+    authenticated_scurri_api.session.request = mock_request
+    results = mock_paginated_request_subclass.iter_results(
+        api_session=authenticated_scurri_api
+    )
+    assert list(results) == (
+        carriers_response_data[0]["results"] + carriers_response_data[1]["results"]
+    )
+
+
+@pytest.fixture
+def paginated_pages():
+    base_url = "https://tracking-staging.scurri.co.uk/api/v1/trackings"
+    pages = []
+    for page_number in range(1, 6):
+        pages.append(
+            {
+                "count": 9,
+                "next": (
+                    f"{base_url}?page={page_number + 1}&page_size=2"
+                    if page_number < 5
+                    else None
+                ),
+                "previous": None,
+                "results": [{"id": page_number * 10 + i} for i in range(2)][
+                    : 9 - (page_number - 1) * 2
+                ],
+            }
+        )
+    return base_url, pages
+
+
+def test_paginated_request_with_max_workers(
+    requests_mock, authenticated_scurri_api, paginated_pages
+):
+    base_url, pages = paginated_pages
+    requests_mock.get(base_url, json=pages[0])
+    for page_number, page in enumerate(pages[1:], start=2):
+        requests_mock.get(f"{base_url}?page={page_number}&page_size=2", json=page)
+    authenticated_scurri_api.base_url = base_url.replace("/trackings", "")
+    results = TrackingsRequest.request(
+        api_session=authenticated_scurri_api, max_workers=3
+    )
+    expected = []
+    for page in pages:
+        expected.extend(page["results"])
+    assert results == expected
+    assert requests_mock.call_count == len(pages)
+
+
+def test_paginated_request_with_max_workers_follows_next_after_last_page(
+    requests_mock, authenticated_scurri_api, paginated_pages
+):
+    base_url, pages = paginated_pages
+    pages[0]["count"] = 4
+    requests_mock.get(base_url, json=pages[0])
+    for page_number, page in enumerate(pages[1:], start=2):
+        requests_mock.get(f"{base_url}?page={page_number}&page_size=2", json=page)
+    authenticated_scurri_api.base_url = base_url.replace("/trackings", "")
+    results = TrackingsRequest.request(
+        api_session=authenticated_scurri_api, max_workers=3
+    )
+    assert len(results) == 9
+    assert requests_mock.call_count == len(pages)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_paginated_request_with_records_removed_during_pull(
+    requests_mock, authenticated_scurri_api, paginated_pages, max_workers
+):
+    base_url, pages = paginated_pages
+    pages[0]["count"] = 5
+    pages[1]["count"] = 4
+    pages[1]["next"] = None
+    requests_mock.get(base_url, json=pages[0])
+    requests_mock.get(f"{base_url}?page=2&page_size=2", json=pages[1])
+    requests_mock.get(
+        f"{base_url}?page=3&page_size=2",
+        status_code=404,
+        json={"detail": "Invalid page."},
+    )
+    authenticated_scurri_api.base_url = base_url.replace("/trackings", "")
+    results = TrackingsRequest.request(
+        api_session=authenticated_scurri_api, max_workers=max_workers
+    )
+    assert results == pages[0]["results"] + pages[1]["results"]
+
+
+def test_paginated_request_resumes_from_checkpoint(
+    requests_mock, authenticated_scurri_api, paginated_pages, tmp_path
+):
+    base_url, pages = paginated_pages
+    requests_mock.get(base_url, json=pages[0])
+    requests_mock.get(f"{base_url}?page=2&page_size=2", json=pages[1])
+    requests_mock.get(f"{base_url}?page=3&page_size=2", status_code=503)
+    authenticated_scurri_api.base_url = base_url.replace("/trackings", "")
+    checkpoint = PaginationCheckpoint(str(tmp_path))
+    with pytest.raises(exceptions.TooManyRequestAtemptsError):
+        TrackingsRequest.request(
+            api_session=authenticated_scurri_api, checkpoint=checkpoint
+        )
+    assert checkpoint.page_count == 2
+    for page_number, page in enumerate(pages[1:], start=2):
+        requests_mock.get(f"{base_url}?page={page_number}&page_size=2", json=page)
+    requests_mock.reset_mock()
+    results = TrackingsRequest.request(
+        api_session=authenticated_scurri_api,
+        checkpoint=PaginationCheckpoint(str(tmp_path)),
+    )
+    expected = []
+    for page in pages:
+        expected.extend(page["results"])
+    assert results == expected
+    assert [request.url for request in requests_mock.request_history] == [
+        f"{base_url}?page={page_number}&page_size=2" for page_number in (3, 4, 5)
+    ]
+
+
+def test_paginated_request_with_complete_checkpoint_makes_no_requests(
+    requests_mock, authenticated_scurri_api, paginated_pages, tmp_path
+):
+    base_url, pages = paginated_pages
+    requests_mock.get(base_url, json=pages[0])
+    for page_number, page in enumerate(pages[1:], start=2):
+        requests_mock.get(f"{base_url}?page={page_number}&page_size=2", json=page)
+    authenticated_scurri_api.base_url = base_url.replace("/trackings", "")
+    checkpoint = PaginationCheckpoint(str(tmp_path))
+    first = TrackingsRequest.request(
+        api_session=authenticated_scurri_api, checkpoint=checkpoint, max_workers=3
+    )
+    assert checkpoint.complete
+    requests_mock.reset_mock()
+    second = TrackingsRequest.request(
+        api_session=authenticated_scurri_api, checkpoint=checkpoint
+    )
+    assert first == second
+    assert requests_mock.call_count == 0
+
+
+def test_paginated_request_sends_totals_to_collector(
+    requests_mock, authenticated_scurri_api, paginated_pages
+):
+    base_url, pages = paginated_pages
+    requests_mock.get(base_url, json=pages[0])
+    for page_number, page in enumerate(pages[1:], start=2):
+        requests_mock.get(f"{base_url}?page={page_number}&page_size=2", json=page)
+    authenticated_scurri_api.base_url = base_url.replace("/trackings", "")
+    collector = MetricsCollector()
+    authenticated_scurri_api.observer = collector
+    TrackingsRequest.request(api_session=authenticated_scurri_api, max_workers=3)
+    summary = collector.summary()["TrackingsRequest"]
+    assert summary["requests"] == 5
+    assert summary["paginations"] == 1
+    assert summary["pages"] == 5
+    assert summary["items"] == 9
+    assert summary["pagination_bytes"] == summary["bytes"] > 0
+
+
+def test_stopped_pagination_is_sent_to_observer(
+    requests_mock, authenticated_scurri_api, paginated_pages
+):
+    base_url, pages = paginated_pages
+    requests_mock.get(base_url, json=pages[0])
+    requests_mock.get(f"{base_url}?page=2&page_size=2", json=pages[1])
+    authenticated_scurri_api.base_url = base_url.replace("/trackings", "")
+    observer = MagicMock(spec=RequestObserver)
+    authenticated_scurri_api.observer = observer
+    with pytest.raises(exceptions.PaginationLimitExceeded) as error:
+        TrackingsRequest.request(
+            api_session=authenticated_scurri_api, limits=PaginationLimits(max_pages=2)
+        )
+    pages_iterator = TrackingsRequest.iter_pages(api_session=authenticated_scurri_api)
+    next(pages_iterator)
+    pages_iterator.close()
+    limited, closed = [c.args[0] for c in observer.pagination_finished.call_args_list]
+    assert limited.pages == 2
+    assert not limited.complete
+    assert limited.error is error.value
+    assert closed.pages == 1
+    assert not closed.complete
+    assert closed.error is None
+
+
+def test_build_url_without_query():
+    assert build_url("https://api", "/trackings") == "https://api/trackings"
+
+
+def test_build_url_encodes_query():
+    url = build_url(
+        "https://api",
+        "/trackings",
+        {
+            "status": ["DELIVERED", "IN_TRANSIT"],
+            "created_after": datetime(2024, 1, 2, 3, 4, 5),
+            "date": date(2024, 1, 2),
+            "exception": True,
+            "carrier": None,
+            "reference": "a&b",
+        },
+    )
+    assert url == (
+        "https://api/trackings?status=DELIVERED&status=IN_TRANSIT"
+        "&created_after=2024-01-02T03%3A04%3A05&date=2024-01-02"
+        "&exception=true&reference=a%26b"
+    )
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_paginated_request_with_page_size_and_query(
+    requests_mock, authenticated_scurri_api, paginated_pages, max_workers
+):
+    base_url, pages = paginated_pages
+    for page in pages[:-1]:
+        page["next"] = page["next"] + "&status=DELIVERED"
+    requests_mock.get(base_url, json=pages[0])
+    for page_number, page in enumerate(pages[1:], start=2):
+        requests_mock.get(
+            f"{base_url}?page={page_number}&page_size=2&status=DELIVERED", json=page
+        )
+    authenticated_scurri_api.base_url = base_url.replace("/trackings", "")
+    results = TrackingsRequest.request(
+        api_session=authenticated_scurri_api,
+        max_workers=max_workers,
+        query={"status": "DELIVERED"},
+        page_size=2,
+    )
+    assert len(results) == 9
+    assert requests_mock.request_history[0].url == (
+        f"{base_url}?status=DELIVERED&page_size=2"
+    )
+    for request in requests_mock.request_history:
+        assert request.qs["status"] == ["delivered"]
+        assert request.qs["page_size"] == ["2"]
+
+
+def test_page_uris_returns_none_without_page_number():
+    response = PaginatedResponse(
+        {
+            "count": 4,
+            "next": "https://next-url?cursor=abc",
+            "previous": None,
+            "results": [{}, {}],
+        }
+    )
+    assert PaginatedRequest._page_uris(response) is None
+
+
+@pytest.fixture
+def many_pages_scurri_api(authenticated_scurri_api):
+    """Serve 2000 pages of two results from a mocked session."""
+    base_url = authenticated_scurri_api.base_url + TrackingsRequest.uri()
+    page_count = 2000
+
+    def request(method, url, **kwargs):
+        page = int(url.split("page=")[1]) if "page=" in url else 1
+        next_url = f"{base_url}?page={page + 1}" if page < page_count else None
+        body = {
+            "count": page_count * 2,
+            "next": next_url,
+            "previous": None,
+            "results": [{"id": page * 10}, {"id": page * 10 + 1}],
+        }
+        return MagicMock(status_code=200, content=json.dumps(body).encode())
+
+    authenticated_scurri_api.session.request = request
+    return authenticated_scurri_api
+
+
+def test_paginated_request_has_no_page_ceiling(many_pages_scurri_api):
+    results = TrackingsRequest.iter_results(api_session=many_pages_scurri_api)
+    assert sum(1 for _ in results) == 4000
+
+
+def test_paginated_request_detects_cycles(requests_mock, authenticated_scurri_api):
+    base_url = authenticated_scurri_api.base_url + TrackingsRequest.uri()
+    page = {"count": 4, "previous": None, "results": [{}, {}]}
+    requests_mock.get(base_url, json=dict(page, next=f"{base_url}?page=2"))
+    requests_mock.get(f"{base_url}?page=2", json=dict(page, next=base_url))
+    with pytest.raises(exceptions.PaginationCycleError):
+        TrackingsRequest.request(api_session=authenticated_scurri_api)
+    assert requests_mock.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "limits,yielded_pages",
+    [
+        (PaginationLimits(max_pages=3), 3),
+        (PaginationLimits(max_items=7), 3),
+        (PaginationLimits(max_items=6), 3),
+    ],
+)
+def test_pagination_limits(many_pages_scurri_api, limits, yielded_pages):
+    pages = []
+    with pytest.raises(exceptions.PaginationLimitExceeded):
+        for page in TrackingsRequest.iter_pages(
+            api_session=many_pages_scurri_api, limits=limits
+        ):
+            pages.append(page)
+    assert len(pages) == yielded_pages
+
+
+def test_pagination_max_bytes(many_pages_scurri_api):
+    pages = []
+    first_page = next(TrackingsRequest.iter_pages(api_session=many_pages_scurri_api))
+    limits = PaginationLimits(max_bytes=first_page.size * 2)
+    with pytest.raises(exceptions.PaginationLimitExceeded) as exc_info:
+        for page in TrackingsRequest.iter_pages(
+            api_session=many_pages_scurri_api, limits=limits
+        ):
+            pages.append(page)
+    assert exc_info.value.limit == "max_bytes"
+    assert 1 <= len(pages) <= 2
+
+
+def test_pagination_deadline(many_pages_scurri_api, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("scurri.request.time.monotonic", lambda: now[0])
+    pages = TrackingsRequest.iter_pages(
+        api_session=many_pages_scurri_api, limits=PaginationLimits(deadline=10)
+    )
+    next(pages)
+    next(pages)
+    now[0] = 10.0
+    with pytest.raises(exceptions.PaginationLimitExceeded) as exc_info:
+        next(pages)
+    assert exc_info.value.limit == "deadline"
+
+
+def test_pagination_limit_errors_are_too_many_requests_errors():
+    assert issubclass(
+        exceptions.PaginationLimitExceeded, exceptions.TooManyRequestsError
+    )
+    assert issubclass(exceptions.PaginationCycleError, exceptions.TooManyRequestsError)
+
+
+def test_deprecated_max_page_requests(many_pages_scurri_api):
+    class LimitedRequest(TrackingsRequest):
+        MAX_PAGE_REQUESTS = 5
+
+    with pytest.raises(exceptions.TooManyRequestsError):
+        LimitedRequest.request(api_session=many_pages_scurri_api)
+
+
+def test_page_uris_for_large_counts():
+    response = PaginatedResponse(
+        {
+            "count": 100000,
+            "next": "https://next-url?page=2",
+            "previous": None,
+            "results": [{}, {}],
+        }
+    )
+    assert len(PaginatedRequest._page_uris(response)) == 49999
+
+
 def test_carriers_request_uri_method():
     assert CarriersRequest.uri() == "/carriers"
 
@@ -461,3 +930,426 @@ def test_tracking_by_tracking_number_uri_method():
         )
         == f"/carriers/{carrier_slug}/trackings/{tracking_number}"
     )
+
+
+@pytest.fixture
+def http_cache():
+    return HTTPCache()
+
+
+@pytest.fixture
+def caching_scurri_api(authenticated_scurri_api, http_cache):
+    authenticated_scurri_api.http_cache = http_cache
+    return authenticated_scurri_api
+
+
+def test_single_request_sends_conditional_request_with_etag(
+    requests_mock, caching_scurri_api, http_cache, tracking_response_data
+):
+    url = caching_scurri_api.base_url + TrackingByPackageID.uri(package_id="1")
+    requests_mock.get(
+        url,
+        [
+            {"json": tracking_response_data, "headers": {"ETag": '"abc"'}},
+            {"status_code": 304},
+        ],
+    )
+    first = TrackingByPackageID.request(
+        api_session=caching_scurri_api, params={"package_id": "1"}
+    )
+    second = TrackingByPackageID.request(
+        api_session=caching_scurri_api, params={"package_id": "1"}
+    )
+    assert first == second == tracking_response_data
+    assert "If-None-Match" not in requests_mock.request_history[0].headers
+    assert requests_mock.request_history[1].headers["If-None-Match"] == '"abc"'
+    assert http_cache.hits == 1
+    assert http_cache.misses == 1
+    assert http_cache.bytes_saved == len(json.dumps(tracking_response_data))
+
+
+def test_cached_response_cannot_be_changed_by_callers(
+    requests_mock, caching_scurri_api, tracking_response_data
+):
+    url = caching_scurri_api.base_url + TrackingByPackageID.uri(package_id="1")
+    requests_mock.get(
+        url,
+        [
+            {"json": tracking_response_data, "headers": {"ETag": '"abc"'}},
+            {"status_code": 304},
+            {"status_code": 304},
+        ],
+    )
+    first = TrackingByPackageID.request(
+        api_session=caching_scurri_api, params={"package_id": "1"}
+    )
+    first["events"].clear()
+    second = TrackingByPackageID.request(
+        api_session=caching_scurri_api, params={"package_id": "1"}
+    )
+    second["tracking_number"] = "changed"
+    third = TrackingByPackageID.request(
+        api_session=caching_scurri_api, params={"package_id": "1"}
+    )
+    assert second is not third
+    assert third == tracking_response_data
+
+
+def test_single_request_sends_conditional_request_with_last_modified(
+    requests_mock, caching_scurri_api, http_cache, tracking_response_data
+):
+    last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+    url = caching_scurri_api.base_url + TrackingByPackageID.uri(package_id="1")
+    requests_mock.get(
+        url,
+        [
+            {
+                "json": tracking_response_data,
+                "headers": {"Last-Modified": last_modified},
+            },
+            {"status_code": 304},
+        ],
+    )
+    for _ in range(2):
+        TrackingByPackageID.request(
+            api_session=caching_scurri_api, params={"package_id": "1"}
+        )
+    assert requests_mock.request_history[1].headers["If-Modified-Since"] == (
+        last_modified
+    )
+    assert http_cache.hits == 1
+
+
+def test_single_request_updates_cache_when_modified(
+    requests_mock, caching_scurri_api, http_cache, tracking_response_data
+):
+    updated = dict(tracking_response_data, events=[])
+    url = caching_scurri_api.base_url + TrackingByPackageID.uri(package_id="1")
+    requests_mock.get(
+        url,
+        [
+            {"json": tracking_response_data, "headers": {"ETag": '"1"'}},
+            {"json": updated, "headers": {"ETag": '"2"'}},
+        ],
+    )
+    for _ in range(2):
+        response = TrackingByPackageID.request(
+            api_session=caching_scurri_api, params={"package_id": "1"}
+        )
+    assert response == updated
+    assert http_cache.get(url).etag == '"2"'
+    assert http_cache.misses == 2
+
+
+def test_single_request_does_not_cache_without_validators(
+    requests_mock, caching_scurri_api, http_cache, tracking_response_data
+):
+    url = caching_scurri_api.base_url + TrackingByPackageID.uri(package_id="1")
+    requests_mock.get(url, json=tracking_response_data)
+    for _ in range(2):
+        TrackingByPackageID.request(
+            api_session=caching_scurri_api, params={"package_id": "1"}
+        )
+    assert "If-None-Match" not in requests_mock.request_history[1].headers
+    assert len(http_cache) == 0
+
+
+def test_paginated_request_does_not_use_http_cache(
+    requests_mock, caching_scurri_api, http_cache, carriers_response_data
+):
+    url = caching_scurri_api.base_url + TrackingsRequest.uri()
+    page = dict(carriers_response_data[1], next=None)
+    requests_mock.get(url, json=page, headers={"ETag": '"abc"'})
+    TrackingsRequest.request(api_session=caching_scurri_api)
+    assert len(http_cache) == 0
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 502, 503, 504])
+def test_request_is_retried_on_retryable_status(
+    requests_mock, authenticated_scurri_api, status_code
+):
+    uri = "http://test_url.com"
+    requests_mock.get(
+        uri, [{"status_code": status_code, "text": "busy"}, {"json": {"data": "ok"}}]
+    )
+    response = BaseRequest._make_request(
+        api_session=authenticated_scurri_api,
+        method=GET,
+        uri=uri,
+        headers={},
+        data=None,
+    )
+    assert response == {"data": "ok"}
+    assert requests_mock.call_count == 2
+
+
+def test_request_is_not_retried_on_other_status(
+    requests_mock, authenticated_scurri_api, not_found_response
+):
+    uri = "http://test_url.com"
+    requests_mock.get(uri, status_code=404, json=not_found_response)
+    response = BaseRequest._make_request(
+        api_session=authenticated_scurri_api,
+        method=GET,
+        uri=uri,
+        headers={},
+        data=None,
+    )
+    assert response == not_found_response
+    assert requests_mock.call_count == 1
+
+
+def test_deprecated_max_attempts_overrides_retry_policy(
+    requests_mock, authenticated_scurri_api
+):
+    class LimitedRequest(BaseRequest):
+        MAX_ATTEMPTS = 2
+
+    uri = "http://test_url.com"
+    requests_mock.get(uri, status_code=503)
+    with pytest.raises(exceptions.TooManyRequestAtemptsError):
+        LimitedRequest._make_request(
+            api_session=authenticated_scurri_api,
+            method=GET,
+            uri=uri,
+            headers={},
+            data=None,
+        )
+    assert requests_mock.call_count == 2
+
+
+def test_request_is_retried_on_connection_error(
+    requests_mock, authenticated_scurri_api
+):
+    uri = "http://test_url.com"
+    requests_mock.get(
+        uri, [{"exc": requests.ConnectionError}, {"json": {"data": "ok"}}]
+    )
+    response = BaseRequest._make_request(
+        api_session=authenticated_scurri_api,
+        method=GET,
+        uri=uri,
+        headers={},
+        data=None,
+    )
+    assert response == {"data": "ok"}
+
+
+def test_request_raises_after_repeated_connection_errors(
+    requests_mock, authenticated_scurri_api
+):
+    uri = "http://test_url.com"
+    requests_mock.get(uri, exc=requests.Timeout)
+    with pytest.raises(exceptions.TooManyRequestAtemptsError):
+        BaseRequest._make_request(
+            api_session=authenticated_scurri_api,
+            method=GET,
+            uri=uri,
+            headers={},
+            data=None,
+        )
+    assert (
+        requests_mock.call_count == authenticated_scurri_api.retry_policy.max_attempts
+    )
+
+
+def test_request_does_not_retry_other_exceptions(
+    requests_mock, authenticated_scurri_api
+):
+    uri = "http://test_url.com"
+    requests_mock.get(uri, exc=ValueError)
+    with pytest.raises(ValueError):
+        BaseRequest._make_request(
+            api_session=authenticated_scurri_api,
+            method=GET,
+            uri=uri,
+            headers={},
+            data=None,
+        )
+    assert requests_mock.call_count == 1
+
+
+def test_request_waits_for_retry_after(
+    requests_mock, authenticated_scurri_api, monkeypatch
+):
+    mock_sleep = MagicMock()
+    monkeypatch.setattr("scurri.request.time.sleep", mock_sleep)
+    uri = "http://test_url.com"
+    requests_mock.get(
+        uri,
+        [
+            {"status_code": 429, "headers": {"Retry-After": "7"}},
+            {"json": {"data": "ok"}},
+        ],
+    )
+    BaseRequest._make_request(
+        api_session=authenticated_scurri_api,
+        method=GET,
+        uri=uri,
+        headers={},
+        data=None,
+    )
+    mock_sleep.assert_called_once_with(7)
+
+
+def test_request_waits_for_rate_limiter(requests_mock, authenticated_scurri_api):
+    rate_limiter = MagicMock()
+    authenticated_scurri_api.rate_limiter = rate_limiter
+    uri = "http://test_url.com"
+    requests_mock.get(uri, [{"status_code": 429}, {"json": {"data": "ok"}}])
+    BaseRequest._make_request(
+        api_session=authenticated_scurri_api,
+        method=GET,
+        uri=uri,
+        headers={},
+        data=None,
+    )
+    assert rate_limiter.acquire.call_count == 2
+    assert rate_limiter.record_response.call_args_list == [call(429), call(200)]
+
+
+@pytest.fixture
+def expiring_token_scurri_api(requests_mock, authenticated_scurri_api, username):
+    auth_url = authenticated_scurri_api.base_url + authenticated_scurri_api.AUTH_URI
+    requests_mock.post(auth_url, json={"token": "refreshed"})
+    authenticated_scurri_api.credential_provider = lambda: (username, "password")
+    return authenticated_scurri_api
+
+
+def test_request_refreshes_rejected_token(requests_mock, expiring_token_scurri_api):
+    uri = "http://test_url.com"
+    requests_mock.get(
+        uri,
+        [
+            {"status_code": 401, "json": {"detail": "Invalid token."}},
+            {"json": {"data": "ok"}},
+        ],
+    )
+    response = BaseRequest._make_request(
+        api_session=expiring_token_scurri_api,
+        method=GET,
+        uri=uri,
+        headers={},
+        data=None,
+    )
+    assert response == {"data": "ok"}
+    history = requests_mock.request_history
+    assert [request.method for request in history] == ["GET", "POST", "GET"]
+    assert history[2].headers["Authorization"] == "Token refreshed"
+
+
+def test_request_refreshes_token_once(requests_mock, expiring_token_scurri_api):
+    uri = "http://test_url.com"
+    requests_mock.get(uri, status_code=401, json={"detail": "Invalid token."})
+    response = BaseRequest._make_request(
+        api_session=expiring_token_scurri_api,
+        method=GET,
+        uri=uri,
+        headers={},
+        data=None,
+    )
+    assert response == {"detail": "Invalid token."}
+    assert [request.method for request in requests_mock.request_history] == [
+        "GET",
+        "POST",
+        "GET",
+    ]
+
+
+def test_rejected_token_is_not_refreshed_without_credentials(
+    requests_mock, authenticated_scurri_api
+):
+    uri = "http://test_url.com"
+    requests_mock.get(uri, status_code=401, json={"detail": "Invalid token."})
+    BaseRequest._make_request(
+        api_session=authenticated_scurri_api,
+        method=GET,
+        uri=uri,
+        headers={},
+        data=None,
+    )
+    assert requests_mock.call_count == 1
+
+
+def test_session_with_credential_provider_authorises_on_first_request(
+    requests_mock, expiring_token_scurri_api
+):
+    expiring_token_scurri_api.token = None
+    uri = "http://test_url.com"
+    requests_mock.get(uri, json={"data": "ok"})
+    BaseRequest._make_request(
+        api_session=expiring_token_scurri_api,
+        method=GET,
+        uri=uri,
+        headers={},
+        data=None,
+    )
+    assert requests_mock.last_request.headers["Authorization"] == "Token refreshed"
+
+
+def test_token_is_refreshed_once_by_concurrent_requests(expiring_token_scurri_api):
+    barrier = threading.Barrier(8)
+    auth_requests = []
+
+    def request(method, url, headers, json, timeout):
+        if headers["Authorization"] == "Token refreshed":
+            return MagicMock(status_code=200, content=b'{"data": "ok"}', headers={})
+        barrier.wait(timeout=5)
+        return MagicMock(status_code=401, content=b"{}", headers={})
+
+    def get_token(username, password):
+        auth_requests.append(username)
+        expiring_token_scurri_api.token = "refreshed"
+
+    expiring_token_scurri_api.session.request = request
+    expiring_token_scurri_api._get_token = get_token
+
+    def make_request(_):
+        return BaseRequest._make_request(
+            api_session=expiring_token_scurri_api,
+            method=GET,
+            uri="http://test_url.com",
+            headers={},
+            data=None,
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(make_request, range(8)))
+    assert responses == [{"data": "ok"}] * 8
+    assert len(auth_requests) == 1
+
+
+def test_request_retries_do_not_recurse(authenticated_scurri_api):
+    attempts = sys.getrecursionlimit() + 10
+    authenticated_scurri_api.retry_policy = RetryPolicy(
+        max_attempts=attempts, backoff_factor=0
+    )
+    error_response = MagicMock(status_code=503, content=b"", headers={})
+    ok_response = MagicMock(status_code=200, content=b"{}")
+    authenticated_scurri_api.session.request = MagicMock(
+        side_effect=[error_response] * (attempts - 1) + [ok_response]
+    )
+    BaseRequest._make_request(
+        api_session=authenticated_scurri_api,
+        method=GET,
+        uri="http://test_url.com",
+        headers={},
+        data=None,
+    )
+    assert authenticated_scurri_api.session.request.call_count == attempts
+
+
+def test_paginated_request_retries_single_pages(
+    requests_mock, authenticated_scurri_api, paginated_pages
+):
+    base_url, pages = paginated_pages
+    requests_mock.get(base_url, json=pages[0])
+    for page_number, page in enumerate(pages[1:], start=2):
+        responses = [{"json": page}]
+        if page_number == 3:
+            responses.insert(0, {"status_code": 502})
+        requests_mock.get(f"{base_url}?page={page_number}&page_size=2", responses)
+    authenticated_scurri_api.base_url = base_url.replace("/trackings", "")
+    results = TrackingsRequest.request(api_session=authenticated_scurri_api)
+    assert len(results) == 9
+    assert requests_mock.call_count == len(pages) + 1
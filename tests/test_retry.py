@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from scurri.retry import RetryPolicy
+
+
+@pytest.fixture
+def retry_policy():
+    return RetryPolicy(backoff_factor=1, max_backoff=10, jitter=False)
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_retryable_statuses(retry_policy, status):
+    assert retry_policy.is_retryable_response(status, b"")
+
+
+@pytest.mark.parametrize("status", [200, 304, 400, 401, 404])
+def test_non_retryable_statuses(retry_policy, status):
+    assert not retry_policy.is_retryable_response(status, b"{}")
+
+
+def test_server_error_body_is_retryable(retry_policy):
+    assert retry_policy.is_retryable_response(
+        200, b"""{"detail": "Internal server error"}"""
+    )
+
+
+@pytest.mark.parametrize(
+    "exception",
+    [requests.ConnectionError(), requests.Timeout(), requests.ReadTimeout()],
+)
+def test_retryable_exceptions(retry_policy, exception):
+    assert retry_policy.is_retryable_exception(exception)
+
+
+@pytest.mark.parametrize(
+    "exception", [ValueError(), requests.exceptions.InvalidURL(), KeyError()]
+)
+def test_non_retryable_exceptions(retry_policy, exception):
+    assert not retry_policy.is_retryable_exception(exception)
+
+
+def test_can_retry(retry_policy):
+    assert retry_policy.can_retry(4)
+    assert not retry_policy.can_retry(5)
+
+
+def test_exponential_backoff(retry_policy):
+    delays = [retry_policy.get_delay(attempt) for attempt in range(1, 7)]
+    assert delays == [1, 2, 4, 8, 10, 10]
+
+
+def test_jitter():
+    retry_policy = RetryPolicy(backoff_factor=1, rng=lambda: 0.25)
+    assert retry_policy.get_delay(3) == 1
+
+
+def test_retry_after_seconds(retry_policy):
+    assert retry_policy.get_delay(1, retry_after="12") == 12
+
+
+def test_retry_after_date(retry_policy):
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+    delay = retry_policy.get_delay(1, retry_after=format_datetime(retry_at, True))
+    assert 55 < delay <= 60
+
+
+def test_retry_after_is_capped():
+    retry_policy = RetryPolicy(max_retry_after=20)
+    assert retry_policy.get_delay(1, retry_after="3600") == 20
+
+
+def test_invalid_retry_after_uses_backoff(retry_policy):
+    assert retry_policy.get_delay(2, retry_after="soon") == 2
+
+
+def test_retry_after_can_be_ignored():
+    retry_policy = RetryPolicy(
+        backoff_factor=1, jitter=False, respect_retry_after=False
+    )
+    assert retry_policy.get_delay(1, retry_after="60") == 1
@@ -0,0 +1,216 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+
+from scurri.api import ScurriAPI
+from scurri.exceptions import PackageNotFound
+from scurri.models import TrackedPackage
+from scurri.schedule import PollingScheduler, PollPolicy
+
+NOW = datetime(2021, 7, 30, 12, 0, tzinfo=timezone.utc)
+
+
+def make_package(package_id, *statuses, age=timedelta(0)):
+    return TrackedPackage(
+        {
+            "id": package_id,
+            "tracking_number": f"TRACK{package_id}",
+            "url": f"https://.../api/v1/trackings/{package_id}",
+            "created_at": "2021-07-30T10:00:00+00:00",
+            "carrier": "Hermes",
+            "carrier_url": "https://.../api/v1/carriers/hermes",
+            "events": [
+                {
+                    "id": i,
+                    "status": status,
+                    "carrier_code": "code",
+                    "description": "description",
+                    "timestamp": (NOW - age - timedelta(minutes=len(statuses) - i))
+                    .replace(tzinfo=None)
+                    .isoformat(),
+                    "location": "location",
+                }
+                for i, status in enumerate(statuses)
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def policy():
+    return PollPolicy(
+        status_intervals={"IN_TRANSIT": 0.01},
+        default_interval=0.02,
+        recency_factor=0,
+        min_interval=0,
+        error_interval=0.01,
+    )
+
+
+@pytest.fixture
+def polls():
+    return {}
+
+
+@pytest.fixture
+def mock_lookup(polls):
+    def lookup(package_id):
+        responses = polls[package_id]
+        response = responses.pop(0) if len(responses) > 1 else responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    mock = Mock(side_effect=lookup)
+    with patch.object(ScurriAPI, "get_tracking_by_package_id", mock):
+        yield mock
+
+
+def test_poll_policy_uses_status_interval():
+    policy = PollPolicy()
+    package = make_package(1, "MANIFESTED", "OUT_FOR_DELIVERY")
+    assert policy.next_interval(package, now=NOW) == 300
+    package = make_package(1, "MANIFESTED", "UNKNOWN")
+    assert policy.next_interval(package, now=NOW) == 3600
+
+
+def test_poll_policy_uses_latest_event():
+    package = make_package(1, "DELIVERED", "IN_TRANSIT")
+    package.events.reverse()
+    assert PollPolicy().next_interval(package, now=NOW) is None
+
+
+def test_poll_policy_stops_terminal_statuses():
+    package = make_package(1, "IN_TRANSIT", "RETURNED")
+    assert PollPolicy().next_interval(package, now=NOW) == 1800
+    policy = PollPolicy(terminal_statuses=("DELIVERED", "RETURNED"))
+    assert policy.next_interval(package, now=NOW) is None
+
+
+def test_poll_policy_backs_off_old_packages():
+    policy = PollPolicy(recency_factor=0.1, max_interval=36000)
+    package = make_package(1, "IN_TRANSIT", age=timedelta(hours=10))
+    assert policy.next_interval(package, now=NOW) == pytest.approx(3606)
+    package = make_package(1, "IN_TRANSIT", age=timedelta(days=30))
+    assert policy.next_interval(package, now=NOW) == 36000
+
+
+def test_poll_policy_without_events():
+    assert PollPolicy(min_interval=7200).next_interval(make_package(1)) == 7200
+
+
+def test_run_until_idle(mock_lookup, polls, policy):
+    polls["1"] = [make_package(1, "IN_TRANSIT"), make_package(1, "DELIVERED")]
+    polls["2"] = [make_package(2, "DELIVERED")]
+    received = []
+    scheduler = PollingScheduler(ScurriAPI(), policy=policy, callback=received.append)
+    scheduler.add("1")
+    scheduler.add(2)
+    assert "2" in scheduler
+    scheduler.run(until_idle=True)
+    assert [package.id for package in received] == [1, 2, 1]
+    assert len(scheduler) == 0
+    stats = scheduler.stats()
+    assert stats["polls"] == 3
+    assert stats["finished"] == 2
+    assert stats["failures"] == 0
+    assert stats["queued"] == 0
+    assert stats["lag_max"] >= 0
+
+
+def test_failures_are_retried(mock_lookup, polls, policy):
+    polls["1"] = [
+        PackageNotFound("1"),
+        RuntimeError("Connection reset"),
+        make_package(1, "DELIVERED"),
+    ]
+    scheduler = PollingScheduler(ScurriAPI(), policy=policy)
+    scheduler.add("1")
+    scheduler.run(until_idle=True)
+    assert mock_lookup.call_count == 3
+    assert scheduler.stats()["failures"] == 1
+    assert scheduler.stats()["finished"] == 1
+
+
+def test_remove(mock_lookup, polls, policy):
+    polls["1"] = [make_package(1, "IN_TRANSIT")]
+
+    def callback(package):
+        if mock_lookup.call_count == 3:
+            scheduler.remove(package.id)
+
+    scheduler = PollingScheduler(ScurriAPI(), policy=policy, callback=callback)
+    scheduler.add("1")
+    scheduler.run(until_idle=True)
+    assert mock_lookup.call_count == 3
+    assert scheduler.stats()["finished"] == 0
+
+
+def test_due_packages_are_polled_first(mock_lookup, polls, policy):
+    received = []
+    for package_id in "123":
+        polls[package_id] = [make_package(int(package_id), "DELIVERED")]
+    scheduler = PollingScheduler(
+        ScurriAPI(), policy=policy, max_workers=1, callback=received.append
+    )
+    scheduler.add("1", delay=0.05)
+    scheduler.add("2", delay=0.02)
+    scheduler.add("3")
+    scheduler.add("2", delay=0.1)
+    assert scheduler.queue_depth == 3
+    assert scheduler.stats()["due"] == 1
+    scheduler.run(until_idle=True)
+    assert [package.id for package in received] == [3, 1, 2]
+
+
+def test_max_workers(mock_lookup, polls, policy):
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def lookup(package_id):
+        with lock:
+            active.append(package_id)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(package_id)
+        return make_package(int(package_id), "DELIVERED")
+
+    mock_lookup.side_effect = lookup
+    scheduler = PollingScheduler(ScurriAPI(), policy=policy, max_workers=3)
+    for package_id in range(12):
+        scheduler.add(package_id)
+    scheduler.run(until_idle=True)
+    assert mock_lookup.call_count == 12
+    assert max(peak) == 3
+
+
+def test_rate_budget(mock_lookup, polls, policy):
+    for package_id in range(5):
+        polls[str(package_id)] = [make_package(package_id, "DELIVERED")]
+    scheduler = PollingScheduler(ScurriAPI(), policy=policy, rate=50)
+    for package_id in range(5):
+        scheduler.add(package_id)
+    started = time.monotonic()
+    scheduler.run(until_idle=True)
+    assert time.monotonic() - started >= 0.07
+    assert scheduler.stats()["lag_max"] >= 0.07
+
+
+def test_stop(mock_lookup, polls, policy):
+    polls["1"] = [make_package(1, "IN_TRANSIT")]
+    scheduler = PollingScheduler(ScurriAPI(), policy=policy)
+    scheduler.add("1")
+    thread = threading.Thread(target=scheduler.run)
+    thread.start()
+    time.sleep(0.05)
+    assert thread.is_alive()
+    scheduler.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert mock_lookup.call_count > 1
+    assert "1" in scheduler
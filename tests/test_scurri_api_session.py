@@ -83,3 +83,78 @@ def test_failed_authorization_does_not_set_token(
     with pytest.raises(exceptions.InvalidAuthRequestResponse):
         scurri_api.auth(username=username, password=password)
     assert scurri_api.token is None
+
+
+def test_default_json_decoder():
+    assert ScurriAPISession().json_decoder(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+def test_custom_json_decoder():
+    def decoder(body):
+        return {"body": body}
+
+    assert ScurriAPISession(json_decoder=decoder).json_decoder is decoder
+
+
+def test_default_connection_pool():
+    session = ScurriAPISession()
+    adapter = session.session.get_adapter(session.base_url)
+    assert adapter._pool_maxsize == ScurriAPISession.POOL_MAXSIZE
+    assert adapter.max_retries.total == 0
+    assert session.timeout == (10, 60)
+
+
+def test_connection_pool_options():
+    session = ScurriAPISession(
+        pool_connections=2,
+        pool_maxsize=50,
+        pool_block=True,
+        connect_timeout=3,
+        read_timeout=None,
+    )
+    adapter = session.session.get_adapter(session.base_url)
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 50
+    assert adapter._pool_block is True
+    assert session.timeout == (3, None)
+
+
+def test_keep_alive_disabled():
+    session = ScurriAPISession(keep_alive=False)
+    assert session.session.headers["Connection"] == "close"
+
+
+def test_requests_use_timeout(
+    requests_mock, scurri_api, completed_auth_request, auth_endpoint_url
+):
+    assert requests_mock.last_request.timeout == scurri_api.timeout
+
+
+def test_auth_stores_credentials(scurri_api, completed_auth_request):
+    assert scurri_api.can_refresh_token()
+
+
+def test_refresh_token_without_credentials(scurri_api):
+    assert scurri_api.refresh_token(None) is False
+
+
+def test_refresh_token(requests_mock, auth_endpoint_url, username, password):
+    requests_mock.post(auth_endpoint_url, json={"token": "new"})
+    scurri_api = ScurriAPISession(credential_provider=lambda: (username, password))
+    scurri_api.token = "old"
+    assert scurri_api.refresh_token("old") is True
+    assert scurri_api.token == "new"
+    assert requests_mock.last_request.json() == {
+        "username": username,
+        "password": password,
+    }
+
+
+def test_refresh_token_does_not_replace_a_newer_token(
+    requests_mock, auth_endpoint_url, username, password
+):
+    scurri_api = ScurriAPISession(credential_provider=lambda: (username, password))
+    scurri_api.token = "newer"
+    assert scurri_api.refresh_token("old") is True
+    assert scurri_api.token == "newer"
+    assert requests_mock.call_count == 0
@@ -0,0 +1,106 @@
+import pytest
+
+from scurri import models
+from scurri.store import TrackingStore
+
+
+class Clock:
+    def __init__(self):
+        self.time = 1000.0
+
+    def __call__(self):
+        return self.time
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def store(clock):
+    with TrackingStore(clock=clock) as store:
+        yield store
+
+
+@pytest.fixture
+def saved_store(store, trackings_response_data):
+    store.save(trackings_response_data)
+    return store
+
+
+def test_save(saved_store, trackings_response_data):
+    assert len(saved_store) == len(trackings_response_data)
+
+
+def test_save_replaces_packages(saved_store, tracking_response_data):
+    updated = dict(tracking_response_data, events=[])
+    saved_store.save([updated])
+    assert len(saved_store) == 1
+    assert saved_store.get_package(tracking_response_data["id"]).events == []
+    assert saved_store.get_packages_with_status("IN_TRANSIT") == []
+
+
+def test_get_package(saved_store, tracking_response_data):
+    package = saved_store.get_package(str(tracking_response_data["id"]))
+    assert isinstance(package, models.TrackedPackage)
+    assert package.id == tracking_response_data["id"]
+    assert len(package.events) == len(tracking_response_data["events"])
+
+
+def test_get_missing_package(saved_store):
+    assert saved_store.get_package("missing") is None
+
+
+def test_get_package_with_max_age(saved_store, clock, tracking_response_data):
+    clock.time += 60
+    assert saved_store.get_package(tracking_response_data["id"], max_age=61)
+    assert saved_store.get_package(tracking_response_data["id"], max_age=59) is None
+
+
+def test_get_package_by_tracking_number(saved_store, tracking_response_data):
+    package = saved_store.get_package_by_tracking_number(
+        "hermes", tracking_response_data["tracking_number"]
+    )
+    assert package.id == tracking_response_data["id"]
+    assert saved_store.get_package_by_tracking_number("dpd", "1") is None
+
+
+def test_get_carrier_packages(saved_store, tracking_response_data):
+    packages = saved_store.get_carrier_packages("hermes")
+    assert [package.id for package in packages] == [tracking_response_data["id"]]
+    assert saved_store.get_carrier_packages("dpd") == []
+
+
+def test_get_packages_with_status(saved_store, tracking_response_data):
+    packages = saved_store.get_packages_with_status("IN_TRANSIT")
+    assert [package.id for package in packages] == [tracking_response_data["id"]]
+
+
+def test_delete(saved_store, tracking_response_data):
+    saved_store.delete(tracking_response_data["id"])
+    assert len(saved_store) == 0
+    assert saved_store.get_packages_with_status("IN_TRANSIT") == []
+
+
+def test_save_iter(store, tracking_response_data):
+    results = [dict(tracking_response_data, id=i) for i in range(5)]
+    iterator = store.save_iter(results, batch_size=2)
+    assert [result["id"] for result in iterator] == [0, 1, 2, 3, 4]
+    assert len(store) == 5
+
+
+def test_save_iter_saves_when_stopped_early(store, tracking_response_data):
+    results = [dict(tracking_response_data, id=i) for i in range(5)]
+    iterator = store.save_iter(results, batch_size=10)
+    next(iterator)
+    iterator.close()
+    assert len(store) == 1
+
+
+def test_store_persists(tmp_path, tracking_response_data):
+    path = str(tmp_path / "store.sqlite")
+    with TrackingStore(path) as store:
+        store.save([tracking_response_data])
+    with TrackingStore(path) as store:
+        assert store.get_package(tracking_response_data["id"]) is not None
@@ -0,0 +1,143 @@
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+
+from scurri.api import ScurriAPI
+from scurri.store import TrackingStore
+from scurri.sync import TrackingSync
+
+
+def make_package(package_id, created_at, event_timestamps):
+    return {
+        "id": package_id,
+        "tracking_number": f"TRACK{package_id}",
+        "url": f"https://.../api/v1/trackings/{package_id}",
+        "created_at": created_at,
+        "carrier": "Hermes",
+        "carrier_url": "https://.../api/v1/carriers/hermes",
+        "events": [
+            {
+                "id": package_id * 100 + i,
+                "status": "IN_TRANSIT",
+                "carrier_code": "code",
+                "description": "description",
+                "timestamp": timestamp,
+                "location": "location",
+            }
+            for i, timestamp in enumerate(event_timestamps)
+        ],
+    }
+
+
+@pytest.fixture
+def first_poll():
+    return [
+        make_package(1, "2021-07-30T10:00:00+00:00", ["2021-07-30T11:00:00"]),
+        make_package(2, "2021-07-30T12:00:00+00:00", []),
+    ]
+
+
+@pytest.fixture
+def second_poll():
+    return [
+        make_package(
+            1,
+            "2021-07-30T10:00:00+00:00",
+            ["2021-07-30T11:00:00", "2021-07-30T13:00:00"],
+        ),
+        make_package(2, "2021-07-30T12:00:00+00:00", []),
+        make_package(3, "2021-07-30T14:00:00+01:00", ["2021-07-30T13:30:00"]),
+    ]
+
+
+@pytest.fixture
+def mock_iter_results(first_poll, second_poll):
+    mock = Mock(side_effect=[iter(first_poll), iter(second_poll)])
+    with patch("scurri.sync.TrackingsRequest.iter_results", mock):
+        yield mock
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / "state.json")
+
+
+def ids(updates):
+    return [update.package.id for update in updates]
+
+
+def event_ids(updates):
+    return [[event.id for event in update.events] for update in updates]
+
+
+def test_first_sync_yields_everything(mock_iter_results, first_poll):
+    sync = TrackingSync(ScurriAPI())
+    updates = list(sync.sync())
+    assert ids(updates) == [1, 2]
+    assert event_ids(updates) == [[100], []]
+    assert sync.watermark == datetime(2021, 7, 30, 12, tzinfo=timezone.utc)
+
+
+def test_second_sync_yields_only_changes(mock_iter_results):
+    sync = TrackingSync(ScurriAPI())
+    list(sync.sync())
+    updates = list(sync.sync())
+    assert ids(updates) == [1, 3]
+    assert event_ids(updates) == [[101], [300]]
+    assert sync.watermark == datetime(2021, 7, 30, 13, 30, tzinfo=timezone.utc)
+
+
+def test_watermark_is_persisted(mock_iter_results, state_path):
+    list(TrackingSync(ScurriAPI(), state_path=state_path).sync())
+    with open(state_path) as f:
+        assert json.load(f) == {"watermark": "2021-07-30T12:00:00+00:00"}
+    sync = TrackingSync(ScurriAPI(), state_path=state_path)
+    assert sync.watermark == datetime(2021, 7, 30, 12, tzinfo=timezone.utc)
+    assert ids(sync.sync()) == [1, 3]
+
+
+def test_watermark_is_not_advanced_by_incomplete_sync(mock_iter_results, state_path):
+    sync = TrackingSync(ScurriAPI(), state_path=state_path)
+    next(sync.sync())
+    assert sync.watermark is None
+    assert ids(sync.sync()) == [1, 2, 3]
+
+
+def test_lookback(mock_iter_results):
+    sync = TrackingSync(ScurriAPI(), lookback=timedelta(hours=1, minutes=30))
+    list(sync.sync())
+    updates = list(sync.sync())
+    assert ids(updates) == [1, 2, 3]
+    assert event_ids(updates) == [[100, 101], [], [300]]
+
+
+def test_reset(mock_iter_results, state_path):
+    sync = TrackingSync(ScurriAPI(), state_path=state_path)
+    list(sync.sync())
+    sync.reset()
+    assert TrackingSync(ScurriAPI(), state_path=state_path).watermark is None
+    assert ids(sync.sync()) == [1, 2, 3]
+
+
+def test_carrier_sync(first_poll):
+    mock = Mock(return_value=iter(first_poll))
+    scurri_api = ScurriAPI()
+    with patch("scurri.sync.CarrierTrackingsRequest.iter_results", mock):
+        list(TrackingSync(scurri_api, carrier_slug="hermes", max_workers=2).sync())
+    mock.assert_called_once_with(
+        api_session=scurri_api.session,
+        params={"carrier_slug": "hermes"},
+        max_workers=2,
+    )
+
+
+def test_sync_saves_packages_to_store(mock_iter_results):
+    store = TrackingStore()
+    sync = TrackingSync(ScurriAPI(store=store))
+    list(sync.sync())
+    list(sync.sync())
+    assert store.get_package("2") is not None
+    assert len(store.get_package("1").events) == 2
+    assert store.get_package("3") is not None
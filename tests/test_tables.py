@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from scurri import tables
+
+
+def make_package(package_id, carrier_slug, created_at, events):
+    return {
+        "id": package_id,
+        "tracking_number": f"TRACK{package_id}",
+        "url": f"https://.../api/v1/trackings/{package_id}",
+        "created_at": created_at,
+        "carrier": carrier_slug.title(),
+        "carrier_url": f"https://.../api/v1/carriers/{carrier_slug}",
+        "events": [
+            {
+                "id": package_id * 100 + i,
+                "status": status,
+                "carrier_code": "code",
+                "description": "description",
+                "timestamp": timestamp,
+                "location": "location",
+            }
+            for i, (status, timestamp) in enumerate(events)
+        ],
+    }
+
+
+@pytest.fixture
+def packages():
+    return [
+        make_package(
+            1,
+            "hermes",
+            "2021-07-30T10:25:47+00:00",
+            [
+                ("IN_TRANSIT", "2021-07-30T12:00:00"),
+                ("MANIFESTED", "2021-07-30T11:00:00"),
+            ],
+        ),
+        make_package(
+            2,
+            "dpd",
+            "2021-07-31T10:25:47+00:00",
+            [("DELIVERED", "2021-08-01T09:00:00")],
+        ),
+        make_package(3, "hermes", "2021-08-01T10:25:47+01:00", []),
+    ]
+
+
+@pytest.fixture
+def table(packages):
+    return tables.TrackingTable(packages)
+
+
+def test_timestamp_to_epoch_treats_naive_timestamps_as_utc():
+    assert tables.timestamp_to_epoch("1970-01-02T00:00:00") == 86400
+    assert tables.timestamp_to_epoch("1970-01-02T01:00:00+01:00") == 86400
+
+
+def test_table_length(table):
+    assert len(table) == 3
+    assert table.event_count == 3
+
+
+def test_table_ids(table):
+    assert table.ids == [1, 2, 3]
+    assert table.tracking_numbers == ["TRACK1", "TRACK2", "TRACK3"]
+
+
+def test_table_interns_carriers(table):
+    assert table.carriers == ["hermes", "dpd"]
+    assert list(table.carrier_codes) == [0, 1, 0]
+    assert table.carrier_slug(2) == "hermes"
+
+
+def test_table_created_at(table):
+    assert table.created_at_datetime(0) == datetime(
+        2021, 7, 30, 10, 25, 47, tzinfo=timezone.utc
+    )
+
+
+def test_table_latest_status_uses_most_recent_event(table):
+    assert table.latest_status(0) == "IN_TRANSIT"
+    assert table.latest_status(1) == "DELIVERED"
+    assert table.latest_status(2) is None
+
+
+def test_table_event_range(table):
+    assert list(table.event_range(0)) == [0, 1]
+    assert list(table.event_range(1)) == [2]
+    assert list(table.event_range(2)) == []
+    statuses = [table.statuses[table.event_status_codes[i]] for i in range(3)]
+    assert statuses == ["IN_TRANSIT", "MANIFESTED", "DELIVERED"]
+
+
+def test_table_where(table):
+    assert table.where() == [0, 1, 2]
+    assert table.where(carrier_slug="hermes") == [0, 2]
+    assert table.where(carrier_slug="yodel") == []
+    assert table.where(latest_status="DELIVERED") == [1]
+    assert table.where(latest_status="EXCEPTION") == []
+    assert table.where(created_after=datetime(2021, 7, 31)) == [1, 2]
+    assert table.where(carrier_slug="hermes", created_before=datetime(2021, 7, 31)) == [
+        0
+    ]
+
+
+def test_table_count_by_carrier(table):
+    assert table.count_by_carrier() == {"hermes": 2, "dpd": 1}
+
+
+def test_table_count_by_latest_status(table):
+    assert table.count_by_latest_status() == {
+        "IN_TRANSIT": 1,
+        "DELIVERED": 1,
+        None: 1,
+    }
@@ -0,0 +1,156 @@
+import json
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from scurri.api import NOT_FOUND_RESPONSE, ScurriAPI
+from scurri.store import TrackingStore
+from scurri.watch import SeenEvents, TrackingWatcher
+from tests.test_sync import make_package
+
+
+def package(package_id, events):
+    return make_package(
+        package_id, "2021-07-30T10:00:00+00:00", ["2021-07-30T11:00:00"] * events
+    )
+
+
+@pytest.fixture
+def responses():
+    return {"1": [package(1, 1), package(1, 3)], "2": [package(2, 2), package(2, 2)]}
+
+
+@pytest.fixture
+def mock_request(responses):
+    def request(api_session, params):
+        package_id = params["package_id"]
+        if package_id not in responses:
+            return NOT_FOUND_RESPONSE
+        polls = responses[package_id]
+        return polls.pop(0) if len(polls) > 1 else polls[0]
+
+    mock = Mock(side_effect=request)
+    with patch("scurri.watch.TrackingByPackageID.request", mock):
+        yield mock
+
+
+def event_ids(updates):
+    return {
+        update.package.id: [event.id for event in update.events] for update in updates
+    }
+
+
+def test_seen_events_new_events():
+    seen = SeenEvents()
+    events = package(1, 2)["events"]
+    assert seen.new_events("1", events) == events
+    assert seen.new_events("1", events) == []
+    assert seen.new_events(1, package(1, 3)["events"]) == [package(1, 3)["events"][2]]
+    assert 1 in seen
+    assert len(seen) == 1
+
+
+def test_seen_events_evicts_least_recently_used_package():
+    seen = SeenEvents(max_packages=2)
+    seen.new_events("1", [])
+    seen.new_events("2", [])
+    seen.new_events("1", [])
+    seen.new_events("3", [])
+    assert "1" in seen
+    assert "2" not in seen
+    assert len(seen) == 2
+
+
+def test_seen_events_persisted(tmp_path):
+    path = str(tmp_path / "seen.json")
+    seen = SeenEvents(path=path)
+    seen.new_events("1", package(1, 2)["events"])
+    seen.new_events("2", [])
+    seen.save()
+    with open(path) as f:
+        assert json.load(f) == [["1", [100, 101]], ["2", []]]
+    loaded = SeenEvents(path=path, max_packages=1)
+    assert "1" not in loaded
+    assert loaded.new_events("2", package(2, 1)["events"]) != []
+    assert SeenEvents(path=path).new_events("1", package(1, 2)["events"]) == []
+
+
+def test_seen_events_forget():
+    seen = SeenEvents()
+    seen.new_events("1", [])
+    seen.forget("1")
+    seen.forget("2")
+    assert len(seen) == 0
+
+
+def test_poll_yields_new_events(mock_request):
+    watcher = TrackingWatcher(ScurriAPI(), ["1", "2", "3"])
+    assert event_ids(watcher.poll()) == {1: [100], 2: [200, 201]}
+    assert event_ids(watcher.poll()) == {1: [101, 102]}
+    assert event_ids(watcher.poll()) == {}
+    assert mock_request.call_count == 9
+
+
+def test_poll_update_events_belong_to_package(mock_request):
+    watcher = TrackingWatcher(ScurriAPI(), ["1"])
+    watcher.poll()
+    (update,) = watcher.poll()
+    assert update.events == update.package.events[1:]
+
+
+def test_poll_skip_existing(mock_request):
+    watcher = TrackingWatcher(ScurriAPI(), ["1", "2"], skip_existing=True)
+    assert watcher.poll() == []
+    assert event_ids(watcher.poll()) == {1: [101, 102]}
+
+
+def test_poll_concurrently(mock_request):
+    watcher = TrackingWatcher(ScurriAPI(), ["1", "2", "3"], max_workers=3)
+    assert event_ids(watcher.poll()) == {1: [100], 2: [200, 201]}
+
+
+def test_poll_saves_seen_events(mock_request, tmp_path):
+    path = str(tmp_path / "seen.json")
+    TrackingWatcher(ScurriAPI(), ["1"], seen=SeenEvents(path=path)).poll()
+    watcher = TrackingWatcher(ScurriAPI(), ["1"], seen=SeenEvents(path=path))
+    assert event_ids(watcher.poll()) == {1: [101, 102]}
+
+
+def test_poll_saves_to_store(mock_request):
+    store = TrackingStore()
+    watcher = TrackingWatcher(ScurriAPI(store=store, store_max_age=60), ["1"])
+    watcher.poll()
+    watcher.poll()
+    assert len(store.get_package("1").events) == 3
+    assert mock_request.call_count == 2
+
+
+def test_add_and_remove(mock_request):
+    watcher = TrackingWatcher(ScurriAPI())
+    watcher.add(1)
+    watcher.add("2")
+    assert watcher.package_ids == ["1", "2"]
+    watcher.poll()
+    watcher.remove("2")
+    assert watcher.package_ids == ["1"]
+    assert "2" not in watcher.seen
+
+
+def test_watch(mock_request):
+    watcher = TrackingWatcher(ScurriAPI(), ["1", "2"], interval=0)
+    assert event_ids(watcher.watch(max_polls=3)) == {1: [101, 102], 2: [200, 201]}
+    assert mock_request.call_count == 6
+
+
+def test_run_until_stopped(mock_request):
+    watcher = TrackingWatcher(ScurriAPI(), ["1"], interval=60)
+    updates = []
+    thread = threading.Thread(target=watcher.run, args=(updates.append,))
+    thread.start()
+    thread.join(0.5)
+    assert thread.is_alive()
+    watcher.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert event_ids(updates) == {1: [100]}
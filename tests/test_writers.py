@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+
+import pyarrow.parquet
+import pytest
+
+from scurri.writers import (
+    EVENT_COLUMNS,
+    CSVWriter,
+    NDJSONWriter,
+    ParquetWriter,
+    get_writer,
+    iter_event_rows,
+)
+
+
+@pytest.fixture
+def results(tracking_response_data):
+    return [
+        tracking_response_data,
+        dict(tracking_response_data, id="no_events", events=[]),
+    ]
+
+
+@pytest.fixture
+def tracking_response_data():
+    event = {
+        "id": 2,
+        "status": "MANIFESTED",
+        "carrier_code": "kk",
+        "description": "Manifested",
+        "timestamp": "2019-02-11T15:19:06",
+        "location": "Depot",
+    }
+    return {
+        "id": 39,
+        "tracking_number": "0000000000",
+        "url": "https://.../api/v1/carriers/hermes/trackings/0000000000",
+        "created_at": "2019-02-11T15:19:06+00:00",
+        "carrier": "Hermes",
+        "carrier_url": "https://.../api/v1/carriers/hermes",
+        "events": [event, dict(event, id=3, status="DELIVERED")],
+    }
+
+
+def test_iter_event_rows(tracking_response_data):
+    rows = list(iter_event_rows(tracking_response_data))
+    assert [row["event_id"] for row in rows] == [2, 3]
+    assert rows[1]["status"] == "DELIVERED"
+    assert rows[0]["carrier_slug"] == "hermes"
+    assert list(rows[0]) == EVENT_COLUMNS
+
+
+def test_iter_event_rows_without_events(tracking_response_data):
+    rows = list(iter_event_rows(dict(tracking_response_data, events=[])))
+    assert len(rows) == 1
+    assert rows[0]["package_id"] == 39
+    assert rows[0]["event_id"] is None
+    assert list(rows[0]) == EVENT_COLUMNS
+
+
+def test_ndjson_writer(results):
+    f = io.BytesIO()
+    with NDJSONWriter(f) as writer:
+        for result in results:
+            writer.write(result)
+    assert writer.count == 2
+    assert [json.loads(line) for line in f.getvalue().splitlines()] == results
+
+
+def test_csv_writer(results):
+    f = io.BytesIO()
+    with CSVWriter(f) as writer:
+        for result in results:
+            writer.write(result)
+    assert not f.closed
+    rows = list(csv.DictReader(io.StringIO(f.getvalue().decode())))
+    assert len(rows) == 3
+    assert rows[0]["package_id"] == "39"
+    assert rows[1]["status"] == "DELIVERED"
+    assert rows[2]["package_id"] == "no_events"
+    assert rows[2]["event_id"] == ""
+
+
+def test_parquet_writer(results):
+    f = io.BytesIO()
+    with ParquetWriter(f, batch_size=2) as writer:
+        for result in results:
+            writer.write(result)
+    table = pyarrow.parquet.read_table(io.BytesIO(f.getvalue()))
+    assert table.column_names == EVENT_COLUMNS
+    assert table.num_rows == 3
+    assert table.column("status").to_pylist() == ["MANIFESTED", "DELIVERED", None]
+    assert pyarrow.parquet.ParquetFile(io.BytesIO(f.getvalue())).num_row_groups == 2
+
+
+def test_get_writer():
+    assert isinstance(get_writer("ndjson", io.BytesIO()), NDJSONWriter)
+    assert isinstance(get_writer("csv", io.BytesIO()), CSVWriter)
+    with pytest.raises(ValueError):
+        get_writer("xml", io.BytesIO())